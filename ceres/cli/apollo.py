@@ -16,6 +16,8 @@ import sys
 from ceres.cli.base import BaseCommand
 from ceres.function.check import PreCheck
 from ceres.function.schema import (
+    CVE_BATCH_ROLLBACK_SCHEMA,
+    CVE_FIX_PLAN_SCHEMA,
     CVE_FIX_SCHEMA,
     CVE_ROLLBACK_SCHEMA,
     CVE_SCAN_SCHEMA,
@@ -28,7 +30,7 @@ from ceres.manages.collect_manage import Collect
 from ceres.manages.vulnerability_manage.rollback_manage import RollbackManage
 from ceres.manages.vulnerability_manage.set_repo_manage import SetRepoManage
 from ceres.manages.vulnerability_manage.fix_cve_manage import CveFixManage
-from ceres.manages.vulnerability_manage.scan_cve_vulnerability import CveScanManage
+from ceres.manages.vulnerability_manage.scan_cve_vulnerability import CveScanCache, CveScanManage
 from ceres.manages.vulnerability_manage.remove_hotpatch_manage import HotpatchRemoveManage
 
 
@@ -46,8 +48,10 @@ class VulnerabilityCommand(BaseCommand):
             'set_repo': self.set_repo_handle,
             'scan': self.scan_handle,
             'fix': self.fix_handle,
+            'fix_plan': self.fix_plan_handle,
             'remove_hotpatch': self.remove_hotpatch_handle,
             'rollback': self.rollback_handle,
+            'batch_rollback': self.batch_rollback_handle,
         }
 
     def get_command_name(self):
@@ -58,8 +62,10 @@ class VulnerabilityCommand(BaseCommand):
         command_group.add_argument("--set-repo", type=str)
         command_group.add_argument("--scan", type=str)
         command_group.add_argument("--fix", type=str)
+        command_group.add_argument("--fix-plan", type=str)
         command_group.add_argument("--remove-hotpatch", type=str)
         command_group.add_argument("--rollback", type=str)
+        command_group.add_argument("--batch-rollback", type=str)
 
     def execute(self, namespace):
         """
@@ -94,7 +100,11 @@ class VulnerabilityCommand(BaseCommand):
         if not result:
             sys.exit(1)
         kernel = data.get("kernel", True)
-        _, cve_scan_info = CveScanManage().cve_scan(data)
+        scan_manage = CveScanManage(scan_cache=CveScanCache())
+        _, cve_scan_info = scan_manage.cve_scan(data)
+        installed_packages = cve_scan_info.get("installed_packages")
+        if installed_packages is None:
+            installed_packages = Collect.get_installed_packages(kernel, scan_manage.installed_packages)
         kernel_check, _ = PreCheck.kernel_consistency_check()
         print(
             json.dumps(
@@ -103,7 +113,7 @@ class VulnerabilityCommand(BaseCommand):
                     "unfixed_cves": cve_scan_info.get("unfixed_cves", []),
                     "fixed_cves": cve_scan_info.get("fixed_cves", []),
                     "os_version": Collect.get_os_version(),
-                    "installed_packages": Collect.get_installed_packages(kernel),
+                    "installed_packages": installed_packages,
                     "reboot": not kernel_check,
                 }
             )
@@ -117,9 +127,20 @@ class VulnerabilityCommand(BaseCommand):
         result, data = validate_data(arguments, CVE_FIX_SCHEMA)
         if not result:
             sys.exit(1)
-        cve_fix_result = CveFixManage.cve_fix(data)
+        cve_fix_result = CveFixManage().cve_fix(data)
         print(json.dumps(cve_fix_result))
 
+    @staticmethod
+    def fix_plan_handle(arguments):
+        """
+        cve fix plan method, which resolves the fix task without changing anything
+        """
+        result, data = validate_data(arguments, CVE_FIX_PLAN_SCHEMA)
+        if not result:
+            sys.exit(1)
+        cve_fix_plan = CveFixManage().cve_fix_plan(data)
+        print(json.dumps(cve_fix_plan))
+
     @staticmethod
     def remove_hotpatch_handle(arguments):
         """
@@ -140,3 +161,14 @@ class VulnerabilityCommand(BaseCommand):
             sys.exit(1)
         cve_rollback_result = RollbackManage().rollback(data)
         print(json.dumps(cve_rollback_result))
+
+    @staticmethod
+    def batch_rollback_handle(arguments):
+        """
+        cve rollback method for several tasks
+        """
+        result, data = validate_data(arguments, CVE_BATCH_ROLLBACK_SCHEMA)
+        if not result:
+            sys.exit(1)
+        cve_rollback_result = RollbackManage().batch_rollback(data)
+        print(json.dumps(cve_rollback_result))
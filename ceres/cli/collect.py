@@ -14,7 +14,7 @@ import json
 import sys
 
 from ceres.cli.base import BaseCommand
-from ceres.function.schema import HOST_INFO_SCHEMA, STRING_ARRAY
+from ceres.function.schema import FILES_COLLECT_SCHEMA, HOST_INFO_SCHEMA, STRING_ARRAY
 from ceres.function.util import validate_data
 from ceres.manages.collect_manage import Collect
 
@@ -33,6 +33,7 @@ class HostCommand(BaseCommand):
         self.command_handlers = {
             'host': self.host_info_collect_handle,
             'file': self.file_content_collect_handle,
+            'files': self.files_content_collect_handle,
             'application': self.application_info_collect_handle,
         }
 
@@ -43,6 +44,7 @@ class HostCommand(BaseCommand):
         command_group = self.parser.add_mutually_exclusive_group(required=True)
         command_group.add_argument("--host", type=str)
         command_group.add_argument("--file", type=str)
+        command_group.add_argument("--files", type=str)
         command_group.add_argument("--application", action="store_true")
 
     def execute(self, args):
@@ -55,6 +57,8 @@ class HostCommand(BaseCommand):
             self.command_handlers["application"]()
         elif args.file:
             self.command_handlers["file"](args.file)
+        elif args.files:
+            self.command_handlers["files"](args.files)
         else:
             print("Please check the input parameters!")
             sys.exit(1)
@@ -69,6 +73,23 @@ class HostCommand(BaseCommand):
             sys.exit(1)
         print(json.dumps(Collect.collect_file(data)))
 
+    @staticmethod
+    def files_content_collect_handle(arguments):
+        """
+        Text files reading method in bulk, the content of unchanged files is not returned
+
+        Args:
+            arguments(str): file list and the sha256 of file content held by the caller. e.g
+            {
+                "file_list": ["/etc/hosts", "/etc/ssh/sshd_config"],
+                "file_hashes": {"/etc/hosts": "9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08"}
+            }
+        """
+        result, data = validate_data(arguments, FILES_COLLECT_SCHEMA)
+        if not result:
+            sys.exit(1)
+        print(json.dumps(Collect.collect_files(data["file_list"], data.get("file_hashes"))))
+
     @staticmethod
     def host_info_collect_handle(arguments):
         """
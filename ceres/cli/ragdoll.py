@@ -14,8 +14,8 @@ import json
 import sys
 
 from ceres.cli.base import BaseCommand
-from ceres.function.schema import CONF_SYNC_SCHEMA
-from ceres.function.status import StatusCode
+from ceres.function.schema import CONF_BATCH_SYNC_SCHEMA, CONF_SYNC_SCHEMA, FILE_LIST_SCHEMA
+from ceres.function.status import SUCCESS, StatusCode
 from ceres.function.util import validate_data
 from ceres.manages.list_file_manage import ListFileManage
 from ceres.manages.sync_manage import SyncManage
@@ -29,7 +29,9 @@ class RagdollCommand(BaseCommand):
         self._add_arguments()
         self.command_handlers = {
             'sync': self.sync_config_handle,
+            'batch_sync': self.batch_sync_config_handle,
             'list': self.query_file_list_handle,
+            'list_files': self.query_file_infos_handle,
         }
 
     def get_command_name(self):
@@ -37,14 +39,16 @@ class RagdollCommand(BaseCommand):
 
     def _add_arguments(self):
         self.parser.add_argument("--sync", type=str, required=False)
+        self.parser.add_argument("--batch-sync", type=str, required=False)
         self.parser.add_argument("--list", type=str, required=False)
+        self.parser.add_argument("--list-files", type=str, required=False)
 
     def execute(self, namespace):
         """
         Command execution entry
         """
         data = vars(namespace)
-        if not data.get("sync") and not data.get("list"):
+        if not any(data.get(option) for option in self.command_handlers):
             print("No command provided. Please enter a valid command.", file=sys.stderr)
             sys.exit(1)
 
@@ -63,6 +67,12 @@ class RagdollCommand(BaseCommand):
                 "file_path" = "/tmp/test"
                 "content" = "contents for this file"
             }
+            or filepath and the unified diff against the current file whose sha256 is base_hash. eg:
+            {
+                "file_path" = "/tmp/test"
+                "base_hash" = "9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08"
+                "diff" = "@@ -1 +1 @@\n-old line\n+new line\n"
+            }
 
         Returns:
             None
@@ -73,6 +83,31 @@ class RagdollCommand(BaseCommand):
         res = StatusCode.make_response_body(SyncManage.sync_contents_to_conf(data))
         print(json.dumps(res))
 
+    @staticmethod
+    def batch_sync_config_handle(arguments):
+        """
+        Write several confs into files in one call
+
+        Args:
+            config(dict): confs in the same format as the sync ones, and whether to roll back all confs when any
+            conf fails to sync. eg:
+            {
+                "configs": [
+                    {"file_path": "/tmp/test", "content": "contents for this file"},
+                    {"file_path": "/tmp/test2", "content": "contents for this file"}
+                ],
+                "rollback": true
+            }
+
+        Returns:
+            None
+        """
+        result, data = validate_data(arguments, CONF_BATCH_SYNC_SCHEMA)
+        if not result:
+            sys.exit(1)
+        res = StatusCode.make_response_body(SyncManage.batch_sync_contents_to_conf(data))
+        print(json.dumps(res))
+
     @staticmethod
     def query_file_list_handle(directory_path):
         """
@@ -85,3 +120,42 @@ class RagdollCommand(BaseCommand):
         status, response = ListFileManage.list_file(directory_path)
         res = StatusCode.make_response_body((status, response))
         print(json.dumps(res))
+
+    @staticmethod
+    def query_file_infos_handle(arguments):
+        """
+        Read the file infos under the specified directory, recursively and page by page
+
+        Args:
+            arguments(dict): listing options. eg:
+            {
+                "directory_path": "/etc",
+                "max_depth": 2,
+                "patterns": ["*.conf"],
+                "with_hash": true,
+                "offset": 0,
+                "limit": 100,
+                "stream": false
+            }
+            In stream mode, each file info is printed as a json line once it is listed, and the status of listing
+            is printed in the last line.
+
+        Returns:
+            None
+        """
+        result, data = validate_data(arguments, FILE_LIST_SCHEMA)
+        if not result:
+            sys.exit(1)
+
+        if not data.get("stream"):
+            res = StatusCode.make_response_body(ListFileManage.list_files(data))
+            print(json.dumps(res))
+            return
+
+        status = ListFileManage.check_directory(data["directory_path"])
+        if status == SUCCESS:
+            for file_info in ListFileManage.iter_file_infos(
+                data["directory_path"], data.get("max_depth", 1), data.get("patterns"), data.get("with_hash")
+            ):
+                print(json.dumps(file_info), flush=True)
+        print(json.dumps(StatusCode.make_response_body(status)))
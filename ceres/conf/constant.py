@@ -18,6 +18,12 @@ BASE_SERVICE_PATH = '/usr/lib/systemd/system'
 CERES_CONFIG_PATH = os.path.join(BASE_CONFIG_PATH, 'ceres.conf')
 DEFAULT_TOKEN_PATH = os.path.join(BASE_CONFIG_PATH, 'ceres_token.json')
 
+CERES_DATA_PATH = '/var/lib/aops/ceres'
+HOST_FACT_CACHE_PATH = os.path.join(CERES_DATA_PATH, 'host_fact_cache.json')
+CVE_SCAN_CACHE_PATH = os.path.join(CERES_DATA_PATH, 'cve_scan_cache.json')
+FILE_FINGERPRINT_CACHE_PATH = os.path.join(CERES_DATA_PATH, 'file_fingerprint_cache.json')
+CVE_FIX_PLAN_PATH = os.path.join(CERES_DATA_PATH, 'fix_plan')
+
 INSTALLABLE_PLUGIN = ['gala-gopher']
 INFORMATION_ABOUT_RPM_SERVICE = {
     "gala-gopher": {"rpm_name": "gala-gopher", "service_name": "gala-gopher"},
@@ -32,6 +38,30 @@ SCANNED_APPLICATION = ["mysql", "kubernetes", "hadoop", "nginx", "docker", "gala
 # provide a dict about plugin name and its class name
 PLUGIN_WITH_CLASS = {'gala-gopher': "GalaGopher"}
 HOST_COLLECT_INFO_SUPPORT = ["cpu", "disk", "memory", "os"]
+# seconds to wait for each host info collector, the collector result is None when it expires
+HOST_COLLECT_INFO_TIMEOUT = 60
+# seconds for which each host fact is cached, all of them are dropped when the host reboots or the kernel changes
+HOST_FACT_CACHE_TTL = {
+    "cpu": 24 * 3600,
+    "memory": 24 * 3600,
+    "disk": 3600,
+    "os_version": 3600,
+    "bios_version": 24 * 3600,
+    "uuid": 24 * 3600,
+}
+# seconds for which the cve scan result is reused when nothing changes, so that the expired repo metadata is
+# still refreshed by dnf periodically
+CVE_SCAN_CACHE_TTL = 24 * 3600
+# seconds for which a cve fix plan can be applied by the fix task with its plan id
+CVE_FIX_PLAN_TTL = 24 * 3600
+# the maximum size in bytes of each collected config file
+FILE_COLLECT_MAX_SIZE = 1024 * 1024
+# the maximum number of config files read at the same time by bulk collection
+FILE_COLLECT_MAX_WORKERS = 8
+# the maximum number of collected files whose fingerprint is cached, the earliest cached ones are dropped first
+FILE_FINGERPRINT_CACHE_MAX_ENTRIES = 10000
+# the maximum depth of subdirectories walked by recursive file listing
+FILE_LIST_MAX_DEPTH = 32
 REGISTER_HELP_INFO = """
     you can choose start or register in manager,
     if you choose register,you need to provide the following information.
@@ -0,0 +1,224 @@
+#!/usr/bin/python3
+# ******************************************************************************
+# Copyright (c) Huawei Technologies Co., Ltd. 2024-2024. All rights reserved.
+# licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN 'AS IS' BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# ******************************************************************************/
+import glob
+import os
+import threading
+from collections import namedtuple
+from typing import Dict, List, Optional, Tuple
+
+from ceres.conf.constant import CommandExitCode
+from ceres.function.log import LOGGER
+from ceres.function.util import execute_shell_command
+
+__all__ = ["BootEntry", "BootLoader", "BOOT_LOADER"]
+
+BootEntry = namedtuple("BootEntry", ["id", "title", "kernel"])
+
+
+class BootLoader:
+    """
+    Query and change the default boot kernel by reading the BLS(Boot Loader Specification) entries and the grub
+    environment block directly. The parsed boot entries are reused until the entries or the grub environment block
+    are modified, and grubby is used only when the boot loader is not configured by BLS.
+
+    BLS entry e.g. /boot/loader/entries/8b6bd9e0a3d9494e9a0f6b5c2bd8e7a3-5.10.0-60.18.0.50.oe2203.x86_64.conf
+        title openEuler (5.10.0-60.18.0.50.oe2203.x86_64) 22.03 LTS
+        version 5.10.0-60.18.0.50.oe2203.x86_64
+        linux /vmlinuz-5.10.0-60.18.0.50.oe2203.x86_64
+
+    grub environment block e.g. /boot/grub2/grubenv
+        # GRUB Environment Block
+        saved_entry=8b6bd9e0a3d9494e9a0f6b5c2bd8e7a3-5.10.0-60.18.0.50.oe2203.x86_64
+        ######...
+    """
+
+    BOOT_PATH = "/boot"
+    BLS_ENTRIES_PATH = "/boot/loader/entries"
+    GRUBENV_PATH = "/boot/grub2/grubenv"
+    GRUBENV_HEADER = "# GRUB Environment Block\n"
+    GRUBENV_SIZE = 1024
+    KERNEL_PREFIX = "vmlinuz-"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state = None
+        self._entries = []
+        self._grubenv = {}
+
+    @classmethod
+    def _get_kernel_version(cls, kernel_path: str) -> str:
+        """
+        e.g. /boot/vmlinuz-5.10.0-60.18.0.50.oe2203.x86_64 >> 5.10.0-60.18.0.50.oe2203.x86_64
+        """
+        kernel_file = os.path.basename(kernel_path.strip())
+        return kernel_file[len(cls.KERNEL_PREFIX) :] if kernel_file.startswith(cls.KERNEL_PREFIX) else ""
+
+    def _get_state(self) -> Tuple:
+        """
+        get the mtime of the BLS entries directory and the grub environment block, which change with the entries
+        """
+        state = []
+        for path in (self.BLS_ENTRIES_PATH, self.GRUBENV_PATH):
+            try:
+                state.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                state.append(None)
+        return tuple(state)
+
+    def _read_entries(self) -> List[BootEntry]:
+        entries = []
+        for entry_path in sorted(glob.glob(os.path.join(self.BLS_ENTRIES_PATH, "*.conf"))):
+            fields = {}
+            try:
+                with open(entry_path, "r", encoding="utf-8") as file:
+                    for line in file:
+                        key, _, value = line.strip().partition(" ")
+                        if key and not key.startswith("#"):
+                            fields.setdefault(key, value.strip())
+            except OSError as error:
+                LOGGER.warning(f"Failed to read boot entry {entry_path}: {error}")
+                continue
+            kernel = self._get_kernel_version(fields.get("linux", ""))
+            if kernel:
+                entries.append(BootEntry(os.path.basename(entry_path)[: -len(".conf")], fields.get("title", ""), kernel))
+        return entries
+
+    def _read_grubenv(self) -> Dict[str, str]:
+        grubenv = {}
+        try:
+            with open(self.GRUBENV_PATH, "r", encoding="utf-8") as file:
+                content = file.read()
+        except OSError as error:
+            LOGGER.warning(f"Failed to read grub environment block: {error}")
+            return grubenv
+
+        for line in content.splitlines():
+            if line.startswith("#") or "=" not in line:
+                continue
+            key, value = line.split("=", 1)
+            grubenv[key] = value
+        return grubenv
+
+    def _load(self):
+        """
+        parse the boot entries and grub environment block again if they are modified since last parsed
+        """
+        state = self._get_state()
+        if state == self._state:
+            return
+        self._entries = self._read_entries()
+        self._grubenv = self._read_grubenv()
+        self._state = state
+
+    def _get_default_entry(self) -> Optional[BootEntry]:
+        saved_entry = self._grubenv.get("saved_entry")
+        if not saved_entry:
+            return None
+        for entry in self._entries:
+            if saved_entry in (entry.id, entry.title):
+                return entry
+        return None
+
+    def get_default_kernel(self) -> Optional[str]:
+        """
+        get the kernel version of the default boot entry
+
+        Returns:
+            str: e.g 5.10.0-60.18.0.50.oe2203.x86_64, None if the query failed
+        """
+        with self._lock:
+            self._load()
+            default_entry = self._get_default_entry()
+        if default_entry is not None:
+            return default_entry.kernel
+
+        # 'grubby --default-kernel' shows boot default kernel version in the system
+        # e.g.
+        # [root@openEuler ~]# grubby --default-kernel
+        # /boot/vmlinuz-4.19.90-2112.8.0.0131.oe1.x86_64
+        code, stdout, stderr = execute_shell_command(["grubby --default-kernel"])
+        if code != CommandExitCode.SUCCEED:
+            LOGGER.error(stderr)
+            return None
+        return self._get_kernel_version(stdout) or None
+
+    def get_installed_kernels(self) -> List[str]:
+        """
+        get the kernel versions which can be booted
+
+        Returns:
+            list: e.g ["5.10.0-60.18.0.50.oe2203.x86_64"]
+        """
+        with self._lock:
+            self._load()
+            if self._entries:
+                return [entry.kernel for entry in self._entries]
+
+        kernels = []
+        for kernel_path in sorted(glob.glob(os.path.join(self.BOOT_PATH, f"{self.KERNEL_PREFIX}*"))):
+            kernel = self._get_kernel_version(kernel_path)
+            # skip the rescue kernel, e.g. vmlinuz-0-rescue-8b6bd9e0a3d9494e9a0f6b5c2bd8e7a3
+            if kernel and not kernel.startswith("0-rescue-"):
+                kernels.append(kernel)
+        return kernels
+
+    def _write_grubenv(self, grubenv: Dict[str, str]) -> bool:
+        """
+        write the grub environment block in place, whose size must be kept unchanged
+        """
+        content = self.GRUBENV_HEADER + "".join(f"{key}={value}\n" for key, value in grubenv.items())
+        if len(content.encode("utf-8")) > self.GRUBENV_SIZE:
+            LOGGER.warning("The grub environment block is full.")
+            return False
+        content += "#" * (self.GRUBENV_SIZE - len(content.encode("utf-8")))
+        try:
+            with open(self.GRUBENV_PATH, "r+", encoding="utf-8") as file:
+                file.write(content)
+                file.truncate()
+                file.flush()
+                os.fsync(file.fileno())
+        except OSError as error:
+            LOGGER.warning(f"Failed to write grub environment block: {error}")
+            return False
+        return True
+
+    def set_default_kernel(self, kernel: str) -> bool:
+        """
+        set the boot entry of the kernel as default
+
+        Args:
+            kernel(str): kernel version, e.g 5.10.0-60.18.0.50.oe2203.x86_64
+
+        Returns:
+            bool
+        """
+        with self._lock:
+            self._load()
+            target_entry = next((entry for entry in self._entries if entry.kernel == kernel), None)
+            if target_entry is not None and self._get_default_entry() is not None:
+                grubenv = dict(self._grubenv, saved_entry=target_entry.id)
+                if self._write_grubenv(grubenv):
+                    self._grubenv, self._state = grubenv, self._get_state()
+                    return True
+
+        # 'grubby --set-default=/boot/vmlinuz-xxx' changes the default boot entry
+        code, _, stderr = execute_shell_command(
+            [f"grubby --set-default={os.path.join(self.BOOT_PATH, self.KERNEL_PREFIX + kernel)}"]
+        )
+        if code != CommandExitCode.SUCCEED:
+            LOGGER.error(stderr)
+            return False
+        return True
+
+
+BOOT_LOADER = BootLoader()
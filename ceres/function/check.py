@@ -13,9 +13,8 @@
 import platform
 from typing import List, Tuple
 
-from ceres.conf.constant import CommandExitCode
+from ceres.function.boot_loader import BOOT_LOADER
 from ceres.function.log import LOGGER
-from ceres.function.util import execute_shell_command
 
 
 class PreCheck(object):
@@ -60,11 +59,9 @@ class PreCheck(object):
             Tuple[bool, str]
             a tuple containing two elements (check result, operation log).
         """
-        # Example of command execution result::
-        # /boot/vmlinuz-5.10.0-60.18.0.50.oe2203.x86_64
-        code, boot_kernel_version, stderr = execute_shell_command(["grubby --default-kernel"])
-        if code != CommandExitCode.SUCCEED:
-            LOGGER.error(stderr)
+        # e.g. 5.10.0-60.18.0.50.oe2203.x86_64
+        boot_kernel_version = BOOT_LOADER.get_default_kernel()
+        if not boot_kernel_version:
             return False, "Query boot kernel info failed!"
 
         current_kernel_version = platform.uname().release
@@ -72,7 +69,7 @@ class PreCheck(object):
             LOGGER.error("stderr")
             return False, "Query current kernel info failed!"
 
-        if boot_kernel_version[14:] == current_kernel_version:
+        if boot_kernel_version == current_kernel_version:
             return True, ""
 
         LOGGER.info(f"The boot kernel information is inconsistent with the current kernel information.")
@@ -0,0 +1,119 @@
+#!/usr/bin/python3
+# ******************************************************************************
+# Copyright (c) Huawei Technologies Co., Ltd. 2024-2024. All rights reserved.
+# licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN 'AS IS' BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# ******************************************************************************/
+import os
+import sqlite3
+import threading
+from typing import Optional, Tuple
+
+from ceres.conf.constant import CommandExitCode
+from ceres.function.log import LOGGER
+from ceres.function.util import execute_shell_command
+
+__all__ = ["DnfHistory"]
+
+
+class DnfHistory:
+    """
+    Read the dnf transaction history from the history database of dnf directly, the dnf command is used only when
+    the database can not be read.
+    """
+
+    HISTORY_DB_PATH = "/var/lib/dnf/history.sqlite"
+
+    _lock = threading.Lock()
+    # the latest transaction id is reused until the history database is modified
+    _cached_db_state = None
+    _cached_transaction_id = None
+
+    @classmethod
+    def _get_db_state(cls) -> Optional[Tuple]:
+        """
+        get the size and mtime of the history database and its write-ahead log, which change with each transaction
+        """
+        state = []
+        for path in (cls.HISTORY_DB_PATH, f"{cls.HISTORY_DB_PATH}-wal"):
+            try:
+                file_stat = os.stat(path)
+            except FileNotFoundError:
+                state.append(None)
+                continue
+            except OSError:
+                return None
+            state.append((file_stat.st_size, file_stat.st_mtime_ns))
+        return tuple(state) if state[0] is not None else None
+
+    @classmethod
+    def query_latest_transaction_id(cls) -> Optional[int]:
+        """
+        Query latest dnf transaction id
+
+        Returns:
+            int: 0 if there is no transaction, None if the query failed
+        """
+        with cls._lock:
+            db_state = cls._get_db_state()
+            if db_state is not None and db_state == cls._cached_db_state:
+                return cls._cached_transaction_id
+
+            transaction_id = cls._query_latest_transaction_id_by_db()
+            if transaction_id is not None:
+                cls._cached_db_state, cls._cached_transaction_id = db_state, transaction_id
+                return transaction_id
+
+        return cls._query_latest_transaction_id_by_command()
+
+    @classmethod
+    def _query_latest_transaction_id_by_db(cls) -> Optional[int]:
+        """
+        query the max id of the transactions by the primary key index of the history database
+
+        Returns:
+            int: None if the history database can not be read
+        """
+        try:
+            conn = sqlite3.connect(f"file:{cls.HISTORY_DB_PATH}?mode=ro", uri=True, timeout=10)
+            try:
+                row = conn.execute("SELECT max(id) FROM trans").fetchone()
+            finally:
+                conn.close()
+        except sqlite3.Error as error:
+            LOGGER.warning(f"Failed to read dnf history database: {error}")
+            return None
+        return row[0] or 0
+
+    @staticmethod
+    def _query_latest_transaction_id_by_command() -> Optional[int]:
+        """
+        query latest dnf transaction id by dnf history command
+
+        Returns:
+            int
+        """
+        # Example of command execution result:
+        # [root@localhost ~]# dnf history
+        # ID   | Command line   | Date and time       | Action(s)     | Altered
+        # ---------------------------------------------------------------------
+        # 3    | rm aops-ceres  | 2023-11-30 09:57    | Removed       | 1
+        # 2    | install gcc    | 2023-11-30 09:57    | Install       | 1
+        code, stdout, stderr = execute_shell_command(
+            ["dnf history", r"grep -E '^\s*[0-9]+'", "head -1", "awk '{print $1}'"]
+        )
+        if code != CommandExitCode.SUCCEED:
+            LOGGER.error(stderr)
+            return None
+
+        try:
+            return int(stdout)
+        except ValueError:
+            LOGGER.error(f"Failed to parse dnf transaction id: {stdout}")
+            return None
@@ -0,0 +1,226 @@
+#!/usr/bin/python3
+# ******************************************************************************
+# Copyright (c) Huawei Technologies Co., Ltd. 2024-2024. All rights reserved.
+# licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN 'AS IS' BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# ******************************************************************************/
+import os
+from collections import namedtuple
+from typing import Dict, Iterable, List, Optional
+
+try:
+    import rpm
+except ImportError:
+    rpm = None
+
+from ceres.conf.constant import CommandExitCode
+from ceres.function.log import LOGGER
+from ceres.function.util import execute_shell_command
+
+__all__ = ["InstalledPackage", "InstalledPackages"]
+
+InstalledPackage = namedtuple("InstalledPackage", ["name", "nevra", "source_rpm"])
+
+
+class InstalledPackages:
+    """
+    Snapshot of the installed rpm packages, which is queried once and shared by the callers.
+    The packages are indexed by name, NEVRA and source rpm for constant time lookups.
+    """
+
+    # Example of command execution result:
+    # openldap:openldap-2.4.50-6.oe1.x86_64:openldap-2.4.50-6.oe1.src.rpm
+    # kernel:kernel-4.19.90-2310.3.0.0222.oe1.x86_64:kernel-4.19.90-2310.3.0.0222.oe1.src.rpm
+    # gpg-pubkey:gpg-pubkey-b25e7f66-5d24a6b8.(none):(none)
+    QUERY_COMMAND = "rpm -qa --queryformat '%{NAME}:%{NAME}-%{VERSION}-%{RELEASE}.%{ARCH}:%{SOURCERPM}\n'"
+    RPMDB_PATH = "/var/lib/rpm"
+
+    def __init__(self, packages: Iterable[InstalledPackage] = ()):
+        self.packages = list(packages)
+        self._name_index = {}
+        self._nevra_index = {}
+        self._source_rpm_index = {}
+        for package in self.packages:
+            self._name_index.setdefault(package.name, []).append(package)
+            self._nevra_index[package.nevra] = package
+            self._source_rpm_index.setdefault(package.source_rpm, []).append(package)
+
+    @classmethod
+    def query(cls) -> "InstalledPackages":
+        """
+        query all installed rpm packages, the rpm database is read by the rpm python module when it is available,
+        otherwise by one rpm command
+
+        Returns:
+            InstalledPackages: it is empty when the query failed
+        """
+        packages = cls._query_by_rpm_module()
+        if packages is not None:
+            return cls(packages)
+        return cls._query_by_rpm_command()
+
+    @staticmethod
+    def _query_by_rpm_module() -> Optional[List[InstalledPackage]]:
+        """
+        read all package headers from the rpm database in process
+
+        Returns:
+            list: installed packages, None if the rpm python module is unavailable or the query failed
+        """
+        if rpm is None:
+            return None
+
+        def to_str(value) -> str:
+            if isinstance(value, bytes):
+                return value.decode("utf-8", errors="replace")
+            return "(none)" if value is None else str(value)
+
+        packages = []
+        try:
+            for header in rpm.TransactionSet().dbMatch():
+                name = to_str(header[rpm.RPMTAG_NAME])
+                nevra = (
+                    f"{name}-{to_str(header[rpm.RPMTAG_VERSION])}-{to_str(header[rpm.RPMTAG_RELEASE])}"
+                    f".{to_str(header[rpm.RPMTAG_ARCH])}"
+                )
+                packages.append(InstalledPackage(name, nevra, to_str(header[rpm.RPMTAG_SOURCERPM])))
+        except rpm.error as error:
+            LOGGER.warning(f"Failed to read rpm database by rpm module: {error}")
+            return None
+        LOGGER.debug("query installed rpm package info succeed!")
+        return packages
+
+    @classmethod
+    def _query_by_rpm_command(cls) -> "InstalledPackages":
+        """
+        query all installed rpm packages by one rpm command
+
+        Returns:
+            InstalledPackages: it is empty when the query failed
+        """
+        code, stdout, _ = execute_shell_command([cls.QUERY_COMMAND])
+        if code != CommandExitCode.SUCCEED or not stdout:
+            LOGGER.error("query installed packages info failed!")
+            return cls()
+
+        packages = []
+        for line in stdout.splitlines():
+            package_info = line.split(":", 2)
+            if len(package_info) != 3:
+                continue
+            packages.append(InstalledPackage(*package_info))
+        LOGGER.debug("query installed rpm package info succeed!")
+        return cls(packages)
+
+    @classmethod
+    def get_rpmdb_fingerprint(cls) -> Optional[str]:
+        """
+        get the fingerprint of the rpm database, which changes whenever a package is installed or removed.
+        The cookie of the rpm database is used when the rpm python module supports it, otherwise the size and
+        mtime of the rpm database files are used instead.
+
+        Returns:
+            str: e.g cookie:2e5ef71ba8e1d7d1f4f5e2fa4c6a6d0ef8e6a90c
+        """
+        if rpm is not None:
+            try:
+                transaction_set = rpm.TransactionSet()
+                # the cookie is supported since rpm 4.16
+                if hasattr(transaction_set, "dbCookie"):
+                    return f"cookie:{transaction_set.dbCookie()}"
+            except rpm.error as error:
+                LOGGER.warning(f"Failed to get rpm database cookie: {error}")
+
+        try:
+            with os.scandir(cls.RPMDB_PATH) as entries:
+                files = sorted(
+                    f"{entry.name}:{entry.stat().st_size}:{entry.stat().st_mtime_ns}"
+                    for entry in entries
+                    if entry.is_file()
+                )
+        except OSError as error:
+            LOGGER.warning(f"Failed to stat rpm database: {error}")
+            return None
+        return f"stat:{','.join(files)}" if files else None
+
+    def get_nevra_by_name(self, kernel_filter: bool = False) -> Dict[str, str]:
+        """
+        get the installed rpm info of each package name, the latter one is kept when several packages have same name
+
+        Args:
+            kernel_filter(bool): only keep the packages relevant to kernel
+
+        Returns:
+            dict: e.g
+                {
+                    "kernel":"kernel-5.10.0-60.92.0.116.oe2203.aarch64"
+                }
+        """
+        rpm_info_dict = {}
+        for package in self.packages:
+            if kernel_filter and "kernel" not in f"{package.name}:{package.nevra}":
+                continue
+            rpm_info_dict[package.name] = package.nevra
+        return rpm_info_dict
+
+    def get_source_packages(self, kernel: bool = True) -> List[Dict[str, str]]:
+        """
+        get the source package name and version of installed packages
+
+        Args:
+            kernel(bool): only for kernel package filtering
+
+        Returns:
+            list: list of dict, each dict is package_name and package_version. e.g
+                [{
+                    "name": "kernel",
+                    "version": "4.19.90-2022.1.1"
+                }]
+        """
+        package_info_dict = {}
+        # each source rpm is parsed once however many binary packages are built from it
+        if kernel:
+            source_rpms = dict.fromkeys(package.source_rpm for package in self.get_by_name("kernel"))
+        else:
+            source_rpms = self._source_rpm_index
+        for source_rpm in source_rpms:
+            package_info = source_rpm.rsplit("-", 2)
+            if len(package_info) == 1:
+                continue
+            package_name = package_info[0]
+            pkg_version = f"{package_info[1]}-{package_info[-1].split('.')[0]}"
+            key = package_name + pkg_version
+            if key not in package_info_dict:
+                package_info_dict[key] = {"name": package_name, "version": pkg_version}
+
+        return list(package_info_dict.values())
+
+    def is_installed(self, nevra: str) -> bool:
+        """
+        check whether the package is installed
+
+        Args:
+            nevra(str): e.g kernel-4.19.90-2112.8.0.0131.oe1.x86_64
+        """
+        return nevra in self._nevra_index
+
+    def get_by_name(self, name: str) -> List[InstalledPackage]:
+        """
+        get all installed packages with the name, e.g. several kernels can be installed at the same time
+        """
+        return self._name_index.get(name, [])
+
+    def get_by_source_rpm(self, source_rpm: str) -> List[InstalledPackage]:
+        """
+        get all installed packages built from the source rpm
+
+        Args:
+            source_rpm(str): e.g kernel-4.19.90-2112.8.0.0131.oe1.src.rpm
+        """
+        return self._source_rpm_index.get(source_rpm, [])
@@ -10,6 +10,8 @@
 # PURPOSE.
 # See the Mulan PSL v2 for more details.
 # ******************************************************************************/
+from ceres.conf.constant import FILE_LIST_MAX_DEPTH
+
 STRING_ARRAY = {"type": "array", "items": {"type": "string", "minLength": 1}, "minItems": 1}
 
 CHANGE_COLLECT_ITEMS_SCHEMA = {
@@ -86,6 +88,18 @@ CVE_FIX_SCHEMA = {
                 },
             },
         },
+        "plan_id": {"type": "string", "pattern": "^[0-9a-f]{32}$"},
+    },
+}
+
+CVE_FIX_PLAN_SCHEMA = {
+    "type": "object",
+    "required": ["check_items", "rpms", "fix_type"],
+    "properties": {
+        "check_items": {"type": "array", "items": {"type": "string"}},
+        "accepted": {"enum": [True, False]},
+        "fix_type": {"enum": ["coldpatch"]},
+        "rpms": CVE_FIX_SCHEMA["properties"]["rpms"],
     },
 }
 
@@ -101,8 +115,48 @@ CVE_ROLLBACK_SCHEMA = {
     },
 }
 
+CVE_BATCH_ROLLBACK_SCHEMA = {
+    "type": "object",
+    "required": ["tasks"],
+    "properties": {
+        "check_items": {"type": "array", "items": {"type": "string"}},
+        "tasks": {
+            "type": "array",
+            "minItems": 1,
+            "items": {
+                "type": "object",
+                "required": CVE_ROLLBACK_SCHEMA["required"],
+                "properties": dict(CVE_ROLLBACK_SCHEMA["properties"], task_id={"type": "string"}),
+            },
+        },
+    },
+}
+
 HOST_INFO_SCHEMA = {"type": "array", "items": {"enum": ["os", "cpu", "memory", "disk"]}}
 
+FILES_COLLECT_SCHEMA = {
+    "type": "object",
+    "required": ["file_list"],
+    "properties": {
+        "file_list": STRING_ARRAY,
+        "file_hashes": {"type": "object", "additionalProperties": {"type": "string", "pattern": "^[0-9a-f]{64}$"}},
+    },
+}
+
+FILE_LIST_SCHEMA = {
+    "type": "object",
+    "required": ["directory_path"],
+    "properties": {
+        "directory_path": {"type": "string", "minLength": 1},
+        "max_depth": {"type": "integer", "minimum": 1, "maximum": FILE_LIST_MAX_DEPTH},
+        "patterns": STRING_ARRAY,
+        "with_hash": {"enum": [True, False]},
+        "offset": {"type": "integer", "minimum": 0},
+        "limit": {"type": "integer", "minimum": 1},
+        "stream": {"enum": [True, False]},
+    },
+}
+
 REMOVE_HOTPATCH_SCHEMA = {
     "type": "object",
     "required": ["cves"],
@@ -111,6 +165,22 @@ REMOVE_HOTPATCH_SCHEMA = {
 
 CONF_SYNC_SCHEMA = {
     "type": "object",
-    "required": ["file_path", "content"],
-    "properties": {"file_path": {"type": "string", "minLength": 1}, "content": {"type": "string", "minLength": 1}},
+    "required": ["file_path"],
+    "properties": {
+        "file_path": {"type": "string", "minLength": 1},
+        "content": {"type": "string", "minLength": 1},
+        "base_hash": {"type": "string", "pattern": "^[0-9a-f]{64}$"},
+        "diff": {"type": "string", "minLength": 1},
+        "target_hash": {"type": "string", "pattern": "^[0-9a-f]{64}$"},
+    },
+    "anyOf": [{"required": ["content"]}, {"required": ["base_hash", "diff"]}],
+}
+
+CONF_BATCH_SYNC_SCHEMA = {
+    "type": "object",
+    "required": ["configs"],
+    "properties": {
+        "configs": {"type": "array", "minItems": 1, "items": CONF_SYNC_SCHEMA},
+        "rollback": {"enum": [True, False]},
+    },
 }
@@ -26,6 +26,8 @@ REPO_NOT_SET = "Repo.Not.Set"
 NO_COMMAND = "No.Command"
 NOT_PATCH = "Not.Patch"
 PRE_CHECK_ERROR = "Pre.Check.Error"
+CONF_BASE_CHANGED = "Conf.Base.Changed"
+CONF_ROLLED_BACK = "Conf.Rolled.Back"
 
 COMMAND_EXEC_ERROR = "Command.Error"
 
@@ -51,6 +53,8 @@ class StatusCode:
         NOT_PATCH: {"msg": "no valid hot patch is matched"},
         COMMAND_EXEC_ERROR: {"msg": "the input command is incorrect"},
         PRE_CHECK_ERROR: {"msg": "Preset check item detection failed"},
+        CONF_BASE_CHANGED: {"msg": "the conf is not the base of the diff, the full content is required"},
+        CONF_ROLLED_BACK: {"msg": "the conf is not synced since other confs failed to sync"},
     }
 
     @classmethod
@@ -11,11 +11,16 @@
 # See the Mulan PSL v2 for more details.
 # ******************************************************************************/
 import configparser
+import grp
 import json
 import os
+import pwd
 import shlex
 import subprocess
-from typing import Union, Tuple, NoReturn, Sequence, Any
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from functools import lru_cache
+from typing import Union, Tuple, NoReturn, Sequence, Any, Callable, Dict, Optional
 
 from libconf import load, ConfigParseError, AttrDict
 from jsonschema import validate, ValidationError
@@ -68,12 +73,14 @@ def validate_data(data: Union[str, dict], schema: dict) -> Tuple[bool, Union[dic
         return False, {}
 
 
-def execute_shell_command(commands: Sequence[str], **kwargs) -> Tuple[int, str, str]:
+def execute_shell_command(commands: Sequence[str], timeout: Optional[float] = None, **kwargs) -> Tuple[int, str, str]:
     """
     execute shell commands
 
     Args:
         command(List[str]): shell command list which needs to execute
+        timeout(float): seconds to wait for the commands, all processes are killed when it expires. default None,
+        which means waiting until the commands exit.
         **kwargs: keyword arguments, it is used to create Popen object.supported options: env, cwd, bufsize, group and
         so on. you can see more options information in annotation of Popen obejct.
 
@@ -87,6 +94,7 @@ def execute_shell_command(commands: Sequence[str], **kwargs) -> Tuple[int, str,
     0, 42, ""
     """
     process = None
+    processes = []
     stdout_data = ""
     stderr_data = ""
 
@@ -113,16 +121,107 @@ def execute_shell_command(commands: Sequence[str], **kwargs) -> Tuple[int, str,
                     shell=False,
                     **kwargs,
                 )
-        stdout, stderr = process.communicate()
+            processes.append(process)
+        stdout, stderr = process.communicate(timeout=timeout)
         stderr_data += stderr
         stdout_data += stdout
         return process.returncode, stdout_data.strip(), stderr_data.strip()
 
+    except subprocess.TimeoutExpired:
+        for running_process in processes:
+            running_process.kill()
+        for running_process in processes:
+            running_process.wait()
+        LOGGER.error(f"Command {' | '.join(commands)} timed out after {timeout} seconds.")
+        return CommandExitCode.FAIL, stdout_data, f"Command timed out after {timeout} seconds."
     except Exception as error:
         LOGGER.error(error)
         return CommandExitCode.FAIL, stdout_data, str(error)
 
 
+def execute_concurrently(
+    functions: Dict[str, Callable[[], Any]], timeout: Optional[float] = None, max_workers: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    execute independent functions concurrently and wait for all of them until the same deadline, the functions which
+    are not started before the deadline are cancelled. A running function can't be stopped when it times out, so
+    the shell commands run by the functions must have their own timeout, e.g. execute_shell_command(cmd, timeout)
+
+    Args:
+        functions(Dict[str, Callable]): the function without arguments to execute for each key,
+        e.g. {"cpu": partial(execute_shell_command, ["lscpu"]), "disk": Collect._get_disk_info}
+        timeout(float): seconds to wait for all functions, default None
+        max_workers(int): the maximum number of functions running at the same time, default is the number of functions
+
+    Returns:
+        Dict[str, Any]
+        the return value of each key, it is None when the function raised, timed out or was cancelled. e.g.
+        {
+            "cpu": (0, "Architecture: x86_64 ...", ""),
+            "disk": None
+        }
+    """
+    if not functions:
+        return {}
+
+    result = {}
+    futures = {}
+    executor = ThreadPoolExecutor(max_workers=max_workers or len(functions))
+    try:
+        for key, function in functions.items():
+            futures[key] = executor.submit(function)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for key, future in futures.items():
+            try:
+                result[key] = future.result(timeout=None if deadline is None else max(deadline - time.monotonic(), 0))
+            except FutureTimeoutError:
+                LOGGER.warning(f"Execute {key} timed out after {timeout} seconds.")
+                result[key] = None
+            except Exception as error:
+                LOGGER.error(f"Failed to execute {key}: {error}")
+                result[key] = None
+    finally:
+        # cancel the functions not started yet, the cancel_futures argument of shutdown requires python 3.9
+        for future in futures.values():
+            future.cancel()
+        executor.shutdown(wait=False)
+    return result
+
+
+@lru_cache(maxsize=None)
+def get_user_name(uid: int) -> str:
+    """
+    get the name of the user
+
+    Args:
+        uid(int): user id
+
+    Returns:
+        str: user name, or the uid itself if the user does not exist
+    """
+    try:
+        return pwd.getpwuid(uid)[0]
+    except KeyError:
+        return str(uid)
+
+
+@lru_cache(maxsize=None)
+def get_group_name(gid: int) -> str:
+    """
+    get the name of the group
+
+    Args:
+        gid(int): group id
+
+    Returns:
+        str: group name, or the gid itself if the group does not exist
+    """
+    try:
+        return grp.getgrgid(gid)[0]
+    except KeyError:
+        return str(gid)
+
+
 def load_gopher_config(gopher_config_path: str) -> AttrDict:
     """
     get AttrDict from config file
@@ -10,34 +10,433 @@
 # PURPOSE.
 # See the Mulan PSL v2 for more details.
 # ******************************************************************************/
+import glob
 import grp
+import hashlib
+import json
 import os
 import pwd
 import re
 import platform
+import stat
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from socket import AF_INET, SOCK_DGRAM, socket
-from typing import Any, Dict, List, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 import xml.etree.ElementTree as ET
 
 from ceres.conf.constant import (
+    FILE_COLLECT_MAX_SIZE,
+    FILE_COLLECT_MAX_WORKERS,
+    FILE_FINGERPRINT_CACHE_MAX_ENTRIES,
+    FILE_FINGERPRINT_CACHE_PATH,
     HOST_COLLECT_INFO_SUPPORT,
+    HOST_COLLECT_INFO_TIMEOUT,
+    HOST_FACT_CACHE_PATH,
+    HOST_FACT_CACHE_TTL,
     INFORMATION_ABOUT_RPM_SERVICE,
     INSTALLABLE_PLUGIN,
     PLUGIN_WITH_CLASS,
     SCANNED_APPLICATION,
     CommandExitCode,
 )
+from ceres.function.installed_package import InstalledPackages
 from ceres.function.log import LOGGER
-from ceres.function.util import execute_shell_command, plugin_status_judge
+from ceres.function.util import (
+    execute_concurrently,
+    execute_shell_command,
+    get_group_name,
+    get_user_name,
+    plugin_status_judge,
+)
 from ceres.manages import plugin_manage
 from ceres.manages.resource_manage import Resource
 
 
+class HostFactReader:
+    """
+    Read host facts from /proc, /sys and /etc directly instead of executing commands.
+    Each method returns None when the fact is unavailable, then the caller falls back to the command.
+    """
+
+    CPUINFO_PATH = "/proc/cpuinfo"
+    CPU_SYS_PATH = "/sys/devices/system/cpu"
+    MEMORY_SYS_PATH = "/sys/devices/system/memory"
+    DMI_ID_PATH = "/sys/class/dmi/id"
+    OS_RELEASE_PATH = "/etc/os-release"
+    CACHE_TYPE_SUFFIX = {"Data": "d", "Instruction": "i"}
+
+    @staticmethod
+    def read_file(file_path: str) -> Optional[str]:
+        """
+        read the whole content of a small file
+
+        Returns:
+            str: stripped file content, None if the file can not be read
+        """
+        try:
+            with open(file_path, "r", encoding="utf-8") as file:
+                return file.read().strip()
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def format_size(size: int, binary_suffix: bool = False) -> str:
+        """
+        format size in bytes in the same way as util-linux commands
+
+        Args:
+            size(int): size in bytes
+            binary_suffix(bool): use 'KiB' with a space like lscpu, otherwise 'K' like lsmem
+
+        Returns:
+            str: e.g 2.5G, 32 KiB
+        """
+        units = ["B", "K", "M", "G", "T", "P"]
+        index = 0
+        value = float(size)
+        while value >= 1024 and index < len(units) - 1:
+            value /= 1024
+            index += 1
+        number = f"{value:.1f}".rstrip("0").rstrip(".")
+        if not binary_suffix:
+            return f"{number}{units[index]}"
+        return f"{number} {units[index] + 'iB' if index else units[index]}"
+
+    @staticmethod
+    def _parse_sys_size(size: str) -> int:
+        """
+        parse size in sysfs, e.g 32K, 8192K
+        """
+        multiples = {"K": 1024, "M": 1024**2, "G": 1024**3}
+        if size[-1] in multiples:
+            return int(size[:-1]) * multiples[size[-1]]
+        return int(size)
+
+    @staticmethod
+    def _count_cpu_list(cpu_list: str) -> int:
+        """
+        count cpus in cpu list, e.g 0-3,6,8-9
+        """
+        count = 0
+        for cpu_range in cpu_list.split(","):
+            start, _, end = cpu_range.partition("-")
+            count += int(end or start) - int(start) + 1
+        return count
+
+    @classmethod
+    def _get_cpu_caches(cls) -> Dict[str, str]:
+        """
+        get the total size of each cache level, the cache shared by several cpus is counted only once
+
+        Returns:
+            dict: e.g {"l1d_cache": "32 KiB", "l1i_cache": "32 KiB", "l2_cache": "512 KiB", "l3_cache": "8 MiB"}
+        """
+        cache_instances = {}
+        for index_path in glob.glob(os.path.join(cls.CPU_SYS_PATH, "cpu[0-9]*", "cache", "index[0-9]*")):
+            level = cls.read_file(os.path.join(index_path, "level"))
+            cache_type = cls.read_file(os.path.join(index_path, "type"))
+            size = cls.read_file(os.path.join(index_path, "size"))
+            shared_cpu_map = cls.read_file(os.path.join(index_path, "shared_cpu_map"))
+            if not all((level, cache_type, size, shared_cpu_map)):
+                continue
+            cache_name = f"l{level}{cls.CACHE_TYPE_SUFFIX.get(cache_type, '')}_cache"
+            cache_instances.setdefault(cache_name, {})[shared_cpu_map] = cls._parse_sys_size(size)
+
+        return {
+            cache_name: cls.format_size(sum(instances.values()), binary_suffix=True)
+            for cache_name, instances in cache_instances.items()
+        }
+
+    @classmethod
+    def get_cpu_info(cls) -> Optional[Dict[str, str]]:
+        """
+        get cpu info from /proc/cpuinfo and /sys/devices/system/cpu
+
+        Returns:
+            dict: the same as Collect._get_cpu_info, None if cpu model or vendor can not be read directly,
+            e.g. aarch64 only reports the implementer and part number which are decoded by lscpu
+        """
+        cpuinfo = cls.read_file(cls.CPUINFO_PATH)
+        present_cpus = cls.read_file(os.path.join(cls.CPU_SYS_PATH, "present"))
+        if not cpuinfo or not present_cpus:
+            return None
+
+        fields = {}
+        for line in cpuinfo.splitlines():
+            key, separator, value = line.partition(":")
+            if separator:
+                fields.setdefault(key.strip(), value.strip())
+        if not fields.get("model name") or not fields.get("vendor_id"):
+            return None
+
+        try:
+            core_count = cls._count_cpu_list(present_cpus)
+            caches = cls._get_cpu_caches()
+        except ValueError:
+            return None
+
+        return {
+            "architecture": platform.machine(),
+            "core_count": str(core_count),
+            "model_name": fields.get("model name"),
+            "vendor_id": fields.get("vendor_id"),
+            "l1d_cache": caches.get("l1d_cache"),
+            "l1i_cache": caches.get("l1i_cache"),
+            "l2_cache": caches.get("l2_cache"),
+            "l3_cache": caches.get("l3_cache"),
+        }
+
+    @classmethod
+    def get_total_online_memory(cls) -> Optional[str]:
+        """
+        get total online memory from /sys/devices/system/memory
+
+        Returns:
+            str: memory size in the same format as lsmem, e.g 2.5G
+        """
+        block_size = cls.read_file(os.path.join(cls.MEMORY_SYS_PATH, "block_size_bytes"))
+        if not block_size:
+            return None
+        try:
+            block_size = int(block_size, 16)
+        except ValueError:
+            return None
+
+        online_blocks = 0
+        for state_path in glob.glob(os.path.join(cls.MEMORY_SYS_PATH, "memory[0-9]*", "state")):
+            if cls.read_file(state_path) == "online":
+                online_blocks += 1
+        if not online_blocks:
+            return None
+        return cls.format_size(block_size * online_blocks)
+
+    @classmethod
+    def get_dmi_info(cls, name: str) -> Optional[str]:
+        """
+        get dmi info from /sys/class/dmi/id, some of them are readable only by root
+
+        Args:
+            name(str): e.g bios_version, product_uuid
+
+        Returns:
+            str
+        """
+        return cls.read_file(os.path.join(cls.DMI_ID_PATH, name)) or None
+
+
+class HostFactCache:
+    """
+    Cache the host facts which almost never change across ceres invocations. Each fact expires after its own ttl,
+    and all facts are dropped when the boot id or the kernel changes.
+
+    cache file e.g.
+        {
+            "boot_id": "4b4b1ec5-8b9a-4cc0-a7d9-1ff8bd7ab1f4",
+            "kernel": "5.10.0-60.18.0.50.oe2203.x86_64",
+            "facts": {
+                "bios_version": {"value": "1.16.0", "expire_time": 1697600000.0}
+            }
+        }
+    """
+
+    BOOT_ID_PATH = "/proc/sys/kernel/random/boot_id"
+
+    def __init__(self, cache_path: str = HOST_FACT_CACHE_PATH):
+        self._cache_path = cache_path
+        self._lock = threading.Lock()
+        self._facts = None
+
+    def _get_host_identity(self) -> Dict[str, str]:
+        return {"boot_id": HostFactReader.read_file(self.BOOT_ID_PATH), "kernel": platform.release()}
+
+    def _load(self) -> dict:
+        if self._facts is not None:
+            return self._facts
+
+        self._facts = {}
+        try:
+            with open(self._cache_path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return self._facts
+
+        if not isinstance(data, dict) or not isinstance(data.get("facts"), dict):
+            return self._facts
+        identity = self._get_host_identity()
+        if all(data.get(key) == value for key, value in identity.items()):
+            self._facts = data["facts"]
+        return self._facts
+
+    def _save(self):
+        data = dict(self._get_host_identity(), facts=self._facts)
+        tmp_path = f"{self._cache_path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self._cache_path), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as file:
+                json.dump(data, file)
+            os.replace(tmp_path, self._cache_path)
+        except OSError as error:
+            LOGGER.warning(f"Failed to save host fact cache: {error}")
+
+    def get(self, name: str, getter: Callable[[], Any], validator: Callable[[Any], bool] = bool) -> Any:
+        """
+        get the cached fact, or get it by the getter and cache it when it is valid
+
+        Args:
+            name(str): fact name in HOST_FACT_CACHE_TTL, e.g cpu
+            getter(Callable): function to get the fact when it is not cached or expired
+            validator(Callable): check whether the fact is got successfully, only valid fact is cached
+
+        Returns:
+            the fact
+        """
+        with self._lock:
+            fact = self._load().get(name)
+            if isinstance(fact, dict) and fact.get("expire_time", 0) > time.time():
+                return fact.get("value")
+
+        value = getter()
+        if not validator(value):
+            return value
+
+        with self._lock:
+            self._load()[name] = {"value": value, "expire_time": time.time() + HOST_FACT_CACHE_TTL.get(name, 0)}
+            self._save()
+        return value
+
+
+HOST_FACT_CACHE = HostFactCache()
+
+
+class FileFingerprintCache:
+    """
+    sha256 of the collected files cached across invocations, keyed by the stat of each file. A file whose device,
+    inode, size, mtime and ctime are all unchanged is taken as unchanged, so it needn't be read again. The ctime
+    is also compared since it is updated whenever the file is written or its attribute is changed, and can't be
+    set back by the user.
+
+    cache file e.g.
+        {
+            "files": {
+                "/etc/hosts": {
+                    "device": 64768,
+                    "inode": 1837416,
+                    "size": 158,
+                    "mtime_ns": 1697600000000000000,
+                    "ctime_ns": 1697600000000000000,
+                    "sha256": "9f86d081..."
+                }
+            }
+        }
+    """
+
+    # a file modified within this interval before it is read is not cached, since it may be modified again
+    # without changing its timestamps when the timestamp granularity of the file system is coarse
+    RACY_INTERVAL_NS = 2 * 10**9
+
+    def __init__(self, cache_path: str = FILE_FINGERPRINT_CACHE_PATH):
+        self._cache_path = cache_path
+        self._lock = threading.Lock()
+        self._files = None
+        self._modified = False
+
+    @staticmethod
+    def _get_fingerprint(file_stat: os.stat_result) -> Dict[str, int]:
+        return {
+            "device": file_stat.st_dev,
+            "inode": file_stat.st_ino,
+            "size": file_stat.st_size,
+            "mtime_ns": file_stat.st_mtime_ns,
+            "ctime_ns": file_stat.st_ctime_ns,
+        }
+
+    def _load(self) -> dict:
+        if self._files is not None:
+            return self._files
+
+        self._files = {}
+        try:
+            with open(self._cache_path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return self._files
+
+        if isinstance(data, dict) and isinstance(data.get("files"), dict):
+            self._files = data["files"]
+        return self._files
+
+    def get_hash(self, file_path: str, file_stat: os.stat_result) -> Optional[str]:
+        """
+        get the cached sha256 of the file
+
+        Args:
+            file_path(str): file absolute path
+            file_stat(os.stat_result): current stat of the file
+
+        Returns:
+            str: None if the file is not cached or changed since it is cached
+        """
+        with self._lock:
+            cached = self._load().get(file_path)
+        if not isinstance(cached, dict):
+            return None
+        fingerprint = self._get_fingerprint(file_stat)
+        if any(cached.get(key) != value for key, value in fingerprint.items()):
+            return None
+        return cached.get("sha256")
+
+    def set_hash(self, file_path: str, file_stat: os.stat_result, sha256: str):
+        """
+        cache the sha256 of the file content read with the stat
+        """
+        if time.time_ns() - max(file_stat.st_mtime_ns, file_stat.st_ctime_ns) < self.RACY_INTERVAL_NS:
+            return
+
+        with self._lock:
+            files = self._load()
+            # the refreshed file is moved to the end, so that the earliest cached file is dropped first
+            files.pop(file_path, None)
+            files[file_path] = dict(self._get_fingerprint(file_stat), sha256=sha256)
+            while len(files) > FILE_FINGERPRINT_CACHE_MAX_ENTRIES:
+                files.pop(next(iter(files)))
+            self._modified = True
+
+    def save(self):
+        """
+        save the cache when any fingerprint is changed
+        """
+        with self._lock:
+            if not self._modified:
+                return
+            tmp_path = f"{self._cache_path}.tmp"
+            try:
+                os.makedirs(os.path.dirname(self._cache_path), exist_ok=True)
+                with open(tmp_path, "w", encoding="utf-8") as file:
+                    json.dump({"files": self._files}, file)
+                os.replace(tmp_path, self._cache_path)
+                self._modified = False
+            except OSError as error:
+                LOGGER.warning(f"Failed to save file fingerprint cache: {error}")
+
+
+FILE_FINGERPRINT_CACHE = FileFingerprintCache()
+
+
 class Collect:
     """
     Provides functions to collect information.
     """
 
+    # host info which is cached across invocations, and the check whether it is collected successfully
+    CACHED_HOST_INFO_VALIDATOR = {
+        "cpu": lambda cpu_info: any(cpu_info.values()),
+        "memory": lambda memory_info: memory_info.get("total") is not None,
+        "disk": bool,
+    }
+
     def get_host_info(self, info_type: List[str]) -> dict:
         """
         get basic info about machine
@@ -90,14 +489,17 @@ class Collect:
                         }
                 }
         """
-        host_info = {}
         if not info_type:
             info_type = HOST_COLLECT_INFO_SUPPORT
+        collectors = {}
         for info_name in info_type:
-            func_name = getattr(self, f"_get_{info_name}_info")
-            host_info[info_name] = func_name()
+            func = getattr(self, f"_get_{info_name}_info")
+            if info_name in self.CACHED_HOST_INFO_VALIDATOR:
+                func = partial(HOST_FACT_CACHE.get, info_name, func, self.CACHED_HOST_INFO_VALIDATOR[info_name])
+            collectors[info_name] = func
 
-        return host_info
+        # the collectors are independent, run them at the same time and keep the partial result when one fails
+        return execute_concurrently(collectors, HOST_COLLECT_INFO_TIMEOUT)
 
     @staticmethod
     def get_os_version() -> str:
@@ -107,7 +509,19 @@ class Collect:
         Returns:
             str: e.g openEuler 21.09
         """
-        _, stdout, _ = execute_shell_command(["cat /etc/os-release"])
+        return HOST_FACT_CACHE.get("os_version", Collect._read_os_version)
+
+    @staticmethod
+    def _read_os_version() -> str:
+        """
+            read system name and its version from /etc/os-release
+
+        Returns:
+            str: e.g openEuler-21.09
+        """
+        stdout = HostFactReader.read_file(HostFactReader.OS_RELEASE_PATH)
+        if stdout is None:
+            _, stdout, _ = execute_shell_command(["cat /etc/os-release"], timeout=HOST_COLLECT_INFO_TIMEOUT)
         res = re.search('(?=PRETTY_NAME=).+', stdout)
 
         if res:
@@ -132,7 +546,7 @@ class Collect:
             'os_arch': platform.machine(),
             'os_name': self.get_os_name(),
             'os_version': self.get_os_version(),
-            'bios_version': self.__get_bios_version(),
+            'bios_version': HOST_FACT_CACHE.get("bios_version", self.__get_bios_version),
             'kernel': kernel_info.group() if kernel_info else "",
         }
         return res
@@ -167,7 +581,11 @@ class Collect:
         Returns:
             str
         """
-        _, stdout, _ = execute_shell_command(["dmidecode -s bios-version"])
+        bios_version = HostFactReader.get_dmi_info("bios_version")
+        if bios_version is not None:
+            return bios_version
+
+        _, stdout, _ = execute_shell_command(["dmidecode -s bios-version"], timeout=HOST_COLLECT_INFO_TIMEOUT)
 
         return stdout
 
@@ -184,7 +602,7 @@ class Collect:
     @staticmethod
     def _get_cpu_info() -> Dict[str, str]:
         """
-        get cpu info by command lscpu
+        get cpu info from /proc and /sys, or by command lscpu when they are unavailable
 
         Returns:
             dict: e.g
@@ -199,7 +617,13 @@ class Collect:
                     "l3_cache": string
                 }
         """
-        _, stdout, _ = execute_shell_command(["lscpu"], **{"env": {"LANG": "en_US.utf-8"}})
+        res = HostFactReader.get_cpu_info()
+        if res is not None:
+            return res
+
+        _, stdout, _ = execute_shell_command(
+            ["lscpu"], timeout=HOST_COLLECT_INFO_TIMEOUT, **{"env": {"LANG": "en_US.utf-8"}}
+        )
 
         info_list = [line for line in stdout.strip().split('\n') if ":" in line]
 
@@ -227,12 +651,16 @@ class Collect:
     @staticmethod
     def __get_total_online_memory() -> str:
         """
-        get memory size by lsmem
+        get memory size from /sys, or by lsmem when it is unavailable
 
         Returns:
             str: memory size
         """
-        _, stdout, _ = execute_shell_command(["lsmem"])
+        memory_size = HostFactReader.get_total_online_memory()
+        if memory_size is not None:
+            return memory_size
+
+        _, stdout, _ = execute_shell_command(["lsmem"], timeout=HOST_COLLECT_INFO_TIMEOUT)
 
         res = re.search("(?=Total online memory:).+", stdout)
         if res:
@@ -263,7 +691,7 @@ class Collect:
         """
         res = {'size': self.__get_total_online_memory() or None, "total": None, "info": []}
 
-        code, memory_data, _ = execute_shell_command(["dmidecode -t memory"])
+        code, memory_data, _ = execute_shell_command(["dmidecode -t memory"], timeout=HOST_COLLECT_INFO_TIMEOUT)
 
         # dmidecode -t memory
         # e.g
@@ -324,7 +752,7 @@ class Collect:
                     }
                 ]
         """
-        code, stdout, _ = execute_shell_command(["lshw -xml -c disk"])
+        code, stdout, _ = execute_shell_command(["lshw -xml -c disk"], timeout=HOST_COLLECT_INFO_TIMEOUT)
         if code != CommandExitCode.SUCCEED:
             LOGGER.error(stdout)
             return []
@@ -402,7 +830,22 @@ class Collect:
         Returns:
             uuid(str)
         """
-        code, stdout, _ = execute_shell_command(["dmidecode", "-s", "system-uuid"])
+        return HOST_FACT_CACHE.get("uuid", Collect._read_uuid)
+
+    @staticmethod
+    def _read_uuid() -> str:
+        """
+            read uuid from /sys/class/dmi/id or by dmidecode
+
+        Returns:
+            uuid(str)
+        """
+        product_uuid = HostFactReader.get_dmi_info("product_uuid")
+        if product_uuid is not None:
+            # keep the same format as dmidecode
+            return product_uuid.upper().replace("-", "")
+
+        code, stdout, _ = execute_shell_command(["dmidecode -s system-uuid"], timeout=HOST_COLLECT_INFO_TIMEOUT)
         if code == CommandExitCode.SUCCEED:
             return stdout.replace("-", "").strip()
         return ""
@@ -426,12 +869,13 @@ class Collect:
         return host_ip
 
     @staticmethod
-    def get_installed_packages(kernel=True):
+    def get_installed_packages(kernel=True, installed_packages: Optional[InstalledPackages] = None):
         """
         query installed packages
 
         Args:
             kernel(bool): only for kernel package filtering
+            installed_packages(InstalledPackages): installed packages snapshot to reuse, it is queried when not given
 
         Returns:
             list: list of dict, each dict is package_name and package_version. e.g
@@ -440,27 +884,9 @@ class Collect:
                     "version": "4.19.90-2022.1.1"
                 }]
         """
-        if kernel:
-            command = ["rpm -qi kernel", "grep .src.rpm"]
-        else:
-            command = ["rpm -qai", "grep .src.rpm"]
-        code, source_name_info, _ = execute_shell_command(command)
-        if code != CommandExitCode.SUCCEED:
-            LOGGER.error("Failed to query installed packages.")
-            return []
-
-        package_info_dict = {}
-        for package_source_name in source_name_info.splitlines():
-            package_info = package_source_name.rsplit("-", 2)
-            if len(package_info) == 1:
-                continue
-            package = package_info[0].split(':')[1].strip()
-            pkg_version = f"{package_info[1]}-{package_info[-1].split('.')[0]}"
-            key = package + pkg_version
-            if key not in package_info_dict:
-                package_info_dict[key] = {"name": package, "version": pkg_version}
-
-        return list(package_info_dict.values())
+        if installed_packages is None:
+            installed_packages = InstalledPackages.query()
+        return installed_packages.get_source_packages(kernel)
 
     @staticmethod
     def get_application_info() -> list:
@@ -566,3 +992,137 @@ class Collect:
             result['success_files'].append(file_path)
             result['infos'].append(info)
         return result
+
+    @staticmethod
+    def collect_files(file_list: List[str], file_hashes: Optional[Dict[str, str]] = None) -> dict:
+        """
+        collect config files in bulk, the files are read concurrently and each file is stat only once.
+        The content of the file whose sha256 is the same as the one held by the caller is not returned, and such
+        file is not even read when it is unchanged since its sha256 is cached by FILE_FINGERPRINT_CACHE.
+
+        Args:
+            file_list(list): file absolute paths
+            file_hashes(dict): sha256 of file content held by the caller, e.g. {"/etc/hosts": "9f86d081..."}
+
+        Returns:
+            dict: e.g
+                {
+                    "success_files": ["/etc/hosts", "/etc/ssh/sshd_config"],
+                    "fail_files": ["/etc/not_exist"],
+                    "unchanged_files": ["/etc/hosts"],
+                    "infos": [{
+                        "path": "/etc/hosts",
+                        "file_attr": {"mode": "0644", "owner": "root", "group": "root"},
+                        "sha256": "9f86d081..."
+                    }, {
+                        "path": "/etc/ssh/sshd_config",
+                        "file_attr": {"mode": "0600", "owner": "root", "group": "root"},
+                        "sha256": "60303ae2...",
+                        "content": "..."
+                    }]
+                }
+        """
+        file_hashes = file_hashes or {}
+        result = {"success_files": [], "fail_files": [], "unchanged_files": [], "infos": []}
+        # the same file is collected once when it is given several times
+        file_list = list(dict.fromkeys(file_list))
+        if not file_list:
+            return result
+
+        with ThreadPoolExecutor(max_workers=min(FILE_COLLECT_MAX_WORKERS, len(file_list))) as executor:
+            infos = executor.map(
+                Collect._collect_file_info, file_list, [file_hashes.get(file_path) for file_path in file_list]
+            )
+            for file_path, info in zip(file_list, infos):
+                if not info:
+                    result["fail_files"].append(file_path)
+                    continue
+                result["success_files"].append(file_path)
+                if file_hashes.get(file_path) == info["sha256"]:
+                    info.pop("content", None)
+                    result["unchanged_files"].append(file_path)
+                result["infos"].append(info)
+        FILE_FINGERPRINT_CACHE.save()
+        return result
+
+    @staticmethod
+    def _collect_file_info(file_path: str, known_hash: Optional[str] = None) -> dict:
+        """
+        get the info of a config file, the file is only stat when it is unchanged since its sha256 is cached and
+        the sha256 is the same as the one held by the caller
+
+        Returns:
+            dict: the same as _read_file_info, without content when the file is not read
+        """
+        if known_hash is not None:
+            try:
+                file_stat = os.stat(file_path)
+            except OSError:
+                file_stat = None
+            if (
+                file_stat is not None
+                and stat.S_ISREG(file_stat.st_mode)
+                and FILE_FINGERPRINT_CACHE.get_hash(file_path, file_stat) == known_hash
+            ):
+                return {"path": file_path, "file_attr": Collect._get_file_attr(file_stat), "sha256": known_hash}
+
+        return Collect._read_file_info(file_path)
+
+    @staticmethod
+    def _read_file_info(file_path: str) -> dict:
+        """
+        read the content, sha256 and attribute of a config file, the file is stat once by its opened descriptor
+
+        Returns:
+            dict: the same as get_file_info with sha256 of the content, empty if the file can not be collected
+        """
+        try:
+            # O_NONBLOCK keeps a fifo from blocking the open, it is rejected as a non-regular file below
+            fd = os.open(file_path, os.O_RDONLY | os.O_NONBLOCK)
+        except OSError as error:
+            LOGGER.error(f"File:{file_path} cannot be opened: {error}")
+            return {}
+
+        file_stat = os.fstat(fd)
+        if not stat.S_ISREG(file_stat.st_mode):
+            os.close(fd)
+            LOGGER.error(f"File:{file_path} is not a file")
+            return {}
+
+        with os.fdopen(fd, "rb") as file:
+            # the same as os.access(file_path, os.X_OK) for root
+            if file_stat.st_mode & (stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH):
+                LOGGER.warning(f"{file_path} is an executable file")
+                return {}
+            if file_stat.st_size > FILE_COLLECT_MAX_SIZE:
+                LOGGER.warning(f"{file_path} is too large")
+                return {}
+            try:
+                data = file.read(FILE_COLLECT_MAX_SIZE + 1)
+                content = data.decode("utf8")
+            except (OSError, ValueError) as error:
+                LOGGER.error(f'Failed to read file named {file_path} with error message:\n {error}')
+                return {}
+
+        sha256 = hashlib.sha256(data).hexdigest()
+        FILE_FINGERPRINT_CACHE.set_hash(file_path, file_stat, sha256)
+        return {
+            "path": file_path,
+            "file_attr": Collect._get_file_attr(file_stat),
+            "sha256": sha256,
+            "content": content,
+        }
+
+    @staticmethod
+    def _get_file_attr(file_stat: os.stat_result) -> Dict[str, str]:
+        """
+        get the mode, owner and group of the file
+
+        Returns:
+            dict: e.g {"mode": "0644", "owner": "root", "group": "root"}
+        """
+        return {
+            "mode": oct(file_stat.st_mode)[4:],
+            "owner": get_user_name(file_stat.st_uid),
+            "group": get_group_name(file_stat.st_gid),
+        }
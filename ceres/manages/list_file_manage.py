@@ -13,10 +13,16 @@
 # Author: Lay
 # Description: default
 # Date: 2023/6/14 16:31
+import fnmatch
+import hashlib
 import os
+import stat
+from typing import Iterator, List, Optional, Tuple
 
+from ceres.conf.constant import FILE_COLLECT_MAX_SIZE
 from ceres.function.log import LOGGER
 from ceres.function.status import FILE_NOT_FOUND, UNKNOWN_ERROR, SUCCESS, PARAM_ERROR
+from ceres.function.util import get_group_name, get_user_name
 
 
 class ListFileManage:
@@ -47,3 +53,172 @@ class ListFileManage:
         except OSError as e:
             LOGGER.error(f"Failed to read the file list under the path with message {e}")
             return UNKNOWN_ERROR, {"resp": list()}
+
+    @staticmethod
+    def list_files(config: dict) -> Tuple[str, dict]:
+        """
+        list the files under the directory with their stat info, the directory can be listed recursively and page by
+        page
+
+        Args:
+            config(dict): listing options. eg:
+            {
+                "directory_path": "/etc",
+                "max_depth": 2,
+                "patterns": ["*.conf"],
+                "with_hash": true,
+                "offset": 0,
+                "limit": 100
+            }
+
+        Returns:
+            Tuple[str, dict]
+            a tuple containing two elements (status code, file infos and the offset of next page). eg:
+            (
+                "Succeed",
+                {
+                    "resp": [{
+                        "path": "/etc/ssh/sshd_config",
+                        "type": "file",
+                        "size": 3667,
+                        "mtime": 1686731460.0,
+                        "file_attr": {"mode": "0600", "owner": "root", "group": "root"},
+                        "sha256": "60303ae2..."
+                    }],
+                    "next_offset": 100
+                }
+            )
+            next_offset is None when there are no more files
+        """
+        status = ListFileManage.check_directory(config["directory_path"])
+        if status != SUCCESS:
+            return status, {"resp": [], "next_offset": None}
+
+        offset = config.get("offset", 0)
+        limit = config.get("limit")
+        file_infos = []
+        next_offset = None
+        for index, file_info in enumerate(
+            ListFileManage.iter_file_infos(
+                config["directory_path"], config.get("max_depth", 1), config.get("patterns"), config.get("with_hash")
+            )
+        ):
+            if index < offset:
+                continue
+            if limit is not None and index >= offset + limit:
+                next_offset = index
+                break
+            file_infos.append(file_info)
+        return SUCCESS, {"resp": file_infos, "next_offset": next_offset}
+
+    @staticmethod
+    def check_directory(directory_path: str) -> str:
+        """
+        check whether the path is a directory which can be listed
+
+        Returns:
+            str: status code
+        """
+        if not os.path.exists(directory_path):
+            return FILE_NOT_FOUND
+        if not os.path.isdir(directory_path):
+            return PARAM_ERROR
+        if not os.access(directory_path, os.R_OK | os.X_OK):
+            LOGGER.error(f"Failed to read the file list under {directory_path}, permission denied")
+            return UNKNOWN_ERROR
+        return SUCCESS
+
+    @staticmethod
+    def iter_file_infos(
+        directory_path: str, max_depth: int = 1, patterns: Optional[List[str]] = None, with_hash: bool = False
+    ) -> Iterator[dict]:
+        """
+        walk the directory in name order and yield the info of each file one by one, so that a large tree is
+        not held in memory. The symbolic links are listed but not followed, and the subdirectories which can't be
+        read are skipped.
+
+        Args:
+            directory_path(str): the path of directory
+            max_depth(int): the depth of subdirectories to list, 1 means only the entries of the directory
+            patterns(list): glob patterns matched with the file name, or with the relative path when the pattern
+                contains '/'. The directories are still walked when they don't match. e.g ["*.conf", "pam.d/*"]
+            with_hash(bool): whether to return sha256 of the regular files no larger than FILE_COLLECT_MAX_SIZE
+
+        Returns:
+            generator: file info, the same as list_files
+        """
+        stack = [(directory_path, "", 1)]
+        while stack:
+            current_path, relative_path, depth = stack.pop()
+            try:
+                with os.scandir(current_path) as iterator:
+                    entries = sorted(iterator, key=lambda entry: entry.name)
+            except OSError as error:
+                LOGGER.warning(f"Failed to read the file list under {current_path}: {error}")
+                continue
+
+            sub_directories = []
+            for entry in entries:
+                entry_relative_path = os.path.join(relative_path, entry.name)
+                try:
+                    entry_stat = entry.stat(follow_symlinks=False)
+                except OSError as error:
+                    LOGGER.warning(f"Failed to stat {entry.path}: {error}")
+                    continue
+
+                if stat.S_ISDIR(entry_stat.st_mode) and depth < max_depth:
+                    sub_directories.append((entry.path, entry_relative_path, depth + 1))
+                if patterns and not ListFileManage._match_patterns(entry.name, entry_relative_path, patterns):
+                    continue
+                file_info = ListFileManage._get_file_info(entry.path, entry_stat)
+                if with_hash and stat.S_ISREG(entry_stat.st_mode):
+                    file_info["sha256"] = ListFileManage._get_file_hash(entry.path, entry_stat)
+                yield file_info
+            # the subdirectories are walked in name order after the entries of current directory
+            stack.extend(reversed(sub_directories))
+
+    @staticmethod
+    def _match_patterns(name: str, relative_path: str, patterns: List[str]) -> bool:
+        return any(fnmatch.fnmatchcase(relative_path if "/" in pattern else name, pattern) for pattern in patterns)
+
+    @staticmethod
+    def _get_file_info(file_path: str, file_stat: os.stat_result) -> dict:
+        if stat.S_ISREG(file_stat.st_mode):
+            file_type = "file"
+        elif stat.S_ISDIR(file_stat.st_mode):
+            file_type = "directory"
+        elif stat.S_ISLNK(file_stat.st_mode):
+            file_type = "link"
+        else:
+            file_type = "other"
+        return {
+            "path": file_path,
+            "type": file_type,
+            "size": file_stat.st_size,
+            "mtime": file_stat.st_mtime,
+            "file_attr": {
+                "mode": f"{stat.S_IMODE(file_stat.st_mode):04o}",
+                "owner": get_user_name(file_stat.st_uid),
+                "group": get_group_name(file_stat.st_gid),
+            },
+        }
+
+    @staticmethod
+    def _get_file_hash(file_path: str, file_stat: os.stat_result) -> Optional[str]:
+        """
+        get sha256 of the file content
+
+        Returns:
+            str: None if the file is too large or can't be read
+        """
+        if file_stat.st_size > FILE_COLLECT_MAX_SIZE:
+            return None
+        try:
+            # O_NONBLOCK keeps the open from blocking when the file is replaced by a fifo after it is listed
+            with os.fdopen(os.open(file_path, os.O_RDONLY | os.O_NONBLOCK), "rb") as file:
+                if not stat.S_ISREG(os.fstat(file.fileno()).st_mode):
+                    return None
+                return hashlib.sha256(file.read(FILE_COLLECT_MAX_SIZE + 1)).hexdigest()
+        except OSError as error:
+            LOGGER.warning(f"Failed to read {file_path}: {error}")
+            return None
@@ -13,9 +13,23 @@
 # Author: Lay
 # Description: default
 # Date: 2023/6/14 16:31
+import hashlib
 import os
+import re
+import tempfile
+import uuid
+from typing import List, Optional, Tuple
+
 from ceres.function.log import LOGGER
-from ceres.function.status import UNKNOWN_ERROR, SUCCESS
+from ceres.function.status import (
+    CONF_BASE_CHANGED,
+    CONF_ROLLED_BACK,
+    FAIL,
+    PARAM_ERROR,
+    PARTIAL_SUCCEED,
+    SUCCESS,
+    UNKNOWN_ERROR,
+)
 
 
 class SyncManage:
@@ -23,27 +37,369 @@ class SyncManage:
     Sync managed conf to the host
     """
 
+    HUNK_HEADER_PATTERN = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
     @staticmethod
     def sync_contents_to_conf(config: dict) -> str:
         """
-        Write conf into file
+        Write conf into file, the file is replaced atomically by a temp file. The conf can be given by its full
+        content, or by a unified diff against the current file whose sha256 is base_hash. The full content is
+        written when the current file is not the base of the diff, if it is given too.
         Args:
             config(dict): filepath and content for file sync,  only. eg:
             {
                 "file_path" = "/tmp/test"
                 "content" = "contents for this file"
             }
+            or
+            {
+                "file_path" = "/tmp/test"
+                "base_hash" = "sha256 of the current file"
+                "diff" = "unified diff from the current file to the new one"
+                "target_hash" = "sha256 of the new file, optional"
+            }
         Returns:
             str: status code
         """
         file_path = config.get('file_path')
 
-        contents = config.get('content')
+        status, contents = SyncManage._get_sync_contents(config)
+        if status != SUCCESS:
+            return status
+
         try:
-            with open(file_path, "w", encoding="utf-8") as file:
-                file.write(contents)
+            SyncManage._write_file_atomically(file_path, contents)
         except Exception as e:
             LOGGER.error("write sync content to conf failed, with msg{}".format(e))
             return UNKNOWN_ERROR
 
         return SUCCESS
+
+    @staticmethod
+    def batch_sync_contents_to_conf(batch_config: dict) -> Tuple[str, dict]:
+        """
+        Write several confs in one call, each conf is replaced atomically in the same way as sync_contents_to_conf.
+        In rollback mode, the confs are synced all or nothing: no conf is written if any new conf can't be made,
+        and the written confs are restored if any conf fails to be replaced.
+
+        Args:
+            batch_config(dict): confs for file sync and the sync mode. eg:
+            {
+                "configs": [{
+                    "file_path" = "/tmp/test"
+                    "content" = "contents for this file"
+                }],
+                "rollback": true
+            }
+
+        Returns:
+            Tuple[str, dict]
+            a tuple containing two elements (status code, sync status of each conf). eg:
+            (
+                "Partial.Succeed",
+                {
+                    "configs": [
+                        {"file_path": "/tmp/test", "status": "Succeed"},
+                        {"file_path": "/tmp/test2", "status": "Conf.Base.Changed"}
+                    ]
+                }
+            )
+        """
+        configs = batch_config.get("configs", [])
+        real_paths = [os.path.realpath(config["file_path"]) for config in configs]
+        if len(set(real_paths)) != len(real_paths):
+            LOGGER.error("The same conf can't be synced more than once in one batch.")
+            return PARAM_ERROR, {"configs": []}
+
+        results = []
+        contents_list = []
+        for config in configs:
+            status, contents = SyncManage._get_sync_contents(config)
+            results.append({"file_path": config["file_path"], "status": status})
+            contents_list.append(contents)
+
+        if not batch_config.get("rollback", False):
+            for result, real_path, contents in zip(results, real_paths, contents_list):
+                if result["status"] != SUCCESS:
+                    continue
+                try:
+                    SyncManage._write_file_atomically(real_path, contents)
+                except OSError as e:
+                    LOGGER.error(f"write sync content to conf {real_path} failed, with msg {e}")
+                    result["status"] = UNKNOWN_ERROR
+        elif all(result["status"] == SUCCESS for result in results):
+            SyncManage._sync_all_or_nothing(results, real_paths, contents_list)
+        else:
+            for result in results:
+                if result["status"] == SUCCESS:
+                    result["status"] = CONF_ROLLED_BACK
+
+        succeed_count = sum(result["status"] == SUCCESS for result in results)
+        if succeed_count == len(results):
+            status = SUCCESS
+        elif succeed_count:
+            status = PARTIAL_SUCCEED
+        else:
+            status = FAIL
+        return status, {"configs": results}
+
+    @staticmethod
+    def _sync_all_or_nothing(results: List[dict], real_paths: List[str], contents_list: List[str]):
+        """
+        Replace all confs after the temp files of them are written, the replaced confs are restored from their
+        hard linked backups if any conf fails to be replaced. The sync status in results is updated in place.
+        """
+        tmp_paths = []
+        backup_paths = []
+        replaced_indexes = []
+        index = 0
+        try:
+            for index, (real_path, contents) in enumerate(zip(real_paths, contents_list)):
+                tmp_paths.append(SyncManage._write_temp_file(real_path, contents))
+            for index, real_path in enumerate(real_paths):
+                backup_paths.append(SyncManage._backup_file(real_path))
+            for index, (real_path, tmp_path) in enumerate(zip(real_paths, tmp_paths)):
+                os.replace(tmp_path, real_path)
+                replaced_indexes.append(index)
+        except OSError as e:
+            LOGGER.error(f"write sync content to conf {real_paths[index]} failed, with msg {e}")
+            for result in results:
+                result["status"] = CONF_ROLLED_BACK
+            results[index]["status"] = UNKNOWN_ERROR
+            for replaced_index in reversed(replaced_indexes):
+                SyncManage._restore_file(real_paths[replaced_index], backup_paths[replaced_index])
+                backup_paths[replaced_index] = None
+        finally:
+            for path in tmp_paths[len(replaced_indexes) :] + [path for path in backup_paths if path]:
+                try:
+                    os.remove(path)
+                except OSError as e:
+                    LOGGER.warning(f"Failed to remove {path}: {e}")
+
+    @staticmethod
+    def _backup_file(real_path: str) -> Optional[str]:
+        """
+        hard link the conf to a backup path in the same directory
+
+        Returns:
+            str: backup path, None if the conf does not exist
+        """
+        if not os.path.exists(real_path):
+            return None
+        backup_path = os.path.join(os.path.dirname(real_path), f".{os.path.basename(real_path)}.{uuid.uuid4().hex}")
+        os.link(real_path, backup_path)
+        return backup_path
+
+    @staticmethod
+    def _restore_file(real_path: str, backup_path: Optional[str]):
+        """
+        restore the conf from its backup, the conf is removed if it did not exist before sync
+        """
+        try:
+            if backup_path is None:
+                os.remove(real_path)
+            else:
+                os.replace(backup_path, real_path)
+        except OSError as e:
+            LOGGER.error(f"Failed to restore conf {real_path}: {e}")
+
+    @staticmethod
+    def _get_sync_contents(config: dict) -> Tuple[str, Optional[str]]:
+        """
+        Get the new contents of the conf, from its full content or by applying the diff to the current conf
+
+        Returns:
+            Tuple[str, str]
+            a tuple containing two elements (status code, contents)
+        """
+        contents = config.get('content')
+        if config.get('diff') is not None:
+            patched_contents = SyncManage._apply_diff_to_conf(
+                config.get('file_path'), config.get('base_hash'), config.get('diff'), config.get('target_hash')
+            )
+            if patched_contents is not None:
+                contents = patched_contents
+            elif contents is None:
+                return CONF_BASE_CHANGED, None
+        return SUCCESS, contents
+
+    @staticmethod
+    def _apply_diff_to_conf(file_path: str, base_hash: str, diff: str, target_hash: Optional[str]) -> Optional[str]:
+        """
+        Apply the unified diff to the current conf
+
+        Returns:
+            str: the new contents, None if the current file is not the base of the diff or the diff can't be applied
+        """
+        try:
+            with open(file_path, "rb") as file:
+                data = file.read()
+        except OSError as e:
+            LOGGER.warning(f"Failed to read {file_path} to apply diff: {e}")
+            return None
+        if hashlib.sha256(data).hexdigest() != base_hash:
+            LOGGER.warning(f"{file_path} has been changed since the base of the diff")
+            return None
+
+        try:
+            contents = SyncManage._apply_unified_diff(data.decode("utf-8"), diff)
+        except ValueError as e:
+            LOGGER.warning(f"Failed to apply diff to {file_path}: {e}")
+            return None
+        if target_hash is not None and hashlib.sha256(contents.encode("utf-8")).hexdigest() != target_hash:
+            LOGGER.warning(f"The contents of {file_path} patched by the diff are not the expected ones")
+            return None
+        return contents
+
+    @staticmethod
+    def _split_lines(text: str) -> List[str]:
+        """
+        split the text into lines ending with '\n', only the last line may have no '\n'
+        """
+        lines = [line + "\n" for line in text.split("\n")]
+        lines[-1] = lines[-1][:-1]
+        return lines if lines[-1] else lines[:-1]
+
+    @classmethod
+    def _apply_unified_diff(cls, original: str, diff: str) -> str:
+        """
+        Apply the unified diff to the original text, the context and removed lines must match exactly
+
+        Args:
+            original(str): original text
+            diff(str): unified diff, e.g.
+                --- a/etc/hosts
+                +++ b/etc/hosts
+                @@ -1,2 +1,2 @@
+                 127.0.0.1 localhost
+                -::1 localhost
+                +::1 localhost6
+
+        Returns:
+            str: the patched text
+
+        Raises:
+            ValueError: the diff is malformed or does not match the original text
+        """
+        source = cls._split_lines(original)
+        diff_lines = cls._split_lines(diff)
+        result = []
+        position = index = 0
+        while index < len(diff_lines):
+            match = cls.HUNK_HEADER_PATTERN.match(diff_lines[index])
+            index += 1
+            # the file headers before the hunks are skipped
+            if not match:
+                continue
+
+            old_start, old_count, new_count = (
+                int(match.group(1)),
+                1 if match.group(2) is None else int(match.group(2)),
+                1 if match.group(4) is None else int(match.group(4)),
+            )
+            # the lines are inserted after the line old_start when the hunk removes nothing
+            hunk_start = old_start - 1 if old_count else old_start
+            if hunk_start < position or hunk_start > len(source):
+                raise ValueError(f"hunk at line {old_start} is out of order or range")
+
+            hunk = []
+            while old_count > 0 or new_count > 0:
+                if index >= len(diff_lines):
+                    raise ValueError(f"hunk at line {old_start} is truncated")
+                line = diff_lines[index]
+                index += 1
+                # an empty context line may lose its leading space
+                tag, text = (" ", line) if line == "\n" else (line[:1], line[1:])
+                if tag == "\\":
+                    cls._strip_hunk_newline(hunk)
+                    continue
+                if tag not in (" ", "-", "+"):
+                    raise ValueError(f"unexpected line in hunk at line {old_start}: {line!r}")
+                if tag != "+":
+                    old_count -= 1
+                if tag != "-":
+                    new_count -= 1
+                hunk.append([tag, text])
+            if old_count < 0 or new_count < 0:
+                raise ValueError(f"hunk at line {old_start} does not match its line counts")
+            # '\ No newline at end of file' follows the last line of the hunk
+            while index < len(diff_lines) and diff_lines[index].startswith("\\"):
+                cls._strip_hunk_newline(hunk)
+                index += 1
+
+            result.extend(source[position:hunk_start])
+            position = hunk_start
+            for tag, text in hunk:
+                if tag == "+":
+                    result.append(text)
+                    continue
+                if position >= len(source) or source[position] != text:
+                    raise ValueError(f"hunk at line {old_start} does not match the original text")
+                if tag == " ":
+                    result.append(text)
+                position += 1
+
+        result.extend(source[position:])
+        return "".join(result)
+
+    @staticmethod
+    def _strip_hunk_newline(hunk: List[list]):
+        """
+        remove the newline of the last hunk line which is marked by '\\ No newline at end of file'
+        """
+        if not hunk or not hunk[-1][1].endswith("\n"):
+            raise ValueError("'No newline at end of file' marker is misplaced")
+        hunk[-1][1] = hunk[-1][1][:-1]
+
+    @staticmethod
+    def _write_file_atomically(file_path: str, contents: str):
+        """
+        Write the contents to a temp file in the same directory, and rename it to the conf after it is flushed to
+        disk, so that the conf is either the old one or the new one. The mode and owner of the conf are kept.
+
+        Raises:
+            OSError
+        """
+        # write through the symbolic link instead of replacing it
+        real_path = os.path.realpath(file_path)
+        tmp_path = SyncManage._write_temp_file(real_path, contents)
+        try:
+            os.replace(tmp_path, real_path)
+        except OSError:
+            os.remove(tmp_path)
+            raise
+
+    @staticmethod
+    def _write_temp_file(real_path: str, contents: str) -> str:
+        """
+        Write the contents to a temp file flushed to disk in the directory of the conf, with the mode and owner of
+        the conf
+
+        Returns:
+            str: temp file path
+
+        Raises:
+            OSError
+        """
+        try:
+            file_stat = os.stat(real_path)
+        except FileNotFoundError:
+            file_stat = None
+
+        fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(real_path)}.", dir=os.path.dirname(real_path))
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8", newline="") as file:
+                file.write(contents)
+                file.flush()
+                os.fsync(file.fileno())
+            if file_stat is not None:
+                os.chown(tmp_path, file_stat.st_uid, file_stat.st_gid)
+                os.chmod(tmp_path, file_stat.st_mode & 0o7777)
+            else:
+                umask = os.umask(0)
+                os.umask(umask)
+                os.chmod(tmp_path, 0o666 & ~umask)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        return tmp_path
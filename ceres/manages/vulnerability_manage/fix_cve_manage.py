@@ -10,16 +10,24 @@
 # PURPOSE.
 # See the Mulan PSL v2 for more details.
 # ******************************************************************************/
+import json
 import re
 import os
+import tempfile
+import time
+import uuid
 from collections import defaultdict
-from typing import Tuple, List, Set, Optional
+from typing import Dict, Tuple, List, Set, Optional
 
-from ceres.conf.constant import CommandExitCode, TaskExecuteRes
+from ceres.conf.constant import CVE_FIX_PLAN_PATH, CVE_FIX_PLAN_TTL, CommandExitCode, TaskExecuteRes
 from ceres.function.log import LOGGER
 from ceres.function.util import execute_shell_command
+from ceres.function.boot_loader import BOOT_LOADER
 from ceres.function.check import PreCheck
+from ceres.function.dnf_history import DnfHistory
+from ceres.function.installed_package import InstalledPackages
 from ceres.function.status import SUCCESS, COMMAND_EXEC_ERROR
+from ceres.manages.vulnerability_manage.scan_cve_vulnerability import CveScanCache
 
 
 class CveFixTaskType:
@@ -44,8 +52,11 @@ class CveFixManage:
                     }
                 ],
                 "accepted": False,
+                "plan_id": "1f0e3dad99908345f7439f8ffabdffc4"
             }
 
+            plan_id: optional, the coldpatch fix plan created by cve_fix_plan is applied if it is still valid
+
         Returns:
             dict: cve fix result e.g
                 {
@@ -87,68 +98,293 @@ class CveFixManage:
             return result
 
         if task_info["fix_type"] == CveFixTaskType.COLDPATCH:
-            result["status"], result["rpms"] = self._update_coldpatch_by_dnf_plugin(rpms)
+            fix_plan = self._load_fix_plan(task_info["plan_id"], rpms) if task_info.get("plan_id") else None
+            result["status"], result["rpms"] = self._update_coldpatch_by_dnf_plugin(rpms, fix_plan)
         else:
             # The implementation of the hotpatch upgrade and rollback plan relies on the dnf transaction,
             # so the dnf transaction ID information needs to be returned after the repair is completed.
-            result["dnf_event_start"] = self._query_latest_dnf_transaction_id()
+            result["dnf_event_start"] = DnfHistory.query_latest_transaction_id()
             result["status"], result["rpms"], transaction_count = self._update_hotpatch_by_dnf_plugin(
                 rpms, task_info["accepted"]
             )
-            result["dnf_event_end"] = self._query_latest_dnf_transaction_id()
-            if result["dnf_event_end"] - result["dnf_event_start"] != transaction_count:
+            result["dnf_event_end"] = DnfHistory.query_latest_transaction_id()
+            if (
+                None in (result["dnf_event_start"], result["dnf_event_end"])
+                or result["dnf_event_end"] - result["dnf_event_start"] != transaction_count
+            ):
                 result["dnf_event_start"] = result["dnf_event_end"] = None
         return result
 
-    def _update_coldpatch_by_dnf_plugin(self, rpms: List[str]) -> Tuple[str, list]:
+    def cve_fix_plan(self, task_info: dict) -> dict:
         """
-        update rpm of list and return their upgrade log
+        resolve the coldpatch fix task without changing anything, and save the plan so that the following fix task
+        with the plan id can apply it without resolving again
+
+        Args:
+            task_info(dict): cve info which need to fix and check_items, the same as cve_fix. e.g.
+            {
+                "fix_type": "coldpatch",
+                "check_items": [],
+                "rpms": [
+                    {
+                        "installed_rpm": "unzip-6.0-49.oe2203.x86_64",
+                        "available_rpm": "unzip-6.0-50.oe2203.x86_64",
+                    }
+                ],
+                "accepted": False,
+            }
+
+        Returns:
+            dict: cve fix plan e.g
+                {
+                    "check_items": [],
+                    "plan_id": "1f0e3dad99908345f7439f8ffabdffc4",
+                    "rpms": [
+                        {
+                            "available_rpm": "unzip-6.0-50.oe2203.x86_64",
+                            "result": "succeed",
+                            "log": ""
+                        }
+                    ],
+                    "upgraded_packages": ["unzip-6.0-50.oe2203.x86_64"],
+                    "fixed_cves": {"unzip": ["CVE-2022-0529", "CVE-2022-0530"]},
+                    "status": "succeed"
+                }
+            plan_id is not returned when the plan can't be saved
+        """
+        result = {}
+        rpms = [rpm.get("available_rpm") for rpm in task_info["rpms"]]
+        check_result, items_check_log = PreCheck.execute_check(task_info["check_items"])
+        result["check_items"] = items_check_log
+        if not check_result:
+            LOGGER.warning("The pre-check is failed before execute command!")
+            result["rpms"] = self._gen_fail_result(rpms, "pre-check items check failed")
+            result["status"] = TaskExecuteRes.FAIL
+            return result
+
+        status, fix_plan = self._plan_coldpatch_fix(rpms)
+        result["rpms"] = fix_plan["rpms"]
+        if status != SUCCESS:
+            result["status"] = TaskExecuteRes.FAIL
+            return result
+
+        plan_id = self._save_fix_plan(fix_plan)
+        if plan_id is not None:
+            result["plan_id"] = plan_id
+        result["upgraded_packages"] = fix_plan["upgraded_packages"]
+        result["fixed_cves"] = fix_plan["fixed_cves"]
+        result["status"] = (
+            TaskExecuteRes.SUCCEED
+            if all(rpm_info["result"] == TaskExecuteRes.SUCCEED for rpm_info in fix_plan["rpms"])
+            else TaskExecuteRes.FAIL
+        )
+        return result
+
+    @staticmethod
+    def _gen_fail_result(rpms: List[str], log: str) -> List[dict]:
+        return [
+            {
+                "available_rpm": rpm,
+                "result": TaskExecuteRes.FAIL,
+                "log": log,
+            }
+            for rpm in rpms
+        ]
+
+    @staticmethod
+    def _get_fix_plan_fingerprint() -> Optional[dict]:
+        """
+        get the fingerprint of the installed packages, repo metadata and hotpatch status in syscare which the fix
+        plan is resolved from
+        """
+        rpmdb_fingerprint = InstalledPackages.get_rpmdb_fingerprint()
+        if rpmdb_fingerprint is None:
+            return None
+        return {
+            "rpmdb": rpmdb_fingerprint,
+            "repos": CveScanCache.get_repos_fingerprint(),
+            "syscare": CveScanCache.get_syscare_fingerprint(),
+        }
+
+    def _save_fix_plan(self, fix_plan: dict) -> Optional[str]:
+        """
+        save the fix plan with the fingerprint of the current system
+
+        Returns:
+            str: plan id, None if the plan can't be saved
+        """
+        plan_id = uuid.uuid4().hex
+        data = {
+            "fingerprint": self._get_fix_plan_fingerprint(),
+            "expire_time": time.time() + CVE_FIX_PLAN_TTL,
+            "plan": fix_plan,
+        }
+        tmp_path = None
+        try:
+            os.makedirs(CVE_FIX_PLAN_PATH, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(prefix=f".{plan_id}.", dir=CVE_FIX_PLAN_PATH)
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(data, file)
+            os.replace(tmp_path, os.path.join(CVE_FIX_PLAN_PATH, f"{plan_id}.json"))
+        except OSError as error:
+            LOGGER.warning(f"Failed to save cve fix plan: {error}")
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return None
+        return plan_id
+
+    def _load_fix_plan(self, plan_id: str, rpms: List[str]) -> Optional[dict]:
+        """
+        load the fix plan which is resolved for the same packages, the plan is used only once and it is dropped
+        when the installed packages or repo metadata has changed since it is resolved
 
         Args:
+            plan_id(str): plan id returned by cve_fix_plan
             rpms(list): List of packages that need to be upgraded
 
         Returns:
-            Tuple[str, List[dict]]
-            a tuple containing two elements (update result, Information about each package upgrade log).
+            dict: fix plan, None if it is invalid
         """
+        plan_path = os.path.join(CVE_FIX_PLAN_PATH, f"{plan_id}.json")
+        try:
+            with open(plan_path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+            os.remove(plan_path)
+        except (OSError, ValueError) as error:
+            LOGGER.warning(f"Failed to load cve fix plan {plan_id}: {error}")
+            return None
 
-        def gen_fail_result(rpms: List[str], log: str):
-            return [
-                {
-                    "available_rpm": rpm,
-                    "result": TaskExecuteRes.FAIL,
-                    "log": log,
-                }
-                for rpm in rpms
-            ]
+        fingerprint = data.get("fingerprint")
+        fix_plan = data.get("plan") or {}
+        if (
+            data.get("expire_time", 0) <= time.time()
+            or fingerprint is None
+            or fingerprint != self._get_fix_plan_fingerprint()
+            or [rpm_info.get("available_rpm") for rpm_info in fix_plan.get("rpms", [])] != rpms
+        ):
+            LOGGER.warning(f"The cve fix plan {plan_id} is outdated, resolve the fix task again.")
+            return None
+        return fix_plan
+
+    def _plan_coldpatch_fix(self, rpms: List[str]) -> Tuple[str, dict]:
+        """
+        resolve which packages can be upgraded without re-exposing the vulnerabilities fixed by hotpatch
+
+        Args:
+            rpms(list): List of packages that need to be upgraded
 
+        Returns:
+            Tuple[str, dict]
+            a tuple containing two elements (status code, fix plan). e.g
+                "Succeed", {
+                    "rpms": [{"available_rpm": "unzip-6.0-50.oe2203.x86_64", "result": "succeed", "log": ""}],
+                    "fixable_rpms": ["unzip-6.0-50.oe2203.x86_64"],
+                    "upgraded_packages": ["unzip-6.0-50.oe2203.x86_64"],
+                    "fixed_cves": {"unzip": ["CVE-2022-0529"]}
+                }
+        """
+        fix_plan = {"rpms": [], "fixable_rpms": [], "upgraded_packages": [], "fixed_cves": {}}
         status, fixable_cve_info = self._query_fixable_cve_info()
         if status != SUCCESS:
-            return TaskExecuteRes.FAIL, gen_fail_result(
+            fix_plan["rpms"] = self._gen_fail_result(
                 rpms, "Execution of CVE comparison failed due to failure to query fixable CVE information."
             )
+            return status, fix_plan
         status, fixed_cve_info = self._query_fixed_cve_info_by_hotpatch()
         if status != SUCCESS:
-            return TaskExecuteRes.FAIL, gen_fail_result(
+            fix_plan["rpms"] = self._gen_fail_result(
                 rpms, "Execution of CVE comparison failed due to failure to query fixed CVE information."
             )
+            return status, fix_plan
 
-        final_fix_result, package_update_info = TaskExecuteRes.SUCCEED, []
+        # The whole package set is resolved once, and the packages are compared one by one only when some of them
+        # may re-expose the vulnerabilities fixed by hotpatch.
+        upgraded_packages = self._query_upgraded_packages(rpms)
+        batch_compare_result, _ = self._compare_upgraded_packages(upgraded_packages, fixable_cve_info, fixed_cve_info)
         for rpm in rpms:
             rpm_fix_info = {"available_rpm": rpm, "result": TaskExecuteRes.SUCCEED, "log": ""}
-            compare_result, log = self.compare_cve(rpm, fixable_cve_info, fixed_cve_info)
-            if compare_result:
-                rpm_fix_info["result"], rpm_fix_info["log"] = self.__update_coldpatch(rpm)
-            else:
-                rpm_fix_info["result"] = TaskExecuteRes.FAIL
-                rpm_fix_info["log"] = log
+            if not batch_compare_result:
+                compare_result, log = self.compare_cve([rpm], fixable_cve_info, fixed_cve_info)
+                if not compare_result:
+                    rpm_fix_info["result"] = TaskExecuteRes.FAIL
+                    rpm_fix_info["log"] = log
+            if rpm_fix_info["result"] == TaskExecuteRes.SUCCEED:
+                fix_plan["fixable_rpms"].append(rpm)
+            fix_plan["rpms"].append(rpm_fix_info)
+
+        fix_plan["upgraded_packages"] = sorted(upgraded_packages)
+        for package in fix_plan["upgraded_packages"]:
+            rpm_name = package.rsplit("-", 2)[0]
+            fixed_cves = {
+                cve_id
+                for update_rpm, cve_list in fixable_cve_info.get(rpm_name, {}).items()
+                if package >= update_rpm
+                for cve_id in cve_list
+            }
+            if fixed_cves:
+                fix_plan["fixed_cves"][rpm_name] = sorted(fixed_cves)
+        return SUCCESS, fix_plan
+
+    def _update_coldpatch_by_dnf_plugin(self, rpms: List[str], fix_plan: Optional[dict] = None) -> Tuple[str, list]:
+        """
+        update rpm of list and return their upgrade log
 
+        Args:
+            rpms(list): List of packages that need to be upgraded
+            fix_plan(dict): the fix plan resolved before, the packages are resolved again if not given
+
+        Returns:
+            Tuple[str, List[dict]]
+            a tuple containing two elements (update result, Information about each package upgrade log).
+        """
+        if fix_plan is None:
+            status, fix_plan = self._plan_coldpatch_fix(rpms)
+            if status != SUCCESS:
+                return TaskExecuteRes.FAIL, fix_plan["rpms"]
+
+        package_update_info = [dict(rpm_fix_info) for rpm_fix_info in fix_plan["rpms"]]
+        update_result = self._update_coldpatch_in_batch(fix_plan["fixable_rpms"])
+        final_fix_result = TaskExecuteRes.SUCCEED
+        for rpm_fix_info in package_update_info:
+            if rpm_fix_info["available_rpm"] in update_result:
+                rpm_fix_info["result"], rpm_fix_info["log"] = update_result[rpm_fix_info["available_rpm"]]
             if rpm_fix_info["result"] == TaskExecuteRes.FAIL:
                 final_fix_result = TaskExecuteRes.FAIL
-
-            package_update_info.append(rpm_fix_info)
         return final_fix_result, package_update_info
 
+    def _update_coldpatch_in_batch(self, rpms: List[str]) -> Dict[str, Tuple[str, str]]:
+        """
+        upgrade all rpms in one dnf transaction, only the rpms which are not upgraded are retried one by one
+        when the transaction failed
+
+        Args:
+            rpms(list): List of packages that need to be upgraded
+
+        Returns:
+            dict: upgrade result and log of each package. e.g
+                {
+                    "unzip-6.0-50.oe2203.x86_64": ("succeed", "upgrade log")
+                }
+        """
+        if len(rpms) <= 1:
+            return {rpm: self.__update_coldpatch(rpm) for rpm in rpms}
+
+        code, stdout, stderr = execute_shell_command([f"dnf upgrade-en {' '.join(rpms)} -y"])
+        if code == CommandExitCode.SUCCEED:
+            return {rpm: self.__check_upgraded_kernel(rpm, stdout + stderr) for rpm in rpms}
+
+        LOGGER.warning("Failed to upgrade packages in one transaction, retry the packages not upgraded one by one.")
+        LOGGER.error(stderr)
+        # e.g. the kernel which fails the kabi check is removed after the transaction, but the others are upgraded
+        installed_packages = InstalledPackages.query()
+        update_result = {}
+        for rpm in rpms:
+            if installed_packages.is_installed(rpm):
+                update_result[rpm] = self.__check_upgraded_kernel(rpm, stdout + stderr)
+            else:
+                update_result[rpm] = self.__update_coldpatch(rpm)
+        return update_result
+
     def __update_coldpatch(self, rpm: str) -> Tuple[str, str]:
         """
         upgrade rpm by dnf plugin (coldpatch)
@@ -164,10 +400,23 @@ class CveFixManage:
         if code != CommandExitCode.SUCCEED:
             LOGGER.error(stderr)
             return TaskExecuteRes.FAIL, stdout + stderr
-        elif rpm.rsplit("-", 2)[0] == "kernel":
-            if not self.set_default_grub_kernel_version(rpm):
-                return TaskExecuteRes.FAIL, stdout + stderr + "\nerror: set default kernel failed!"
-        return TaskExecuteRes.SUCCEED, stdout + stderr
+        return self.__check_upgraded_kernel(rpm, stdout + stderr)
+
+    def __check_upgraded_kernel(self, rpm: str, log: str) -> Tuple[str, str]:
+        """
+        set the upgraded kernel as the boot kernel, other packages are returned as succeed directly
+
+        Args:
+            rpm(str): package that has been upgraded
+            log(str): package upgrade log
+
+        Returns:
+            Tuple[str, str]
+            a tuple containing two elements (upgrade result, package upgrade log).
+        """
+        if rpm.rsplit("-", 2)[0] == "kernel" and not self.set_default_grub_kernel_version(rpm):
+            return TaskExecuteRes.FAIL, log + "\nerror: set default kernel failed!"
+        return TaskExecuteRes.SUCCEED, log
 
     def _update_hotpatch_by_dnf_plugin(self, rpms: List[str], accepted: bool) -> Tuple[str, list, int]:
         """
@@ -196,6 +445,10 @@ class CveFixManage:
                 upgrade_count,
             )
 
+        batch_update_result = self._update_hotpatch_in_batch(rpms, accepted)
+        if batch_update_result is not None:
+            return batch_update_result
+
         final_fix_result, package_update_info = TaskExecuteRes.SUCCEED, []
 
         for rpm in rpms:
@@ -222,6 +475,58 @@ class CveFixManage:
             package_update_info.append(tmp)
         return final_fix_result, package_update_info, upgrade_count
 
+    @staticmethod
+    def _update_hotpatch_in_batch(rpms: List[str], accepted: bool) -> Optional[Tuple[str, list, int]]:
+        """
+        apply and accept all hotpatches by one dnf hotupgrade command, which installs them in one dnf transaction
+
+        Args:
+            rpms(list): List of hotpatches that need to be applied
+            accepted(bool): whether to accept the hotpatches which are applied successfully
+
+        Returns:
+            Tuple[str, List[dict], int]
+            a tuple containing three elements (update result, Information about each package upgrade, upgrade count).
+            None if the dnf plugin does not support accepting hotpatches in the hotupgrade command.
+        """
+        # Example of command execution result:
+        # Last metadata expiration check: 0:31:50 ago on Mon 07 Aug 2023 10:26:32 AM CST.
+        # ...
+        # Apply hot patch succeed: redis-6.2.5-1/ACC-1-1.
+        # Apply hot patch failed: kernel-5.10.0-153.12.0.92.oe2203sp2/ACC-1-1.
+        # Gonna remove unsuccessfully activated hotpatch rpm.
+        # Accept hot patch succeed: redis-6.2.5-1/ACC-1-1.
+        command = f"dnf hotupgrade {' '.join(rpms)} -y"
+        if accepted:
+            command += " --accept"
+        code, stdout, stderr = execute_shell_command([command])
+        if accepted and "unrecognized arguments: --accept" in stderr:
+            LOGGER.warning("The dnf plugin can't accept hotpatches in hotupgrade, apply them one by one instead.")
+            return None
+        if code != CommandExitCode.SUCCEED:
+            LOGGER.error(stderr)
+
+        final_fix_result, package_update_info = TaskExecuteRes.SUCCEED, []
+        for rpm in rpms:
+            rpm_fix_info = {"available_rpm": rpm, "result": TaskExecuteRes.SUCCEED, "log": stdout + stderr}
+            try:
+                # Example: patch-redis-6.2.5-1-ACC-1-1.x86_64 >> redis-6.2.5-1/ACC-1-1
+                hotpatch_name = re.sub(r'-(ACC|SGL)', r'/\1', rpm.rsplit(".", 1)[0].split("-", 1)[1])
+            except IndexError as error:
+                LOGGER.error(error)
+                hotpatch_name = rpm
+            if f"Apply hot patch succeed: {hotpatch_name}." not in stdout:
+                rpm_fix_info["result"] = TaskExecuteRes.FAIL
+                final_fix_result = TaskExecuteRes.FAIL
+            elif accepted and f"Accept hot patch succeed: {hotpatch_name}." not in stdout:
+                rpm_fix_info["log"] += f"\n\nhotpatch {hotpatch_name} accept failed!"
+            package_update_info.append(rpm_fix_info)
+
+        # all hotpatches are installed in one transaction, and the ones failed to be applied are removed afterwards,
+        # so the transaction count mismatches when anything is failed
+        upgrade_count = 1 if "Apply hot patch" in stdout and "Nothing to do" not in stdout else 0
+        return final_fix_result, package_update_info, upgrade_count
+
     @staticmethod
     def _query_fixable_cve_info() -> Tuple[str, dict]:
         """
@@ -277,19 +582,34 @@ class CveFixManage:
 
         return SUCCESS, hotpatch_fixed_info
 
-    def compare_cve(self, rpm: str, updated_info: dict, hotpatch_fixed_info: dict) -> Tuple[bool, str]:
+    def compare_cve(self, rpms: List[str], updated_info: dict, hotpatch_fixed_info: dict) -> Tuple[bool, str]:
         """
         Determine whether the packages to be upgraded covers the vulnerabilities fixed by the hotpatch
 
         Args:
             rpms(list): List of packages that need to be upgraded
 
+        Returns:
+            Tuple[bool, str]
+            a tuple containing two elements (compare result, compare log).
+        """
+        return self._compare_upgraded_packages(self._query_upgraded_packages(rpms), updated_info, hotpatch_fixed_info)
+
+    @staticmethod
+    def _compare_upgraded_packages(
+        upgraded_packages: Set[str], updated_info: dict, hotpatch_fixed_info: dict
+    ) -> Tuple[bool, str]:
+        """
+        Determine whether the resolved packages to be upgraded covers the vulnerabilities fixed by the hotpatch
+
+        Args:
+            upgraded_packages(set): packages to be upgraded and their dependencies
+
         Returns:
             Tuple[bool, str]
             a tuple containing two elements (compare result, compare log).
         """
         compare_info = dict()
-        upgraded_packages: set = self._query_upgraded_packages(rpm)
         if not upgraded_packages:
             return False, "Execution of CVE comparison failed due to failure to query upgraded_packages."
         for rpm in upgraded_packages:
@@ -316,29 +636,33 @@ class CveFixManage:
         return False, log
 
     @staticmethod
-    def _query_upgraded_packages(package: str) -> Set[str]:
+    def _query_upgraded_packages(packages: List[str]) -> Set[str]:
         """
-        Resolve all packages to be upgraded and their dependencies, store them in a set and
+        Resolve all packages to be upgraded and their dependencies in one dnf transaction, store them in a set and
         return it
 
         Args:
             packages(list): List of package that need to be upgraded
 
         Returns:
-            set
+            set: it is empty when the packages can not be resolved
 
         """
-        package_set = set()
-        if package.rsplit("-", 2)[0] == "kernel":
-            package_set.add(package)
+        package_set, upgrade_packages = set(), []
+        for package in packages:
+            if package.rsplit("-", 2)[0] == "kernel":
+                package_set.add(package)
+            else:
+                upgrade_packages.append(package)
+        if not upgrade_packages:
             return package_set
 
         # The exit code of the command is 1 when input parameters contains assumeno
-        _, stdout, _ = execute_shell_command([f"dnf upgrade-en {package} --assumeno"])
+        _, stdout, _ = execute_shell_command([f"dnf upgrade-en {' '.join(upgrade_packages)} --assumeno"])
 
         installed_rpm_info = re.findall(r"(Upgrading|Installing):(.*?)Transaction Summary", stdout, re.S)
         if not installed_rpm_info:
-            return package_set
+            return set()
 
         installed_rpm_info_list = installed_rpm_info[0][1].strip().split("\n")
         for single_rpm_info in installed_rpm_info_list:
@@ -367,37 +691,12 @@ class CveFixManage:
             return False
 
         LOGGER.info("The Linux boot kernel is about to be changed")
-        code, _, stderr = execute_shell_command([f"grubby --set-default={boot_kernel_path}"])
-
-        if code != CommandExitCode.SUCCEED:
+        if not BOOT_LOADER.set_default_kernel(kernel_rpm_name[7:]):
             LOGGER.info("The Linux boot kernel change failed")
-            LOGGER.error(stderr)
             return False
         LOGGER.info("The Linux boot kernel change successful")
         return True
 
-    @staticmethod
-    def _query_latest_dnf_transaction_id() -> Optional[int]:
-        """Query latest yum transaction id
-
-        Returns:
-            int
-        """
-        # Example of command execution result:
-        # [root@localhost ~]# dnf history
-        # ID   | Command line   | Date and time       | Action(s)     | Altered
-        # ---------------------------------------------------------------------
-        # 3    | rm aops-ceres  | 2023-11-30 09:57    | Removed       | 1
-        # 2    | install gcc    | 2023-11-30 09:57    | Install       | 1
-        code, stdout, stderr = execute_shell_command(
-            ["dnf history", "grep -E '^\s*[0-9]+'", "head -1", "awk '{print $1}'"]
-        )
-        if code != CommandExitCode.SUCCEED:
-            LOGGER.error(stderr)
-            return None
-
-        return int(stdout)
-
     @staticmethod
     def _set_hotpatch_status_by_dnf_plugin(hotpatch: str, operation: str) -> Tuple[bool, str]:
         """
@@ -12,10 +12,13 @@
 # ******************************************************************************/
 import os
 import platform
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from ceres.conf.constant import CommandExitCode, CveFixTaskType, TaskExecuteRes
+from ceres.function.boot_loader import BOOT_LOADER
 from ceres.function.check import PreCheck
+from ceres.function.dnf_history import DnfHistory
+from ceres.function.installed_package import InstalledPackages
 from ceres.function.log import LOGGER
 from ceres.function.util import execute_shell_command
 
@@ -25,29 +28,18 @@ class RollbackManage:
     Rollback operation.
     """
 
-    BOOT_FILE = "/boot/vmlinuz-%s"
-
-    @staticmethod
-    def _query_latest_dnf_transaction_id() -> Optional[int]:
-        """Query latest yum transaction id
-
-        Returns:
-            int
+    def __init__(self, installed_packages: Optional[InstalledPackages] = None):
         """
-        # Example of command execution result:
-        # [root@localhost ~]# dnf history
-        # ID   | Command line   | Date and time       | Action(s)     | Altered
-        # ---------------------------------------------------------------------
-        # 3    | rm aops-ceres  | 2023-11-30 09:57    | Removed       | 1
-        # 2    | install gcc    | 2023-11-30 09:57    | Install       | 1
-        code, stdout, stderr = execute_shell_command(
-            ["dnf history", "grep -E '^\s*[0-9]+'", "head -1", "awk '{print $1}'"]
-        )
-        if code != CommandExitCode.SUCCEED:
-            LOGGER.error(stderr)
-            return None
+        Args:
+            installed_packages(InstalledPackages): installed packages snapshot, it is queried when first used
+        """
+        self._installed_packages = installed_packages
 
-        return int(stdout)
+    @property
+    def installed_packages(self) -> InstalledPackages:
+        if self._installed_packages is None:
+            self._installed_packages = InstalledPackages.query()
+        return self._installed_packages
 
     def rollback(self, rollback_info: dict) -> dict:
         """
@@ -102,6 +94,222 @@ class RollbackManage:
         rollback_result.update({"check_items": items_check_log, "status": result, "log": log})
         return rollback_result
 
+    def batch_rollback(self, batch_rollback_info: dict) -> dict:
+        """
+        Rollback for several hotpatch/coldpatch transactions on the host. The system state is collected once and
+        every task is validated against it, then the hotpatch transactions are reverted by one dnf history rollback
+        and the kernels are removed by one dnf transaction.
+
+        Args:
+            batch_rollback_info(dict): rollback transactions info
+            e.g.
+            {
+                check_items: ["network"],
+                tasks: [
+                    {
+                        task_id(str): "e7b1c2d3",
+                        rollback_type(str): "coldpatch"
+                        installed_rpm(str): "kernel-4.19.90-2206.1.0.0153.oe1.x86_64",
+                        target_rpm(str): "kernel-4.19.90-2112.8.0.0131.oe1.x86_64",
+                        dnf_event_start(int): None,
+                        dnf_event_end(int): None,
+                    }
+                ]
+            }
+
+        Returns:
+            {
+                "check_items": [
+                    {
+                        "item": "network",
+                        "result":true,
+                        "log":"xxxx"
+                    }
+                ],
+                "tasks": [
+                    {
+                        "task_id": "e7b1c2d3",
+                        "status": TaskExecuteRes.SUCCEED/TaskExecuteRes.FAIL,
+                        "log": "rollback log"
+                    }
+                ],
+                "status": TaskExecuteRes.SUCCEED/TaskExecuteRes.FAIL
+            }
+        """
+        tasks = batch_rollback_info.get("tasks", [])
+        task_results = [{"task_id": task.get("task_id"), "status": TaskExecuteRes.FAIL, "log": ""} for task in tasks]
+        check_result, items_check_log = PreCheck.execute_check(batch_rollback_info.get("check_items", []))
+        if not check_result:
+            LOGGER.warning("The pre-check is failed before execute command!")
+            for task_result in task_results:
+                task_result["log"] = "The pre-check is failed before execute command."
+            return {"check_items": items_check_log, "tasks": task_results, "status": TaskExecuteRes.FAIL}
+
+        hotpatch_tasks, coldpatch_tasks = {}, {}
+        for index, task in enumerate(tasks):
+            if task.get("rollback_type") == CveFixTaskType.HOTPATCH:
+                hotpatch_tasks[index] = task
+            elif task.get("rollback_type") == CveFixTaskType.COLDPATCH:
+                coldpatch_tasks[index] = task
+            else:
+                task_results[index]["log"] = (
+                    f"Rollback type should be {CveFixTaskType.COLDPATCH} or {CveFixTaskType.HOTPATCH}"
+                )
+
+        # the hotpatch transactions are reverted first, because removing kernels creates new dnf transactions
+        if hotpatch_tasks:
+            self._batch_rollback_for_hotpatch(hotpatch_tasks, task_results)
+        if coldpatch_tasks:
+            self._batch_rollback_for_coldpatch(coldpatch_tasks, task_results)
+
+        status = (
+            TaskExecuteRes.SUCCEED
+            if all(task_result["status"] == TaskExecuteRes.SUCCEED for task_result in task_results)
+            else TaskExecuteRes.FAIL
+        )
+        return {"check_items": items_check_log, "tasks": task_results, "status": status}
+
+    def _batch_rollback_for_hotpatch(self, hotpatch_tasks: Dict[int, dict], task_results: List[dict]):
+        """
+        Validate the dnf transaction ranges of the hotpatch tasks against the dnf history, and revert the valid ones
+        by one dnf history rollback. The ranges are valid only when they are contiguous and the last one ends at the
+        latest dnf transaction, otherwise other transactions would be reverted too.
+
+        Args:
+            hotpatch_tasks(dict): hotpatch tasks keyed by their index in task_results
+            task_results(list): rollback result of each task, which is updated in place
+        """
+        valid_tasks = {}
+        for index, task in hotpatch_tasks.items():
+            dnf_event_start, dnf_event_end = task.get("dnf_event_start"), task.get("dnf_event_end")
+            if not all((dnf_event_start, dnf_event_end)):
+                task_results[index]["log"] = (
+                    f"Args of dnf_event_start '{dnf_event_start}' and dnf_event_end '{dnf_event_end}' "
+                    "should not be null."
+                )
+            elif dnf_event_start > dnf_event_end:
+                task_results[index]["log"] = (
+                    f"Failed to process dnf transaction-id range of '{dnf_event_start} - {dnf_event_end}'."
+                )
+            elif dnf_event_start == dnf_event_end:
+                task_results[index]["log"] = "No rollback operation need process."
+            elif dnf_event_end in valid_tasks:
+                task_results[index]["log"] = (
+                    f"The dnf transaction-id range ending at '{dnf_event_end}' is duplicated with task "
+                    f"'{task_results[valid_tasks[dnf_event_end][0]]['task_id']}', failed to process rollback operation."
+                )
+            else:
+                valid_tasks[dnf_event_end] = (index, dnf_event_start)
+
+        # walk back from the latest transaction along the contiguous ranges
+        rollback_tasks, expected_end = [], DnfHistory.query_latest_transaction_id()
+        while expected_end in valid_tasks:
+            index, dnf_event_start = valid_tasks.pop(expected_end)
+            rollback_tasks.append(index)
+            expected_end = dnf_event_start
+        for index, _ in valid_tasks.values():
+            task_results[index]["log"] = "Not the last executed dnf transaction, failed to process rollback operation."
+        if not rollback_tasks:
+            return
+
+        result, log = self._rollback_for_hotpatch(expected_end)
+        for index in rollback_tasks:
+            task_results[index].update({"status": result, "log": log})
+
+    def _batch_rollback_for_coldpatch(self, coldpatch_tasks: Dict[int, dict], task_results: List[dict]):
+        """
+        Validate the kernel tasks against one snapshot of the boot kernel, running kernel and installed kernels.
+        The tasks are chained from the boot kernel, that is the task which installed the boot kernel is rolled back
+        first, and its target kernel is expected to be installed by the next one. The kernels of the valid tasks are
+        removed by one dnf transaction, and the boot kernel is changed once to the target kernel of the last task.
+
+        Args:
+            coldpatch_tasks(dict): coldpatch tasks keyed by their index in task_results
+            task_results(list): rollback result of each task, which is updated in place
+        """
+        logs = {index: [] for index in coldpatch_tasks}
+        pending_tasks = {}
+        for index, task in coldpatch_tasks.items():
+            check_result, check_log = self._check_if_rpm_str_valid(task.get("installed_rpm"), task.get("target_rpm"))
+            if check_result != TaskExecuteRes.SUCCEED:
+                task_results[index]["log"] = check_log
+                continue
+            installed_evra = task["installed_rpm"].split("-", 1)[1]
+            if installed_evra in pending_tasks:
+                task_results[index]["log"] = (
+                    f"The {task['installed_rpm']} is duplicated with task "
+                    f"'{task_results[pending_tasks[installed_evra]]['task_id']}', failed to process rollback operation."
+                )
+                continue
+            pending_tasks[installed_evra] = index
+
+        # e.g. 4.19.90-2112.8.0.0131.oe1.x86_64
+        boot_evra = BOOT_LOADER.get_default_kernel()
+        if not boot_evra:
+            for index in pending_tasks.values():
+                task_results[index]["log"] = "Query boot kernel info failed!"
+            return
+        current_evra = platform.uname().release
+        bootable_evras = set(BOOT_LOADER.get_installed_kernels())
+        removed_rpms = set()
+
+        rollback_tasks = []
+        while boot_evra in pending_tasks:
+            index = pending_tasks.pop(boot_evra)
+            installed_rpm, target_rpm = coldpatch_tasks[index]["installed_rpm"], coldpatch_tasks[index]["target_rpm"]
+            target_evra = target_rpm.split("-", 1)[1]
+            if current_evra not in (boot_evra, target_evra):
+                task_results[index]["log"] = (
+                    f"The current kernel version is neither {installed_rpm} nor {target_rpm}. "
+                    "The environment after executed fix task has been tampered."
+                )
+                break
+            if (
+                not self.installed_packages.is_installed(target_rpm)
+                or target_evra not in bootable_evras
+                or target_rpm in removed_rpms
+            ):
+                task_results[index]["log"] = (
+                    "The target kernel of rollback task is not installed. "
+                    "The environment after executed fix task has been tampered."
+                )
+                break
+            if not self.installed_packages.is_installed(installed_rpm):
+                task_results[index]["log"] = f"The {installed_rpm} is not installed. Please check the input parameter."
+                break
+
+            if boot_evra == current_evra:
+                logs[index].append(f"Preserve the {installed_rpm} due to it is in use.")
+            else:
+                removed_rpms.add(installed_rpm)
+            rollback_tasks.append(index)
+            boot_evra = target_evra
+
+        for index in pending_tasks.values():
+            installed_rpm = coldpatch_tasks[index]["installed_rpm"]
+            task_results[index]["log"] = (
+                f"The default boot kernel version is not consistent with {installed_rpm}. "
+                "The environment after executed fix task has been tampered."
+            )
+        if not rollback_tasks:
+            return
+
+        if removed_rpms:
+            code, stdout, stderr = execute_shell_command([f"dnf remove {' '.join(sorted(removed_rpms))} -y"])
+            if code != CommandExitCode.SUCCEED:
+                LOGGER.error(stderr)
+                for index in rollback_tasks:
+                    task_results[index]["log"] = stdout + stderr
+                return
+            for index in rollback_tasks:
+                if coldpatch_tasks[index]["installed_rpm"] in removed_rpms:
+                    logs[index].append(stdout)
+
+        result, log = self._change_boot_kernel_version(coldpatch_tasks[rollback_tasks[-1]]["target_rpm"])
+        for index in rollback_tasks:
+            logs[index].append(log)
+            task_results[index].update({"status": result, "log": os.linesep.join(logs[index])})
+
     def _rollback(
         self,
         rollback_type: str,
@@ -159,7 +367,7 @@ class RollbackManage:
             LOGGER.error(tmp_log)
             return TaskExecuteRes.FAIL, tmp_log
 
-        if dnf_event_end != self._query_latest_dnf_transaction_id():
+        if dnf_event_end != DnfHistory.query_latest_transaction_id():
             tmp_log = f"Not the last executed dnf transaction, failed to process rollback operation."
             LOGGER.error(tmp_log)
             return TaskExecuteRes.FAIL, tmp_log
@@ -284,12 +492,7 @@ class RollbackManage:
         Returns:
             Tuple[str, str]: a tuple containing two elements (remove result, log)
         """
-        code, stdout, stderr = execute_shell_command(["rpm -qa", f"grep {installed_rpm}"])
-        # 'rpm -qa' shows installed rpm
-        # e.g.
-        # [root@openEuler ~]# rpm -qa | grep kernel-4.19.90-2112.8.0.0131.oe1.x86_64
-        # kernel-4.19.90-2112.8.0.0131.oe1.x86_64
-        if code != CommandExitCode.SUCCEED or installed_rpm not in stdout:
+        if not self.installed_packages.is_installed(installed_rpm):
             tmp_log = f"The {installed_rpm} is not installed. Please check the input parameter."
             LOGGER.error(tmp_log)
             return TaskExecuteRes.FAIL, tmp_log
@@ -323,18 +526,14 @@ class RollbackManage:
         Returns:
             Tuple[str, str]: a tuple containing two elements (check result, log)
         """
-        code, stdout, stderr = execute_shell_command([f"grubby --default-kernel"])
-        # 'grubby --default-kernel' shows boot default kernel version in the system
-        # e.g.
-        # [root@openEuler ~]# grubby --default-kernel
-        # /boot/vmlinuz-4.19.90-2112.8.0.0131.oe1.x86_64
-        if code != CommandExitCode.SUCCEED:
-            LOGGER.error(stderr)
-            return TaskExecuteRes.FAIL, stdout + stderr
+        # e.g. 4.19.90-2112.8.0.0131.oe1.x86_64
+        boot_evra = BOOT_LOADER.get_default_kernel()
+        if not boot_evra:
+            return TaskExecuteRes.FAIL, "Query boot kernel info failed!"
 
         # version-release.arch
         evra = installed_rpm.split("-", 1)[1]
-        if evra not in stdout:
+        if evra != boot_evra:
             tmp_log = (
                 f"The default boot kernel version is not consistent with {installed_rpm}. "
                 "The environment after executed fix task has been tampered."
@@ -385,12 +584,7 @@ class RollbackManage:
         Returns:
             Tuple[str, str]: a tuple containing two elements (check result, log)
         """
-        code, stdout, stderr = execute_shell_command(["rpm -qa", f"grep {target_rpm}"])
-        # 'rpm -qa' shows installed rpm
-        # e.g.
-        # [root@openEuler ~]# rpm -qa | grep kernel-4.19.90-2112.8.0.0131.oe1.x86_64
-        # kernel-4.19.90-2112.8.0.0131.oe1.x86_64
-        if code != CommandExitCode.SUCCEED or target_rpm not in stdout:
+        if not self.installed_packages.is_installed(target_rpm):
             tmp_log = "The target kernel of rollback task is not installed. The environment after executed fix task has been tampered."
             LOGGER.error(tmp_log)
             return TaskExecuteRes.FAIL, tmp_log
@@ -409,16 +603,12 @@ class RollbackManage:
         """
         # version-release.arch
         evra = target_rpm.split("-", 1)[1]
-        boot_file = self.BOOT_FILE % (evra)
-        if not os.path.isfile(boot_file):
+        if evra not in BOOT_LOADER.get_installed_kernels():
             tmp_log = "Target boot file not exists."
             LOGGER.error(tmp_log)
             return TaskExecuteRes.FAIL, tmp_log
 
-        # 'grubby --set-default=/boot/vmlinuz-xxx' changes the default boot entry
-        code, stdout, stderr = execute_shell_command([f"grubby --set-default={boot_file}"])
-        if code != CommandExitCode.SUCCEED:
-            LOGGER.error(stderr)
-            return TaskExecuteRes.FAIL, stdout + stderr
+        if not BOOT_LOADER.set_default_kernel(evra):
+            return TaskExecuteRes.FAIL, f"Change default boot kernel version to {target_rpm} failed."
 
         return TaskExecuteRes.SUCCEED, f"Change default boot kernel version to {target_rpm} successfully."
@@ -10,25 +10,174 @@
 # PURPOSE.
 # See the Mulan PSL v2 for more details.
 # ******************************************************************************/
+import configparser
+import glob
+import hashlib
+import json
+import os
+import platform
 import re
+import time
 from collections import defaultdict
-from typing import Tuple, Dict
+from typing import Tuple, Dict, Optional
 
-from ceres.conf.constant import CommandExitCode
+from ceres.conf.constant import CVE_SCAN_CACHE_PATH, CVE_SCAN_CACHE_TTL, CommandExitCode
 from ceres.function.log import LOGGER
 from ceres.function.util import execute_shell_command
 from ceres.function.check import PreCheck
+from ceres.function.installed_package import InstalledPackages
 from ceres.function.status import PRE_CHECK_ERROR, SUCCESS
 from ceres.manages.collect_manage import Collect
 
-__all__ = ["CveScanManage"]
+__all__ = ["CveScanCache", "CveScanManage"]
+
+
+class CveScanCache:
+    """
+    Save the last cve scan result together with the fingerprint of everything the result is derived from,
+    so that the scan can be skipped when neither the installed packages, the repo metadata nor the hotpatch
+    status has changed since then.
+
+    cache file e.g.
+        {
+            "fingerprint": {
+                "rpmdb": "cookie:2e5ef71ba8e1d7d1f4f5e2fa4c6a6d0ef8e6a90c",
+                "repos": "5d41402abc4b2a76b9719d911017c592...",
+                "syscare": "7d793037a0760186574b0282f2f435e7...",
+                "kernel": "5.10.0-60.18.0.50.oe2203.x86_64",
+                "kernel_filter": false
+            },
+            "expire_time": 1697600000.0,
+            "result": {"unfixed_cves": [], "fixed_cves": [], "installed_packages": []}
+        }
+    """
+
+    REPO_CONFIG_PATH = "/etc/yum.repos.d"
+    DNF_CACHE_PATH = "/var/cache/dnf"
+
+    def __init__(self, cache_path: str = CVE_SCAN_CACHE_PATH):
+        self._cache_path = cache_path
+
+    @classmethod
+    def get_repos_fingerprint(cls) -> str:
+        """
+        get the digest of the repo config files and the repomd.xml of each enabled repo in the dnf cache
+        """
+        digest = hashlib.sha256()
+        enabled_repos = []
+        for repo_file in sorted(glob.glob(os.path.join(cls.REPO_CONFIG_PATH, "*.repo"))):
+            parser = configparser.RawConfigParser(strict=False)
+            try:
+                with open(repo_file, "rb") as file:
+                    content = file.read()
+                parser.read_string(content.decode("utf-8", errors="replace"), source=repo_file)
+            except (OSError, configparser.Error) as error:
+                LOGGER.warning(f"Failed to read repo config {repo_file}: {error}")
+                continue
+            digest.update(content)
+            for repo_id in parser.sections():
+                if parser.get(repo_id, "enabled", fallback="1").strip().lower() in ("1", "true", "yes"):
+                    enabled_repos.append(repo_id)
+
+        for repo_id in sorted(enabled_repos):
+            # dnf caches the metadata of each repo in the directory named after the repo id and a hash of its url
+            repomd_pattern = os.path.join(cls.DNF_CACHE_PATH, f"{glob.escape(repo_id)}-*", "repodata", "repomd.xml")
+            for repomd_path in sorted(glob.glob(repomd_pattern)):
+                try:
+                    with open(repomd_path, "rb") as file:
+                        digest.update(repomd_path.encode("utf-8"))
+                        digest.update(file.read())
+                except OSError as error:
+                    LOGGER.warning(f"Failed to read repo metadata {repomd_path}: {error}")
+        return digest.hexdigest()
+
+    @staticmethod
+    def get_syscare_fingerprint() -> str:
+        """
+        get the digest of the hotpatch status in syscare, it is empty when syscare is not installed
+        """
+        code, stdout, _ = execute_shell_command(["syscare list"])
+        if code != CommandExitCode.SUCCEED:
+            return ""
+        return hashlib.sha256(stdout.encode("utf-8")).hexdigest()
+
+    def get_fingerprint(self, kernel_filter: Optional[bool]) -> Optional[dict]:
+        """
+        get the fingerprint of the current cve scan inputs
+
+        Args:
+            kernel_filter(bool): whether the scan only cares about kernel, None if not specified
+
+        Returns:
+            dict: None if the rpm database can not be fingerprinted
+        """
+        rpmdb_fingerprint = InstalledPackages.get_rpmdb_fingerprint()
+        if rpmdb_fingerprint is None:
+            return None
+        return {
+            "rpmdb": rpmdb_fingerprint,
+            "repos": self.get_repos_fingerprint(),
+            "syscare": self.get_syscare_fingerprint(),
+            "kernel": platform.release(),
+            "kernel_filter": kernel_filter,
+        }
+
+    def load(self, fingerprint: dict) -> Optional[dict]:
+        """
+        load the saved cve scan result if it is derived from the same fingerprint and not expired
+
+        Returns:
+            dict: e.g {"unfixed_cves": [], "fixed_cves": []}
+        """
+        try:
+            with open(self._cache_path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return None
+
+        if (
+            not isinstance(data, dict)
+            or data.get("fingerprint") != fingerprint
+            or data.get("expire_time", 0) <= time.time()
+            or not isinstance(data.get("result"), dict)
+        ):
+            return None
+        return data["result"]
+
+    def save(self, fingerprint: dict, result: dict):
+        """
+        save the cve scan result with its fingerprint
+        """
+        data = {"fingerprint": fingerprint, "expire_time": time.time() + CVE_SCAN_CACHE_TTL, "result": result}
+        tmp_path = f"{self._cache_path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self._cache_path), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as file:
+                json.dump(data, file)
+            os.replace(tmp_path, self._cache_path)
+        except OSError as error:
+            LOGGER.warning(f"Failed to save cve scan cache: {error}")
 
 
 class CveScanManage:
-    def __init__(self) -> None:
+    # sections in the output of 'dnf hot-updateinfo list cves --scan'
+    PLUGIN_SCAN_SECTIONS = ("available", "installed", "hotpatch")
+
+    def __init__(
+        self, installed_packages: Optional[InstalledPackages] = None, scan_cache: Optional[CveScanCache] = None
+    ) -> None:
+        """
+        Args:
+            installed_packages(InstalledPackages): installed packages snapshot shared with the caller,
+            it is queried when the scan starts if not given
+            scan_cache(CveScanCache): cache of the last scan result, the result is not cached if not given
+        """
+        self.installed_packages = installed_packages
+        self.scan_cache = scan_cache
         self.kernel_filter = None
         self.installed_rpm_info = None
         self.available_hotpatch_key_set = set()
+        self.plugin_scan_output = {}
 
     def cve_scan(self, cve_scan_args: dict) -> Tuple[str, dict]:
         """
@@ -69,7 +218,11 @@ class CveScanManage:
                             "installed_rpm":"redis-4.2.5-1.oe2203.x86_64",
                             "fix_way": "coldpatch"
                         }
-                    ]
+                    ],
+                    "installed_packages": [{
+                        "name": "kernel",
+                        "version": "4.19.90-2022.1.1"
+                    }]
                 }
         """
         cve_scan_result = {}
@@ -79,17 +232,30 @@ class CveScanManage:
             LOGGER.info("The pre-check is failed before execute command!")
             return PRE_CHECK_ERROR, cve_scan_result
 
+        fingerprint = self.scan_cache.get_fingerprint(cve_scan_args.get("kernel")) if self.scan_cache else None
+        cached_result = self.scan_cache.load(fingerprint) if fingerprint else None
+        if cached_result is not None:
+            LOGGER.info("Nothing changed since the last cve scan, reuse its result.")
+            cve_scan_result.update(cached_result)
+            return SUCCESS, cve_scan_result
+
         self.installed_rpm_info = self._query_installed_rpm()
         self.available_hotpatch_key_set = set()
         self.kernel_filter = cve_scan_args.get("kernel")
-
-        cve_scan_result.update(
-            {
-                "check_items": items_check_log,
-                "unfixed_cves": self._query_unfixed_cves_by_dnf_plugin(),
-                "fixed_cves": self._query_fixed_cves_by_dnf_plugin(),
-            }
-        )
+        self.plugin_scan_output = self._scan_by_dnf_plugin()
+
+        scan_result = {
+            "unfixed_cves": self._query_unfixed_cves_by_dnf_plugin(),
+            "fixed_cves": self._query_fixed_cves_by_dnf_plugin(),
+            "installed_packages": Collect.get_installed_packages(
+                cve_scan_args.get("kernel", True), self.installed_packages
+            ),
+        }
+        # only the result derived from one complete dnf plugin scan is reliable enough to be reused
+        if fingerprint and self.plugin_scan_output and Collect.get_current_kernel_version():
+            self.scan_cache.save(fingerprint, scan_result)
+
+        cve_scan_result.update(scan_result)
         return SUCCESS, cve_scan_result
 
     def _query_installed_rpm(self):
@@ -102,27 +268,12 @@ class CveScanManage:
                     "kernel":"kernel-5.10.0-60.92.0.116.oe2203.aarch64"
                 }
         """
-        rpm_info_dict = {}
-        # Example of command execution result:
-        # openldap:openldap-2.4.50-6.oe1.x86_64
-        # kernel:kernel-4.19.90-2310.3.0.0222.oe1.x86_64
-        # systemtap-runtime:systemtap-runtime-4.3-2.oe1.x86_64
-        # perl-Net-SSLeay:perl-Net-SSLeay-1.88-5.oe1.x86_64
-        # powertop:powertop-2.9-12.oe1.x86_64
-        # libusbx:libusbx-1.0.23-1.oe1.x86_64
-        commands = ["rpm -qa --queryformat '%{NAME}:%{NAME}-%{VERSION}-%{RELEASE}.%{ARCH}\n'"]
-        if self.kernel_filter:
-            commands.append("grep kernel")
-
-        code, stdout, _ = execute_shell_command(commands)
-        if code != CommandExitCode.SUCCEED or not stdout:
-            LOGGER.error("query installed packages info failed!")
+        if self.installed_packages is None:
+            self.installed_packages = InstalledPackages.query()
+        rpm_info_dict = self.installed_packages.get_nevra_by_name(self.kernel_filter)
+        if not rpm_info_dict:
             return rpm_info_dict
 
-        for line in stdout.splitlines():
-            rpm_name, rpm_info = line.split(":", 1)
-            rpm_info_dict[rpm_name] = rpm_info
-
         rpm_info_dict["kernel"] = (
             f"kernel-{Collect.get_current_kernel_version()}" if Collect.get_current_kernel_version() else ""
         )
@@ -130,6 +281,72 @@ class CveScanManage:
         LOGGER.debug("query installed rpm package info succeed!")
         return rpm_info_dict
 
+    def _scan_by_dnf_plugin(self) -> Dict[str, str]:
+        """
+        query available cves, installed cves and applied hotpatch status by one dnf process, which loads the repo
+        metadata and the hotpatch updateinfo only once
+
+        Returns:
+            dict: output of each section, it is empty when the dnf plugin does not support the scan option. e.g
+                {
+                    "available": "CVE-2023-1111 Important/Sec. redis-6.2.5-2.x86_64 -",
+                    "installed": "CVE-2023-2221 Important/Sec. - patch-redis-6.2.5-1-ACC-1-1.x86_64",
+                    "hotpatch": "CVE-2023-2221 redis-6.2.5-1/ACC-1-1/redis-cli ACTIVED"
+                }
+        """
+        # Example of command execution result:
+        # Last metadata expiration check: 0:31:50 ago on Mon 07 Aug 2023 10:26:32 AM CST.
+        # [available]
+        # CVE-2023-1981   Moderate/Sec.  avahi-libs-0.8-9.oe1.x86_64                     -
+        # [installed]
+        # CVE-2023-2221   Important/Sec. -                    patch-redis-6.2.5-1-ACC-1-1.x86_64
+        # [hotpatch]
+        # CVE-2023-2221 redis-6.2.5-1/ACC-1-1/redis-cli ACTIVED
+        code, stdout, stderr = execute_shell_command(["dnf hot-updateinfo list cves --scan"])
+        if code != CommandExitCode.SUCCEED:
+            LOGGER.warning("Failed to scan cves by one dnf process, query them separately instead.")
+            LOGGER.debug(stderr)
+            return {}
+
+        sections, current_section = {}, None
+        for line in stdout.splitlines():
+            section = re.fullmatch(r"\[(\w+)\]", line.strip())
+            if section and section.group(1) in self.PLUGIN_SCAN_SECTIONS:
+                current_section = section.group(1)
+                sections[current_section] = []
+            elif current_section:
+                sections[current_section].append(line)
+
+        if set(sections) != set(self.PLUGIN_SCAN_SECTIONS):
+            LOGGER.warning("Failed to parse the cve scan result of dnf plugin, query them separately instead.")
+            return {}
+        return {section: "\n".join(lines) for section, lines in sections.items()}
+
+    def _query_by_dnf_plugin(self, section: str, command: str, kernel_filter: bool = True) -> Tuple[int, str, str]:
+        """
+        get the output of dnf plugin command from the scan result, or execute the command when it is not scanned
+
+        Args:
+            section(str): section in the scan result, e.g available
+            command(str): dnf plugin command which outputs the same content as the section
+            kernel_filter(bool): whether to only keep the lines about kernel when kernel filter is set
+
+        Returns:
+            Tuple[int, str, str]
+            a tuple containing three elements (return code, standard output, standard error).
+        """
+        filter_kernel = kernel_filter and self.kernel_filter
+        if section not in self.plugin_scan_output:
+            commands = [command]
+            if filter_kernel:
+                commands.append("grep kernel")
+            return execute_shell_command(commands)
+
+        stdout = self.plugin_scan_output[section]
+        if filter_kernel:
+            stdout = "\n".join(line for line in stdout.splitlines() if "kernel" in line)
+        return CommandExitCode.SUCCEED, stdout, ""
+
     def _query_unfixed_cves_by_dnf(self) -> list:
         """
         parse unfixed kernel vulnerability info by dnf (coldpatch)
@@ -224,10 +441,7 @@ class CveScanManage:
         # CVE-2021-42574  Important/Sec. binutils-2.34-19.oe1.x86_64                     -
         # CVE-2023-1513   Important/Sec. kernel-4.19.90-2304.1.0.0196.oe1.x86_64         patch-kernel-4.19.90-2112...
         cve_info_list = []
-        commands = ["dnf hot-updateinfo list cves"]
-        if self.kernel_filter:
-            commands.append("grep kernel")
-        code, stdout, stderr = execute_shell_command(commands)
+        code, stdout, stderr = self._query_by_dnf_plugin("available", "dnf hot-updateinfo list cves")
         if code != CommandExitCode.SUCCEED:
             LOGGER.error("query unfixed cve info failed by dnf!")
             LOGGER.error(stderr)
@@ -346,10 +560,7 @@ class CveScanManage:
             return []
         current_kernel_rpm_name = f"kernel-{current_kernel_version}"
 
-        commands = ["dnf hot-updateinfo list cves --installed"]
-        if self.kernel_filter:
-            commands.append("grep kernel")
-        code, stdout, stderr = execute_shell_command(commands)
+        code, stdout, stderr = self._query_by_dnf_plugin("installed", "dnf hot-updateinfo list cves --installed")
         if code != CommandExitCode.SUCCEED:
             LOGGER.error("query unfixed cve info failed by dnf!")
             LOGGER.error(stderr)
@@ -423,7 +634,7 @@ class CveScanManage:
         # CVE-2023-1111 redis-6.2.5-1/SGL_CVE_2023_1111_CVE_2023_1112-1-1/redis-server    NOT-APPLIED
         # CVE-2023-1112 redis-6.2.5-1/SGL_CVE_2023_1111_CVE_2023_1112-1-1/redis-server    NOT-APPLIED
         result = {}
-        code, stdout, stderr = execute_shell_command(["dnf hotpatch --list cves"])
+        code, stdout, stderr = self._query_by_dnf_plugin("hotpatch", "dnf hotpatch --list cves", kernel_filter=False)
         if code != CommandExitCode.SUCCEED:
             LOGGER.error("query applied hotpatch info failed!")
             LOGGER.error(stderr)
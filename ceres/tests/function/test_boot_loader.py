@@ -0,0 +1,91 @@
+#!/usr/bin/python3
+# ******************************************************************************
+# Copyright (c) Huawei Technologies Co., Ltd. 2024-2024. All rights reserved.
+# licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN 'AS IS' BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# ******************************************************************************/
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from ceres.conf.constant import CommandExitCode
+from ceres.function.boot_loader import BootLoader
+
+MACHINE_ID = "8b6bd9e0a3d9494e9a0f6b5c2bd8e7a3"
+KERNEL_A = "5.10.0-60.18.0.50.oe2203.x86_64"
+KERNEL_B = "5.10.0-60.92.0.116.oe2203.x86_64"
+
+
+class TestBootLoader(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.entries_path = os.path.join(self.tmp_dir.name, "loader", "entries")
+        self.grubenv_path = os.path.join(self.tmp_dir.name, "grubenv")
+        os.makedirs(self.entries_path)
+        for patcher in (
+            mock.patch.object(BootLoader, "BOOT_PATH", self.tmp_dir.name),
+            mock.patch.object(BootLoader, "BLS_ENTRIES_PATH", self.entries_path),
+            mock.patch.object(BootLoader, "GRUBENV_PATH", self.grubenv_path),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.boot_loader = BootLoader()
+
+    def add_entry(self, kernel):
+        with open(os.path.join(self.entries_path, f"{MACHINE_ID}-{kernel}.conf"), "w") as file:
+            file.write(f"title openEuler ({kernel}) 22.03 LTS\nversion {kernel}\nlinux /vmlinuz-{kernel}\n")
+
+    def write_grubenv(self, saved_entry):
+        content = f"# GRUB Environment Block\nsaved_entry={saved_entry}\nboot_success=0\n"
+        with open(self.grubenv_path, "w") as file:
+            file.write(content + "#" * (1024 - len(content)))
+
+    @mock.patch("ceres.function.boot_loader.execute_shell_command")
+    def test_get_default_kernel_should_return_kernel_of_saved_entry_when_entries_are_configured_by_bls(
+        self, mock_execute_shell_command
+    ):
+        self.add_entry(KERNEL_A)
+        self.add_entry(KERNEL_B)
+        self.write_grubenv(f"{MACHINE_ID}-{KERNEL_A}")
+        self.assertEqual(KERNEL_A, self.boot_loader.get_default_kernel())
+        self.assertEqual([KERNEL_A, KERNEL_B], self.boot_loader.get_installed_kernels())
+        mock_execute_shell_command.assert_not_called()
+
+    @mock.patch("ceres.function.boot_loader.execute_shell_command")
+    def test_get_default_kernel_should_query_by_grubby_when_saved_entry_is_not_found(
+        self, mock_execute_shell_command
+    ):
+        self.add_entry(KERNEL_A)
+        self.write_grubenv("0")
+        mock_execute_shell_command.return_value = CommandExitCode.SUCCEED, f"/boot/vmlinuz-{KERNEL_B}\n", ""
+        self.assertEqual(KERNEL_B, self.boot_loader.get_default_kernel())
+
+    @mock.patch("ceres.function.boot_loader.execute_shell_command")
+    def test_set_default_kernel_should_rewrite_saved_entry_and_keep_grubenv_size(self, mock_execute_shell_command):
+        self.add_entry(KERNEL_A)
+        self.add_entry(KERNEL_B)
+        self.write_grubenv(f"{MACHINE_ID}-{KERNEL_A}")
+        self.assertTrue(self.boot_loader.set_default_kernel(KERNEL_B))
+        self.assertEqual(KERNEL_B, self.boot_loader.get_default_kernel())
+        self.assertEqual(1024, os.path.getsize(self.grubenv_path))
+        with open(self.grubenv_path) as file:
+            self.assertIn("boot_success=0\n", file.read())
+        mock_execute_shell_command.assert_not_called()
+
+    @mock.patch("ceres.function.boot_loader.execute_shell_command")
+    def test_set_default_kernel_should_set_by_grubby_when_kernel_has_no_boot_entry(self, mock_execute_shell_command):
+        self.add_entry(KERNEL_A)
+        self.write_grubenv(f"{MACHINE_ID}-{KERNEL_A}")
+        mock_execute_shell_command.return_value = CommandExitCode.SUCCEED, "", ""
+        self.assertTrue(self.boot_loader.set_default_kernel(KERNEL_B))
+        mock_execute_shell_command.assert_called_once_with(
+            [f"grubby --set-default={os.path.join(self.tmp_dir.name, f'vmlinuz-{KERNEL_B}')}"]
+        )
@@ -0,0 +1,64 @@
+#!/usr/bin/python3
+# ******************************************************************************
+# Copyright (c) Huawei Technologies Co., Ltd. 2024-2024. All rights reserved.
+# licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN 'AS IS' BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# ******************************************************************************/
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+from ceres.conf.constant import CommandExitCode
+from ceres.function.dnf_history import DnfHistory
+
+
+class TestDnfHistory(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.db_path = os.path.join(self.tmp_dir.name, "history.sqlite")
+        for patcher in (
+            mock.patch.object(DnfHistory, "HISTORY_DB_PATH", self.db_path),
+            mock.patch.object(DnfHistory, "_cached_db_state", None),
+            mock.patch.object(DnfHistory, "_cached_transaction_id", None),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def add_transactions(self, *transaction_ids):
+        conn = sqlite3.connect(self.db_path)
+        with conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS trans (id INTEGER PRIMARY KEY, cmdline TEXT)")
+            conn.executemany("INSERT INTO trans VALUES (?, 'install gcc')", [(i,) for i in transaction_ids])
+        conn.close()
+
+    @mock.patch("ceres.function.dnf_history.execute_shell_command")
+    def test_query_latest_transaction_id_should_return_max_id_in_history_database(self, mock_execute_shell_command):
+        self.add_transactions(1, 2, 3)
+        self.assertEqual(3, DnfHistory.query_latest_transaction_id())
+        mock_execute_shell_command.assert_not_called()
+
+    def test_query_latest_transaction_id_should_return_new_id_when_history_database_is_modified(self):
+        self.add_transactions(1)
+        self.assertEqual(1, DnfHistory.query_latest_transaction_id())
+        self.add_transactions(2)
+        self.assertEqual(2, DnfHistory.query_latest_transaction_id())
+
+    def test_query_latest_transaction_id_should_return_zero_when_there_is_no_transaction(self):
+        self.add_transactions()
+        self.assertEqual(0, DnfHistory.query_latest_transaction_id())
+
+    @mock.patch("ceres.function.dnf_history.execute_shell_command")
+    def test_query_latest_transaction_id_should_query_by_command_when_history_database_not_exists(
+        self, mock_execute_shell_command
+    ):
+        mock_execute_shell_command.return_value = CommandExitCode.SUCCEED, "5\n", ""
+        self.assertEqual(5, DnfHistory.query_latest_transaction_id())
@@ -0,0 +1,148 @@
+#!/usr/bin/python3
+# ******************************************************************************
+# Copyright (c) Huawei Technologies Co., Ltd. 2024-2024. All rights reserved.
+# licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN 'AS IS' BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# ******************************************************************************/
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from ceres.conf.constant import CommandExitCode
+from ceres.function.installed_package import InstalledPackage, InstalledPackages
+
+MOCK_QUERY_STDOUT = (
+    "openldap:openldap-2.4.50-6.oe1.x86_64:openldap-2.4.50-6.oe1.src.rpm\n"
+    "kernel:kernel-4.19.90-2310.3.0.0222.oe1.x86_64:kernel-4.19.90-2310.3.0.0222.oe1.src.rpm\n"
+    "kernel-tools:kernel-tools-4.19.90-2310.3.0.0222.oe1.x86_64:kernel-4.19.90-2310.3.0.0222.oe1.src.rpm\n"
+    "gpg-pubkey:gpg-pubkey-b25e7f66-5d24a6b8.(none):(none)"
+)
+
+
+class MockRpmModule:
+    RPMTAG_NAME = "name"
+    RPMTAG_VERSION = "version"
+    RPMTAG_RELEASE = "release"
+    RPMTAG_ARCH = "arch"
+    RPMTAG_SOURCERPM = "sourcerpm"
+
+    class error(Exception):
+        pass
+
+    def __init__(self, headers):
+        self.headers = headers
+
+    def TransactionSet(self):
+        return mock.Mock(dbMatch=mock.Mock(return_value=self.headers))
+
+
+class TestInstalledPackages(unittest.TestCase):
+    def setUp(self) -> None:
+        # the rpm python module of the test machine is not used unless it is mocked in the test case
+        rpm_patcher = mock.patch('ceres.function.installed_package.rpm', None)
+        rpm_patcher.start()
+        self.addCleanup(rpm_patcher.stop)
+    @mock.patch('ceres.function.installed_package.execute_shell_command')
+    def test_query_should_return_all_installed_packages_when_execute_command_successfully(
+        self, mock_execute_shell_command
+    ):
+        mock_execute_shell_command.return_value = CommandExitCode.SUCCEED, MOCK_QUERY_STDOUT, ""
+        installed_packages = InstalledPackages.query()
+        self.assertEqual(4, len(installed_packages.packages))
+        self.assertEqual(
+            InstalledPackage("openldap", "openldap-2.4.50-6.oe1.x86_64", "openldap-2.4.50-6.oe1.src.rpm"),
+            installed_packages.packages[0],
+        )
+
+    @mock.patch('ceres.function.installed_package.execute_shell_command')
+    def test_query_should_return_empty_snapshot_when_execute_command_failed(self, mock_execute_shell_command):
+        mock_execute_shell_command.return_value = CommandExitCode.FAIL, "", ""
+        self.assertEqual([], InstalledPackages.query().packages)
+
+    @mock.patch('ceres.function.installed_package.execute_shell_command')
+    def test_get_nevra_by_name_should_only_return_kernel_packages_when_kernel_filter_is_true(
+        self, mock_execute_shell_command
+    ):
+        mock_execute_shell_command.return_value = CommandExitCode.SUCCEED, MOCK_QUERY_STDOUT, ""
+        expected_result = {
+            "kernel": "kernel-4.19.90-2310.3.0.0222.oe1.x86_64",
+            "kernel-tools": "kernel-tools-4.19.90-2310.3.0.0222.oe1.x86_64",
+        }
+        self.assertEqual(expected_result, InstalledPackages.query().get_nevra_by_name(kernel_filter=True))
+
+    @mock.patch('ceres.function.installed_package.execute_shell_command')
+    def test_get_source_packages_should_return_kernel_source_package_when_kernel_is_true(
+        self, mock_execute_shell_command
+    ):
+        mock_execute_shell_command.return_value = CommandExitCode.SUCCEED, MOCK_QUERY_STDOUT, ""
+        expected_result = [{"name": "kernel", "version": "4.19.90-2310"}]
+        self.assertEqual(expected_result, InstalledPackages.query().get_source_packages(kernel=True))
+
+    @mock.patch('ceres.function.installed_package.execute_shell_command')
+    def test_query_should_read_rpm_database_by_rpm_module_when_rpm_module_is_available(
+        self, mock_execute_shell_command
+    ):
+        headers = [
+            {
+                "name": b"kernel",
+                "version": b"4.19.90",
+                "release": b"2310.3.0.0222.oe1",
+                "arch": b"x86_64",
+                "sourcerpm": b"kernel-4.19.90-2310.3.0.0222.oe1.src.rpm",
+            },
+            {"name": "gpg-pubkey", "version": "b25e7f66", "release": "5d24a6b8", "arch": None, "sourcerpm": None},
+        ]
+        with mock.patch('ceres.function.installed_package.rpm', MockRpmModule(headers)):
+            installed_packages = InstalledPackages.query()
+        mock_execute_shell_command.assert_not_called()
+        self.assertEqual(
+            [
+                InstalledPackage(
+                    "kernel", "kernel-4.19.90-2310.3.0.0222.oe1.x86_64", "kernel-4.19.90-2310.3.0.0222.oe1.src.rpm"
+                ),
+                InstalledPackage("gpg-pubkey", "gpg-pubkey-b25e7f66-5d24a6b8.(none)", "(none)"),
+            ],
+            installed_packages.packages,
+        )
+
+    def test_is_installed_should_return_whether_nevra_is_installed(self):
+        installed_packages = InstalledPackages(
+            [InstalledPackage("kernel", "kernel-4.19.90-2310.3.0.0222.oe1.x86_64", "kernel.src.rpm")]
+        )
+        self.assertTrue(installed_packages.is_installed("kernel-4.19.90-2310.3.0.0222.oe1.x86_64"))
+        self.assertFalse(installed_packages.is_installed("kernel-4.19.90-2310.3.0.0222.oe1"))
+
+    def test_get_by_source_rpm_should_return_all_packages_built_from_source_rpm(self):
+        installed_packages = InstalledPackages(
+            [
+                InstalledPackage("kernel", "kernel-4.19.90-1.x86_64", "kernel-4.19.90-1.src.rpm"),
+                InstalledPackage("kernel-tools", "kernel-tools-4.19.90-1.x86_64", "kernel-4.19.90-1.src.rpm"),
+                InstalledPackage("openldap", "openldap-2.4.50-6.x86_64", "openldap-2.4.50-6.src.rpm"),
+            ]
+        )
+        self.assertEqual(
+            ["kernel", "kernel-tools"],
+            [package.name for package in installed_packages.get_by_source_rpm("kernel-4.19.90-1.src.rpm")],
+        )
+
+    def test_get_rpmdb_fingerprint_should_change_when_rpm_database_file_is_modified(self):
+        with tempfile.TemporaryDirectory() as rpmdb_path, mock.patch.object(
+            InstalledPackages, "RPMDB_PATH", rpmdb_path
+        ):
+            with open(os.path.join(rpmdb_path, "rpmdb.sqlite"), "w") as file:
+                file.write("packages")
+            fingerprint = InstalledPackages.get_rpmdb_fingerprint()
+            with open(os.path.join(rpmdb_path, "rpmdb.sqlite"), "a") as file:
+                file.write("new package")
+            self.assertNotEqual(fingerprint, InstalledPackages.get_rpmdb_fingerprint())
+
+    def test_get_rpmdb_fingerprint_should_return_none_when_rpm_database_not_exists(self):
+        with mock.patch.object(InstalledPackages, "RPMDB_PATH", "/not/exist/rpm"):
+            self.assertIsNone(InstalledPackages.get_rpmdb_fingerprint())
@@ -13,6 +13,8 @@
 import configparser
 import json
 import os
+import pwd
+import time
 import unittest
 from unittest import mock
 
@@ -25,6 +27,8 @@ from ceres.function.util import (
     get_dict_from_file,
     update_ini_data_value,
     execute_shell_command,
+    execute_concurrently,
+    get_user_name,
 )
 
 
@@ -156,3 +160,47 @@ class TestUtil(unittest.TestCase):
         mock_load.side_effect = libconf.ConfigParseError()
         mock_config = load_gopher_config('mock')
         self.assertEqual(libconf.AttrDict(), mock_config)
+
+    def test_execute_shell_command_should_return_command_output_when_all_is_right(self):
+        res = execute_shell_command(["echo mock", "wc -l"])
+        self.assertEqual((CommandExitCode.SUCCEED, "1", ""), res)
+
+    def test_execute_shell_command_should_return_fail_when_command_timed_out(self):
+        return_code, _, stderr = execute_shell_command(["sleep 5"], timeout=0.1)
+        self.assertEqual(CommandExitCode.FAIL, return_code)
+        self.assertIn("timed out", stderr)
+
+    def test_execute_concurrently_should_return_each_function_result_when_all_is_right(self):
+        res = execute_concurrently(
+            {
+                "first": lambda: execute_shell_command(["echo first"]),
+                "second": lambda: execute_shell_command(["echo second"]),
+            }
+        )
+        expected_res = {
+            "first": (CommandExitCode.SUCCEED, "first", ""),
+            "second": (CommandExitCode.SUCCEED, "second", ""),
+        }
+        self.assertEqual(expected_res, res)
+
+    def test_execute_concurrently_should_return_none_for_function_which_raised_or_timed_out(self):
+        def raise_error():
+            raise OSError("mock error")
+
+        res = execute_concurrently(
+            {"hung": lambda: time.sleep(1), "error": raise_error, "normal": lambda: "normal"}, timeout=0.1
+        )
+        self.assertEqual({"hung": None, "error": None, "normal": "normal"}, res)
+
+    def test_execute_concurrently_should_cancel_function_which_is_not_started_before_timeout(self):
+        not_started = mock.Mock(return_value="not started")
+        res = execute_concurrently({"hung": lambda: time.sleep(1), "not_started": not_started}, 0.1, max_workers=1)
+        self.assertEqual({"hung": None, "not_started": None}, res)
+        time.sleep(1.2)
+        not_started.assert_not_called()
+
+    @mock.patch.object(pwd, 'getpwuid', side_effect=KeyError("getpwuid(): uid not found: 65432"))
+    def test_get_user_name_should_return_uid_when_user_does_not_exist(self, mock_getpwuid):
+        get_user_name.cache_clear()
+        self.addCleanup(get_user_name.cache_clear)
+        self.assertEqual("65432", get_user_name(65432))
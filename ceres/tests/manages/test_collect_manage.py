@@ -11,16 +11,19 @@
 # See the Mulan PSL v2 for more details.
 # ******************************************************************************/
 import grp
+import hashlib
 import os
 import platform
 import pwd
+import tempfile
+import time
 import unittest
 import warnings
 from unittest import mock
 import xml.etree.ElementTree as ET
 
-from ceres.conf.constant import CommandExitCode
-from ceres.manages.collect_manage import Collect
+from ceres.conf.constant import HOST_COLLECT_INFO_TIMEOUT, CommandExitCode
+from ceres.manages.collect_manage import Collect, FileFingerprintCache, HostFactCache, HostFactReader
 
 
 class Socket:
@@ -37,6 +40,15 @@ class Socket:
 class TestCollectManage(unittest.TestCase):
     def setUp(self) -> None:
         warnings.simplefilter('ignore', ResourceWarning)
+        # host facts of the test machine are unavailable, commands are used instead
+        read_file_patcher = mock.patch.object(HostFactReader, "read_file", return_value=None)
+        read_file_patcher.start()
+        self.addCleanup(read_file_patcher.stop)
+        cache_patcher = mock.patch.object(
+            HostFactCache, "get", side_effect=lambda name, getter, validator=bool: getter()
+        )
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
 
     @mock.patch.object(Collect, "_Collect__get_total_online_memory")
     @mock.patch('ceres.manages.collect_manage.execute_shell_command')
@@ -363,14 +375,15 @@ class TestCollectManage(unittest.TestCase):
         mock_socket.return_value = Socket()
         self.assertEqual('', Collect.get_host_ip())
 
-    @mock.patch('ceres.manages.collect_manage.execute_shell_command')
+    @mock.patch('ceres.function.installed_package.rpm', None)
+    @mock.patch('ceres.function.installed_package.execute_shell_command')
     def test_get_installed_package_should_return_installed_packages_when_execute_command_successfully(
         self, mock_execute_shell_command
     ):
         mock_shell_stdout = (
-            "Source RPM: perl-Encode-Locale-1.05-12.oe1.src.rpm\n"
-            "Source RPM: glib-networking-2.58.0-7.oe1.src.rpm\n"
-            "Source RPM: dnf-4.2.15-8.oe1.src.rpm"
+            "perl-Encode-Locale:perl-Encode-Locale-1.05-12.oe1.noarch:perl-Encode-Locale-1.05-12.oe1.src.rpm\n"
+            "glib-networking:glib-networking-2.58.0-7.oe1.x86_64:glib-networking-2.58.0-7.oe1.src.rpm\n"
+            "dnf:dnf-4.2.15-8.oe1.noarch:dnf-4.2.15-8.oe1.src.rpm"
         )
         mock_execute_shell_command.return_value = CommandExitCode.SUCCEED, mock_shell_stdout, ""
         expected_result = [
@@ -378,9 +391,10 @@ class TestCollectManage(unittest.TestCase):
             {"name": "glib-networking", "version": "2.58.0-7"},
             {"name": "dnf", "version": "4.2.15-8"},
         ]
-        self.assertEqual(expected_result, Collect.get_installed_packages())
+        self.assertEqual(expected_result, Collect.get_installed_packages(kernel=False))
 
-    @mock.patch('ceres.manages.collect_manage.execute_shell_command')
+    @mock.patch('ceres.function.installed_package.rpm', None)
+    @mock.patch('ceres.function.installed_package.execute_shell_command')
     def test_get_installed_package_should_return_empty_list_when_execute_command_failed(
         self, mock_execute_shell_command
     ):
@@ -417,6 +431,32 @@ class TestCollectManage(unittest.TestCase):
         expected_result = {"disk": disk_info, "os": os_info}
         self.assertEqual(expected_result, Collect().get_host_info(['os', 'disk']))
 
+    @mock.patch.object(Collect, "_get_os_info")
+    @mock.patch.object(Collect, "_get_disk_info")
+    def test_get_host_info_should_return_partial_host_info_when_one_collector_failed(
+        self, mock_disk_info, mock_os_info
+    ):
+        os_info = {
+            "os_version": "mock_os_version",
+            "bios_version": "mock_bios_version",
+            "kernel": "mock_kernel_version",
+        }
+        mock_os_info.return_value = os_info
+        mock_disk_info.side_effect = ET.ParseError()
+        expected_result = {"disk": None, "os": os_info}
+        self.assertEqual(expected_result, Collect().get_host_info(['os', 'disk']))
+
+    @mock.patch("ceres.manages.collect_manage.HOST_COLLECT_INFO_TIMEOUT", 0.1)
+    @mock.patch.object(Collect, "_get_os_info")
+    @mock.patch.object(Collect, "_get_disk_info")
+    def test_get_host_info_should_return_partial_host_info_when_one_collector_timed_out(
+        self, mock_disk_info, mock_os_info
+    ):
+        mock_os_info.return_value = {}
+        mock_disk_info.side_effect = lambda: time.sleep(1)
+        expected_result = {"disk": None, "os": {}}
+        self.assertEqual(expected_result, Collect().get_host_info(['os', 'disk']))
+
     @mock.patch('ceres.manages.collect_manage.execute_shell_command')
     def test_get_disk_info_should_return_disk_info_when_shell_command_execute_succeed_and_only_contain_description(
         self, mock_execute_shell_command
@@ -576,3 +616,204 @@ class TestCollectManage(unittest.TestCase):
         mock_execute_shell_command.return_value = CommandExitCode.SUCCEED, mock_cmd_output, ""
         mock_parse_xml.side_effect = ET.ParseError
         self.assertEqual([], Collect()._get_disk_info())
+
+
+class TestHostFactReader(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def patch_path(self, attribute, relative_path):
+        patcher = mock.patch.object(HostFactReader, attribute, os.path.join(self.tmp_dir.name, relative_path))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def write_file(self, relative_path, content):
+        file_path = os.path.join(self.tmp_dir.name, relative_path)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, "w", encoding="utf-8") as file:
+            file.write(content)
+
+    def test_get_cpu_info_should_return_cpu_info_when_proc_and_sys_files_exist(self):
+        self.write_file("cpuinfo", "processor\t: 0\nvendor_id\t: AuthenticAMD\nmodel name\t: AMD Test\n\n")
+        self.write_file("cpu/present", "0-1\n")
+        for cpu, shared_cpu_map in (("cpu0", "1"), ("cpu1", "2")):
+            for index, level, cache_type, size, shared in (
+                ("index0", "1", "Data", "32K", shared_cpu_map),
+                ("index1", "1", "Instruction", "32K", shared_cpu_map),
+                ("index2", "2", "Unified", "512K", shared_cpu_map),
+                ("index3", "3", "Unified", "8192K", "3"),
+            ):
+                cache_path = os.path.join("cpu", cpu, "cache", index)
+                self.write_file(os.path.join(cache_path, "level"), level)
+                self.write_file(os.path.join(cache_path, "type"), cache_type)
+                self.write_file(os.path.join(cache_path, "size"), size)
+                self.write_file(os.path.join(cache_path, "shared_cpu_map"), shared)
+
+        self.patch_path("CPUINFO_PATH", "cpuinfo")
+        self.patch_path("CPU_SYS_PATH", "cpu")
+        with mock.patch.object(platform, "machine", return_value="x86_64"):
+            res = HostFactReader.get_cpu_info()
+
+        expect_res = {
+            "architecture": "x86_64",
+            "core_count": "2",
+            "model_name": "AMD Test",
+            "vendor_id": "AuthenticAMD",
+            "l1d_cache": "64 KiB",
+            "l1i_cache": "64 KiB",
+            "l2_cache": "1 MiB",
+            "l3_cache": "8 MiB",
+        }
+        self.assertEqual(expect_res, res)
+
+    def test_get_cpu_info_should_return_none_when_model_name_is_not_in_cpuinfo(self):
+        self.write_file("cpuinfo", "processor\t: 0\nCPU implementer\t: 0x48\nCPU part\t: 0xd01\n")
+        self.write_file("cpu/present", "0\n")
+        self.patch_path("CPUINFO_PATH", "cpuinfo")
+        self.patch_path("CPU_SYS_PATH", "cpu")
+        self.assertIsNone(HostFactReader.get_cpu_info())
+
+    def test_get_total_online_memory_should_return_online_memory_size_when_sys_files_exist(self):
+        self.write_file("memory/block_size_bytes", "8000000\n")
+        for block, state in (("memory0", "online"), ("memory1", "online"), ("memory2", "offline")):
+            self.write_file(os.path.join("memory", block, "state"), state)
+        self.patch_path("MEMORY_SYS_PATH", "memory")
+        self.assertEqual("256M", HostFactReader.get_total_online_memory())
+
+    def test_get_total_online_memory_should_return_none_when_sys_files_not_exist(self):
+        self.patch_path("MEMORY_SYS_PATH", "memory")
+        self.assertIsNone(HostFactReader.get_total_online_memory())
+
+    def test_get_uuid_should_return_uuid_in_dmidecode_format_when_product_uuid_is_readable(self):
+        self.write_file("dmi/product_uuid", "4c4c4544-0042-3510-8057-b4c04f384d32\n")
+        self.patch_path("DMI_ID_PATH", "dmi")
+        self.assertEqual("4C4C4544004235108057B4C04F384D32", Collect._read_uuid())
+
+    @mock.patch("ceres.manages.collect_manage.execute_shell_command")
+    def test_get_uuid_should_query_by_dmidecode_with_timeout_when_product_uuid_is_not_readable(
+        self, mock_execute_shell_command
+    ):
+        self.patch_path("DMI_ID_PATH", "dmi")
+        mock_execute_shell_command.return_value = CommandExitCode.SUCCEED, "4c4c4544-0042-3510-8057-b4c04f384d32", ""
+        self.assertEqual("4c4c4544004235108057b4c04f384d32", Collect._read_uuid())
+        mock_execute_shell_command.assert_called_once_with(
+            ["dmidecode -s system-uuid"], timeout=HOST_COLLECT_INFO_TIMEOUT
+        )
+
+    def test_format_size_should_return_size_string_in_util_linux_format(self):
+        self.assertEqual("2.5G", HostFactReader.format_size(2684354560))
+        self.assertEqual("32 KiB", HostFactReader.format_size(32768, binary_suffix=True))
+
+
+class TestCollectFiles(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.cache_path = os.path.join(self.tmp_dir.name, "ceres", "file_fingerprint_cache.json")
+        cache_patcher = mock.patch(
+            "ceres.manages.collect_manage.FILE_FINGERPRINT_CACHE", FileFingerprintCache(self.cache_path)
+        )
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
+        racy_patcher = mock.patch.object(FileFingerprintCache, "RACY_INTERVAL_NS", 0)
+        racy_patcher.start()
+        self.addCleanup(racy_patcher.stop)
+
+    def write_file(self, name, content, mode=0o644):
+        file_path = os.path.join(self.tmp_dir.name, name)
+        with open(file_path, "w", encoding="utf-8") as file:
+            file.write(content)
+        os.chmod(file_path, mode)
+        return file_path
+
+    def test_collect_files_should_return_content_and_sha256_when_files_are_readable_text_files(self):
+        file_path = self.write_file("hosts", "127.0.0.1 localhost\n")
+        res = Collect.collect_files([file_path])
+        self.assertEqual([file_path], res["success_files"])
+        self.assertEqual("127.0.0.1 localhost\n", res["infos"][0]["content"])
+        self.assertEqual(hashlib.sha256(b"127.0.0.1 localhost\n").hexdigest(), res["infos"][0]["sha256"])
+        self.assertEqual("0644", res["infos"][0]["file_attr"]["mode"])
+
+    def test_collect_files_should_not_return_content_when_file_hash_is_unchanged(self):
+        unchanged_file = self.write_file("hosts", "127.0.0.1 localhost\n")
+        changed_file = self.write_file("sshd_config", "PermitRootLogin no\n")
+        file_hashes = {
+            unchanged_file: hashlib.sha256(b"127.0.0.1 localhost\n").hexdigest(),
+            changed_file: hashlib.sha256(b"PermitRootLogin yes\n").hexdigest(),
+        }
+        res = Collect.collect_files([unchanged_file, changed_file], file_hashes)
+        self.assertEqual([unchanged_file], res["unchanged_files"])
+        self.assertNotIn("content", res["infos"][0])
+        self.assertEqual("PermitRootLogin no\n", res["infos"][1]["content"])
+
+    def test_collect_files_should_fail_file_when_it_is_directory_or_executable_or_not_exists(self):
+        executable_file = self.write_file("run.sh", "#!/bin/sh\n", mode=0o755)
+        file_list = [self.tmp_dir.name, executable_file, os.path.join(self.tmp_dir.name, "not_exist")]
+        res = Collect.collect_files(file_list)
+        self.assertEqual(file_list, res["fail_files"])
+        self.assertEqual([], res["infos"])
+
+    def test_collect_files_should_not_read_file_when_it_is_unchanged_since_cached(self):
+        file_path = self.write_file("hosts", "127.0.0.1 localhost\n")
+        file_hash = hashlib.sha256(b"127.0.0.1 localhost\n").hexdigest()
+        Collect.collect_files([file_path])
+        self.assertTrue(os.path.exists(self.cache_path))
+
+        with mock.patch("ceres.manages.collect_manage.FILE_FINGERPRINT_CACHE", FileFingerprintCache(self.cache_path)):
+            with mock.patch.object(Collect, "_read_file_info") as mock_read_file_info:
+                res = Collect.collect_files([file_path], {file_path: file_hash})
+        mock_read_file_info.assert_not_called()
+        self.assertEqual([file_path], res["unchanged_files"])
+        self.assertEqual(
+            [{"path": file_path, "file_attr": Collect._get_file_attr(os.stat(file_path)), "sha256": file_hash}],
+            res["infos"],
+        )
+
+    def test_collect_files_should_read_file_again_when_it_is_changed_since_cached(self):
+        file_path = self.write_file("hosts", "127.0.0.1 localhost\n")
+        file_hash = hashlib.sha256(b"127.0.0.1 localhost\n").hexdigest()
+        Collect.collect_files([file_path])
+        self.write_file("hosts", "127.0.0.1 localhost\n::1 localhost\n")
+
+        res = Collect.collect_files([file_path], {file_path: file_hash})
+        self.assertEqual([], res["unchanged_files"])
+        self.assertEqual("127.0.0.1 localhost\n::1 localhost\n", res["infos"][0]["content"])
+
+    def test_collect_files_should_not_cache_file_when_it_is_just_modified(self):
+        file_path = self.write_file("hosts", "127.0.0.1 localhost\n")
+        with mock.patch.object(FileFingerprintCache, "RACY_INTERVAL_NS", 3600 * 10**9):
+            Collect.collect_files([file_path])
+        self.assertFalse(os.path.exists(self.cache_path))
+
+
+class TestHostFactCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.cache_path = os.path.join(self.tmp_dir.name, "ceres", "host_fact_cache.json")
+        identity_patcher = mock.patch.object(
+            HostFactCache, "_get_host_identity", return_value={"boot_id": "mock_boot_id", "kernel": "mock_kernel"}
+        )
+        self.mock_identity = identity_patcher.start()
+        self.addCleanup(identity_patcher.stop)
+
+    def test_get_should_return_cached_fact_when_fact_is_not_expired(self):
+        HostFactCache(self.cache_path).get("bios_version", lambda: "1.16.0")
+        getter = mock.Mock(return_value="1.17.0")
+        self.assertEqual("1.16.0", HostFactCache(self.cache_path).get("bios_version", getter))
+        getter.assert_not_called()
+
+    def test_get_should_get_fact_again_when_boot_id_changed(self):
+        HostFactCache(self.cache_path).get("bios_version", lambda: "1.16.0")
+        self.mock_identity.return_value = {"boot_id": "new_boot_id", "kernel": "mock_kernel"}
+        self.assertEqual("1.17.0", HostFactCache(self.cache_path).get("bios_version", lambda: "1.17.0"))
+
+    @mock.patch.dict("ceres.manages.collect_manage.HOST_FACT_CACHE_TTL", {"bios_version": 0})
+    def test_get_should_get_fact_again_when_fact_is_expired(self):
+        HostFactCache(self.cache_path).get("bios_version", lambda: "1.16.0")
+        self.assertEqual("1.17.0", HostFactCache(self.cache_path).get("bios_version", lambda: "1.17.0"))
+
+    def test_get_should_not_cache_fact_when_fact_is_invalid(self):
+        HostFactCache(self.cache_path).get("bios_version", lambda: "")
+        self.assertEqual("1.17.0", HostFactCache(self.cache_path).get("bios_version", lambda: "1.17.0"))
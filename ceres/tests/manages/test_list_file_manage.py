@@ -0,0 +1,83 @@
+#!/usr/bin/python3
+# ******************************************************************************
+# Copyright (c) Huawei Technologies Co., Ltd. 2024-2024. All rights reserved.
+# licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN 'AS IS' BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# ******************************************************************************/
+import hashlib
+import os
+import tempfile
+import unittest
+
+from ceres.function.status import FILE_NOT_FOUND, PARAM_ERROR, SUCCESS
+from ceres.manages.list_file_manage import ListFileManage
+
+
+class TestListFiles(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.root = self.tmp_dir.name
+        for relative_path in ("a.conf", "b.txt", "pam.d/sshd", "ssh/sshd_config", "ssh/sshd_config.d/50.conf"):
+            file_path = os.path.join(self.root, relative_path)
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            with open(file_path, "w", encoding="utf-8") as file:
+                file.write(relative_path)
+        os.chmod(os.path.join(self.root, "a.conf"), 0o600)
+
+    def get_relative_paths(self, file_infos):
+        return [os.path.relpath(file_info["path"], self.root) for file_info in file_infos]
+
+    def test_list_files_should_only_list_entries_of_directory_when_depth_is_default(self):
+        status, res = ListFileManage.list_files({"directory_path": self.root})
+        self.assertEqual(SUCCESS, status)
+        self.assertEqual(["a.conf", "b.txt", "pam.d", "ssh"], self.get_relative_paths(res["resp"]))
+        self.assertIsNone(res["next_offset"])
+        self.assertEqual("file", res["resp"][0]["type"])
+        self.assertEqual(len("a.conf"), res["resp"][0]["size"])
+        self.assertEqual("0600", res["resp"][0]["file_attr"]["mode"])
+        self.assertEqual("directory", res["resp"][2]["type"])
+        self.assertNotIn("sha256", res["resp"][0])
+
+    def test_list_files_should_list_matched_files_recursively_when_depth_and_patterns_are_given(self):
+        config = {"directory_path": self.root, "max_depth": 3, "patterns": ["*.conf", "pam.d/*"], "with_hash": True}
+        status, res = ListFileManage.list_files(config)
+        self.assertEqual(SUCCESS, status)
+        self.assertEqual(["a.conf", "pam.d/sshd", "ssh/sshd_config.d/50.conf"], self.get_relative_paths(res["resp"]))
+        self.assertEqual(hashlib.sha256(b"a.conf").hexdigest(), res["resp"][0]["sha256"])
+
+    def test_list_files_should_stop_at_depth_limit(self):
+        status, res = ListFileManage.list_files({"directory_path": self.root, "max_depth": 2, "patterns": ["*.conf"]})
+        self.assertEqual(SUCCESS, status)
+        self.assertEqual(["a.conf"], self.get_relative_paths(res["resp"]))
+
+    def test_list_files_should_return_files_page_by_page_when_limit_is_given(self):
+        config = {"directory_path": self.root, "max_depth": 3, "offset": 0, "limit": 4}
+        pages = []
+        while config["offset"] is not None:
+            status, res = ListFileManage.list_files(config)
+            self.assertEqual(SUCCESS, status)
+            pages.append(self.get_relative_paths(res["resp"]))
+            config["offset"] = res["next_offset"]
+        self.assertEqual(
+            [
+                ["a.conf", "b.txt", "pam.d", "ssh"],
+                ["pam.d/sshd", "ssh/sshd_config", "ssh/sshd_config.d", "ssh/sshd_config.d/50.conf"],
+            ],
+            pages,
+        )
+
+    def test_list_files_should_return_error_when_path_is_not_directory(self):
+        self.assertEqual(FILE_NOT_FOUND, ListFileManage.list_files({"directory_path": "/not/exist"})[0])
+        config = {"directory_path": os.path.join(self.root, "a.conf")}
+        self.assertEqual(PARAM_ERROR, ListFileManage.list_files(config)[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+#!/usr/bin/python3
+# ******************************************************************************
+# Copyright (c) Huawei Technologies Co., Ltd. 2024-2024. All rights reserved.
+# licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN 'AS IS' BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# ******************************************************************************/
+import difflib
+import hashlib
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from ceres.function.status import (
+    CONF_BASE_CHANGED,
+    CONF_ROLLED_BACK,
+    PARAM_ERROR,
+    PARTIAL_SUCCEED,
+    SUCCESS,
+    UNKNOWN_ERROR,
+)
+from ceres.manages.sync_manage import SyncManage
+
+OLD_CONTENT = "Port 22\nPermitRootLogin yes\nPasswordAuthentication yes\nUseDNS no\n"
+NEW_CONTENT = "Port 22\nPermitRootLogin no\nPasswordAuthentication yes\nUseDNS no\nMaxAuthTries 3"
+
+
+def sha256(content):
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def unified_diff(old_content, new_content):
+    diff = "".join(
+        line if line.endswith("\n") else line + "\n\\ No newline at end of file\n"
+        for line in difflib.unified_diff(
+            old_content.splitlines(keepends=True), new_content.splitlines(keepends=True), "a/conf", "b/conf", n=1
+        )
+    )
+    return diff
+
+
+class TestSyncManage(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.file_path = os.path.join(self.tmp_dir.name, "sshd_config")
+        with open(self.file_path, "w", encoding="utf-8") as file:
+            file.write(OLD_CONTENT)
+        os.chmod(self.file_path, 0o600)
+
+    def read_conf(self):
+        with open(self.file_path, "r", encoding="utf-8", newline="") as file:
+            return file.read()
+
+    def test_sync_contents_to_conf_should_write_full_content_and_keep_file_mode(self):
+        res = SyncManage.sync_contents_to_conf({"file_path": self.file_path, "content": NEW_CONTENT})
+        self.assertEqual(SUCCESS, res)
+        self.assertEqual(NEW_CONTENT, self.read_conf())
+        self.assertEqual(0o600, os.stat(self.file_path).st_mode & 0o777)
+        self.assertEqual(["sshd_config"], os.listdir(self.tmp_dir.name))
+
+    def test_sync_contents_to_conf_should_apply_diff_when_conf_is_base_of_diff(self):
+        config = {
+            "file_path": self.file_path,
+            "base_hash": sha256(OLD_CONTENT),
+            "diff": unified_diff(OLD_CONTENT, NEW_CONTENT),
+            "target_hash": sha256(NEW_CONTENT),
+        }
+        self.assertEqual(SUCCESS, SyncManage.sync_contents_to_conf(config))
+        self.assertEqual(NEW_CONTENT, self.read_conf())
+
+    def test_sync_contents_to_conf_should_return_base_changed_when_conf_is_not_base_of_diff(self):
+        config = {
+            "file_path": self.file_path,
+            "base_hash": sha256("Port 2222\n"),
+            "diff": unified_diff(OLD_CONTENT, NEW_CONTENT),
+        }
+        self.assertEqual(CONF_BASE_CHANGED, SyncManage.sync_contents_to_conf(config))
+        self.assertEqual(OLD_CONTENT, self.read_conf())
+
+    def test_sync_contents_to_conf_should_write_full_content_when_conf_is_not_base_of_diff_and_content_given(self):
+        config = {
+            "file_path": self.file_path,
+            "base_hash": sha256("Port 2222\n"),
+            "diff": unified_diff(OLD_CONTENT, NEW_CONTENT),
+            "content": NEW_CONTENT,
+        }
+        self.assertEqual(SUCCESS, SyncManage.sync_contents_to_conf(config))
+        self.assertEqual(NEW_CONTENT, self.read_conf())
+
+    def test_apply_unified_diff_should_raise_value_error_when_context_does_not_match(self):
+        with self.assertRaises(ValueError):
+            SyncManage._apply_unified_diff("Port 2222\n", unified_diff("Port 22\n", "Port 23\n"))
+
+    def test_batch_sync_contents_to_conf_should_write_all_confs_when_all_confs_are_synced(self):
+        new_file_path = os.path.join(self.tmp_dir.name, "ssh_config")
+        batch_config = {
+            "configs": [
+                {"file_path": self.file_path, "content": NEW_CONTENT},
+                {"file_path": new_file_path, "content": OLD_CONTENT},
+            ],
+            "rollback": True,
+        }
+        status, res = SyncManage.batch_sync_contents_to_conf(batch_config)
+        self.assertEqual(SUCCESS, status)
+        self.assertEqual([SUCCESS, SUCCESS], [config["status"] for config in res["configs"]])
+        self.assertEqual(NEW_CONTENT, self.read_conf())
+        with open(new_file_path, "r", encoding="utf-8") as file:
+            self.assertEqual(OLD_CONTENT, file.read())
+        self.assertEqual(["ssh_config", "sshd_config"], sorted(os.listdir(self.tmp_dir.name)))
+
+    def test_batch_sync_contents_to_conf_should_restore_all_confs_when_rollback_and_replace_failed(self):
+        new_file_path = os.path.join(self.tmp_dir.name, "ssh_config")
+        batch_config = {
+            "configs": [
+                {"file_path": self.file_path, "content": NEW_CONTENT},
+                {"file_path": new_file_path, "content": OLD_CONTENT},
+            ],
+            "rollback": True,
+        }
+        replace = os.replace
+
+        def replace_side_effect(src, dst):
+            if dst == new_file_path:
+                raise PermissionError("Permission denied")
+            return replace(src, dst)
+
+        with mock.patch("ceres.manages.sync_manage.os.replace", side_effect=replace_side_effect):
+            status, res = SyncManage.batch_sync_contents_to_conf(batch_config)
+        self.assertEqual([CONF_ROLLED_BACK, UNKNOWN_ERROR], [config["status"] for config in res["configs"]])
+        self.assertEqual(OLD_CONTENT, self.read_conf())
+        self.assertEqual(["sshd_config"], os.listdir(self.tmp_dir.name))
+
+    def test_batch_sync_contents_to_conf_should_write_synced_confs_when_not_rollback_and_some_confs_failed(self):
+        batch_config = {
+            "configs": [
+                {"file_path": self.file_path, "content": NEW_CONTENT},
+                {
+                    "file_path": os.path.join(self.tmp_dir.name, "ssh_config"),
+                    "base_hash": sha256("Port 2222\n"),
+                    "diff": unified_diff(OLD_CONTENT, NEW_CONTENT),
+                },
+            ]
+        }
+        status, res = SyncManage.batch_sync_contents_to_conf(batch_config)
+        self.assertEqual(PARTIAL_SUCCEED, status)
+        self.assertEqual([SUCCESS, CONF_BASE_CHANGED], [config["status"] for config in res["configs"]])
+        self.assertEqual(NEW_CONTENT, self.read_conf())
+
+    def test_batch_sync_contents_to_conf_should_return_param_error_when_conf_is_synced_twice(self):
+        batch_config = {
+            "configs": [
+                {"file_path": self.file_path, "content": NEW_CONTENT},
+                {"file_path": os.path.join(self.tmp_dir.name, ".", "sshd_config"), "content": OLD_CONTENT},
+            ]
+        }
+        status, _ = SyncManage.batch_sync_contents_to_conf(batch_config)
+        self.assertEqual(PARAM_ERROR, status)
+        self.assertEqual(OLD_CONTENT, self.read_conf())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,190 @@
+#!/usr/bin/python3
+# ******************************************************************************
+# Copyright (c) Huawei Technologies Co., Ltd. 2024-2024. All rights reserved.
+# licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN 'AS IS' BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# ******************************************************************************/
+import os
+import tempfile
+import unittest
+from collections import defaultdict
+from unittest import mock
+
+from ceres.conf.constant import CommandExitCode, TaskExecuteRes
+from ceres.function.installed_package import InstalledPackage, InstalledPackages
+from ceres.function.status import SUCCESS
+from ceres.manages.vulnerability_manage.fix_cve_manage import CveFixManage
+from ceres.manages.vulnerability_manage.scan_cve_vulnerability import CveScanCache
+
+MOCK_RPMS = ["unzip-6.0-50.oe2203.x86_64", "vim-common-9.0-15.oe2203.x86_64"]
+
+MOCK_RESOLVE_STDOUT = """Last metadata expiration check: 0:31:50 ago on Mon 07 Aug 2023 10:26:32 AM CST.
+Dependencies resolved.
+================================================================================
+ Package          Architecture   Version              Repository          Size
+================================================================================
+Upgrading:
+ unzip            x86_64         6.0-50.oe2203        update             157 k
+ vim-common       x86_64         9.0-15.oe2203        update             6.4 M
+
+Transaction Summary
+================================================================================
+Upgrade  2 Packages
+"""
+
+
+class TestCveFixManage(unittest.TestCase):
+    @mock.patch("ceres.manages.vulnerability_manage.fix_cve_manage.execute_shell_command")
+    def test_query_upgraded_packages_should_resolve_all_packages_in_one_command(self, mock_execute_shell_command):
+        mock_execute_shell_command.return_value = CommandExitCode.FAIL, MOCK_RESOLVE_STDOUT, ""
+        res = CveFixManage._query_upgraded_packages(MOCK_RPMS + ["kernel-5.10.0-60.91.0.115.oe2203.x86_64"])
+        self.assertEqual(set(MOCK_RPMS + ["kernel-5.10.0-60.91.0.115.oe2203.x86_64"]), res)
+        mock_execute_shell_command.assert_called_once_with(
+            ["dnf upgrade-en unzip-6.0-50.oe2203.x86_64 vim-common-9.0-15.oe2203.x86_64 --assumeno"]
+        )
+
+    @mock.patch("ceres.manages.vulnerability_manage.fix_cve_manage.execute_shell_command")
+    @mock.patch.object(CveFixManage, "_query_fixed_cve_info_by_hotpatch", return_value=(SUCCESS, {}))
+    @mock.patch.object(CveFixManage, "_query_fixable_cve_info", return_value=(SUCCESS, {}))
+    def test_update_coldpatch_by_dnf_plugin_should_upgrade_all_packages_in_one_transaction_when_compare_succeed(
+        self, mock_fixable, mock_fixed, mock_execute_shell_command
+    ):
+        mock_execute_shell_command.side_effect = [
+            (CommandExitCode.FAIL, MOCK_RESOLVE_STDOUT, ""),
+            (CommandExitCode.SUCCEED, "Complete!", ""),
+        ]
+        status, res = CveFixManage()._update_coldpatch_by_dnf_plugin(MOCK_RPMS)
+        self.assertEqual(TaskExecuteRes.SUCCEED, status)
+        self.assertEqual(
+            [{"available_rpm": rpm, "result": TaskExecuteRes.SUCCEED, "log": "Complete!"} for rpm in MOCK_RPMS], res
+        )
+        self.assertEqual(2, mock_execute_shell_command.call_count)
+
+    @mock.patch.object(InstalledPackages, "query")
+    @mock.patch("ceres.manages.vulnerability_manage.fix_cve_manage.execute_shell_command")
+    def test_update_coldpatch_in_batch_should_only_retry_packages_not_upgraded_when_transaction_failed(
+        self, mock_execute_shell_command, mock_query
+    ):
+        mock_query.return_value = InstalledPackages(
+            [InstalledPackage("unzip", "unzip-6.0-50.oe2203.x86_64", "unzip-6.0-50.oe2203.src.rpm")]
+        )
+        mock_execute_shell_command.side_effect = [
+            (CommandExitCode.FAIL, "", "Error: Transaction test error"),
+            (CommandExitCode.FAIL, "", "Error: file conflicts"),
+        ]
+        res = CveFixManage()._update_coldpatch_in_batch(MOCK_RPMS)
+        self.assertEqual(
+            {
+                "unzip-6.0-50.oe2203.x86_64": (TaskExecuteRes.SUCCEED, "Error: Transaction test error"),
+                "vim-common-9.0-15.oe2203.x86_64": (TaskExecuteRes.FAIL, "Error: file conflicts"),
+            },
+            res,
+        )
+        mock_execute_shell_command.assert_called_with(["dnf upgrade-en vim-common-9.0-15.oe2203.x86_64 -y"])
+
+    @mock.patch("ceres.manages.vulnerability_manage.fix_cve_manage.execute_shell_command")
+    def test_update_hotpatch_in_batch_should_return_status_of_each_hotpatch_when_some_hotpatch_apply_failed(
+        self, mock_execute_shell_command
+    ):
+        stdout = (
+            "Apply hot patch succeed: redis-6.2.5-1/ACC-1-1.\n"
+            "Apply hot patch failed: kernel-5.10.0-153.12.0.92.oe2203sp2/ACC-1-1.\n"
+            "Accept hot patch succeed: redis-6.2.5-1/ACC-1-1.\n"
+        )
+        mock_execute_shell_command.return_value = CommandExitCode.FAIL, stdout, ""
+        rpms = ["patch-redis-6.2.5-1-ACC-1-1.x86_64", "patch-kernel-5.10.0-153.12.0.92.oe2203sp2-ACC-1-1.x86_64"]
+        status, res, upgrade_count = CveFixManage._update_hotpatch_in_batch(rpms, True)
+        self.assertEqual(TaskExecuteRes.FAIL, status)
+        self.assertEqual([TaskExecuteRes.SUCCEED, TaskExecuteRes.FAIL], [rpm_info["result"] for rpm_info in res])
+        self.assertEqual(1, upgrade_count)
+        mock_execute_shell_command.assert_called_once_with([f"dnf hotupgrade {' '.join(rpms)} -y --accept"])
+
+    @mock.patch("ceres.manages.vulnerability_manage.fix_cve_manage.execute_shell_command")
+    def test_update_hotpatch_in_batch_should_return_none_when_plugin_can_not_accept_hotpatch_in_hotupgrade(
+        self, mock_execute_shell_command
+    ):
+        mock_execute_shell_command.return_value = (
+            CommandExitCode.FAIL,
+            "",
+            "Command line error: unrecognized arguments: --accept",
+        )
+        self.assertIsNone(CveFixManage._update_hotpatch_in_batch(["patch-redis-6.2.5-1-ACC-1-1.x86_64"], True))
+
+
+class TestCveFixPlan(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.rpmdb_fingerprint = "cookie:2e5ef71ba8e1d7d1f4f5e2fa4c6a6d0ef8e6a90c"
+        self.syscare_fingerprint = "7d793037a0760186574b0282f2f435e7"
+        for patcher in (
+            mock.patch(
+                "ceres.manages.vulnerability_manage.fix_cve_manage.CVE_FIX_PLAN_PATH",
+                os.path.join(self.tmp_dir.name, "fix_plan"),
+            ),
+            mock.patch.object(InstalledPackages, "get_rpmdb_fingerprint", side_effect=lambda: self.rpmdb_fingerprint),
+            mock.patch.object(CveScanCache, "get_repos_fingerprint", return_value="5d41402abc4b2a76b9719d911017c592"),
+            mock.patch.object(CveScanCache, "get_syscare_fingerprint", side_effect=lambda: self.syscare_fingerprint),
+            mock.patch(
+                "ceres.manages.vulnerability_manage.fix_cve_manage.PreCheck.execute_check", return_value=(True, [])
+            ),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.task_info = {
+            "fix_type": "coldpatch",
+            "check_items": [],
+            "rpms": [{"installed_rpm": "unzip-6.0-49.oe2203.x86_64", "available_rpm": rpm} for rpm in MOCK_RPMS],
+            "accepted": False,
+        }
+
+    @mock.patch("ceres.manages.vulnerability_manage.fix_cve_manage.execute_shell_command")
+    @mock.patch.object(CveFixManage, "_query_fixed_cve_info_by_hotpatch", return_value=(SUCCESS, {}))
+    @mock.patch.object(CveFixManage, "_query_fixable_cve_info")
+    def create_fix_plan(self, mock_fixable, mock_fixed, mock_execute_shell_command):
+        fixable_cve_info = defaultdict(lambda: defaultdict(list))
+        fixable_cve_info["unzip"]["unzip-6.0-50.oe2203.x86_64"] = ["CVE-2022-0529", "CVE-2022-0530"]
+        mock_fixable.return_value = SUCCESS, fixable_cve_info
+        mock_execute_shell_command.return_value = CommandExitCode.FAIL, MOCK_RESOLVE_STDOUT, ""
+        return CveFixManage().cve_fix_plan(self.task_info)
+
+    def test_cve_fix_plan_should_return_upgraded_packages_and_fixed_cves_when_resolve_succeed(self):
+        res = self.create_fix_plan()
+        self.assertEqual(TaskExecuteRes.SUCCEED, res["status"])
+        self.assertEqual(MOCK_RPMS, res["upgraded_packages"])
+        self.assertEqual({"unzip": ["CVE-2022-0529", "CVE-2022-0530"]}, res["fixed_cves"])
+        self.assertTrue(os.path.isfile(os.path.join(self.tmp_dir.name, "fix_plan", f"{res['plan_id']}.json")))
+
+    @mock.patch("ceres.manages.vulnerability_manage.fix_cve_manage.execute_shell_command")
+    @mock.patch.object(CveFixManage, "_query_fixable_cve_info")
+    def test_cve_fix_should_apply_fix_plan_without_resolving_again_when_plan_is_valid(
+        self, mock_fixable, mock_execute_shell_command
+    ):
+        plan_id = self.create_fix_plan()["plan_id"]
+        mock_execute_shell_command.return_value = CommandExitCode.SUCCEED, "Complete!", ""
+        res = CveFixManage().cve_fix(dict(self.task_info, plan_id=plan_id))
+        self.assertEqual(TaskExecuteRes.SUCCEED, res["status"])
+        mock_fixable.assert_not_called()
+        mock_execute_shell_command.assert_called_once_with([f"dnf upgrade-en {' '.join(MOCK_RPMS)} -y"])
+
+    def test_load_fix_plan_should_return_none_when_installed_packages_changed(self):
+        plan_id = self.create_fix_plan()["plan_id"]
+        self.rpmdb_fingerprint = "cookie:changed"
+        self.assertIsNone(CveFixManage()._load_fix_plan(plan_id, MOCK_RPMS))
+
+    def test_load_fix_plan_should_return_none_when_hotpatch_status_in_syscare_changed(self):
+        plan_id = self.create_fix_plan()["plan_id"]
+        self.syscare_fingerprint = "e4d909c290d0fb1ca068ffaddf22cbd0"
+        self.assertIsNone(CveFixManage()._load_fix_plan(plan_id, MOCK_RPMS))
+
+    @mock.patch("ceres.manages.vulnerability_manage.fix_cve_manage.os.replace", side_effect=OSError("No space left"))
+    def test_cve_fix_plan_should_not_return_plan_id_when_plan_can_not_be_saved(self, _):
+        res = self.create_fix_plan()
+        self.assertNotIn("plan_id", res)
+        self.assertEqual([], os.listdir(os.path.join(self.tmp_dir.name, "fix_plan")))
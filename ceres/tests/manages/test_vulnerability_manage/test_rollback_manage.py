@@ -0,0 +1,155 @@
+#!/usr/bin/python3
+# ******************************************************************************
+# Copyright (c) Huawei Technologies Co., Ltd. 2024-2024. All rights reserved.
+# licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN 'AS IS' BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# ******************************************************************************/
+import unittest
+from unittest import mock
+
+from ceres.conf.constant import CommandExitCode, TaskExecuteRes
+from ceres.function.boot_loader import BootLoader
+from ceres.function.dnf_history import DnfHistory
+from ceres.function.installed_package import InstalledPackage, InstalledPackages
+from ceres.manages.vulnerability_manage.rollback_manage import RollbackManage
+
+KERNEL_A = "kernel-5.10.0-60.18.0.50.oe2203.x86_64"
+KERNEL_B = "kernel-5.10.0-60.91.0.115.oe2203.x86_64"
+KERNEL_C = "kernel-5.10.0-60.92.0.116.oe2203.x86_64"
+
+
+def gen_hotpatch_task(task_id, dnf_event_start, dnf_event_end):
+    return {
+        "task_id": task_id,
+        "rollback_type": "hotpatch",
+        "installed_rpm": "patch-redis-6.2.5-1-ACC-1-1.x86_64",
+        "target_rpm": "redis-6.2.5-1.x86_64",
+        "dnf_event_start": dnf_event_start,
+        "dnf_event_end": dnf_event_end,
+    }
+
+
+def gen_coldpatch_task(task_id, installed_rpm, target_rpm):
+    return {
+        "task_id": task_id,
+        "rollback_type": "coldpatch",
+        "installed_rpm": installed_rpm,
+        "target_rpm": target_rpm,
+        "dnf_event_start": None,
+        "dnf_event_end": None,
+    }
+
+
+class TestBatchRollback(unittest.TestCase):
+    def setUp(self) -> None:
+        installed_packages = InstalledPackages(
+            InstalledPackage("kernel", kernel, f"{kernel.rsplit('.', 1)[0]}.src.rpm")
+            for kernel in (KERNEL_A, KERNEL_B, KERNEL_C)
+        )
+        self.rollback_manage = RollbackManage(installed_packages)
+        installed_kernels_patcher = mock.patch.object(
+            BootLoader,
+            "get_installed_kernels",
+            return_value=[kernel.split("-", 1)[1] for kernel in (KERNEL_A, KERNEL_B, KERNEL_C)],
+        )
+        self.mock_get_installed_kernels = installed_kernels_patcher.start()
+        self.addCleanup(installed_kernels_patcher.stop)
+
+    @mock.patch("ceres.manages.vulnerability_manage.rollback_manage.execute_shell_command")
+    @mock.patch.object(DnfHistory, "query_latest_transaction_id", return_value=5)
+    def test_batch_rollback_should_revert_contiguous_hotpatch_transactions_by_one_command(
+        self, mock_latest_id, mock_execute_shell_command
+    ):
+        mock_execute_shell_command.return_value = CommandExitCode.SUCCEED, "Complete!", ""
+        tasks = [gen_hotpatch_task("1", 1, 3), gen_hotpatch_task("2", 3, 5)]
+        res = self.rollback_manage.batch_rollback({"check_items": [], "tasks": tasks})
+        self.assertEqual(TaskExecuteRes.SUCCEED, res["status"])
+        mock_execute_shell_command.assert_called_once_with(["dnf history rollback 1 -y"])
+
+    @mock.patch("ceres.manages.vulnerability_manage.rollback_manage.execute_shell_command")
+    @mock.patch.object(DnfHistory, "query_latest_transaction_id", return_value=5)
+    def test_batch_rollback_should_fail_hotpatch_task_which_is_not_followed_by_the_others(
+        self, mock_latest_id, mock_execute_shell_command
+    ):
+        mock_execute_shell_command.return_value = CommandExitCode.SUCCEED, "Complete!", ""
+        tasks = [gen_hotpatch_task("1", 1, 2), gen_hotpatch_task("2", 3, 5)]
+        res = self.rollback_manage.batch_rollback({"check_items": [], "tasks": tasks})
+        self.assertEqual([TaskExecuteRes.FAIL, TaskExecuteRes.SUCCEED], [task["status"] for task in res["tasks"]])
+        mock_execute_shell_command.assert_called_once_with(["dnf history rollback 3 -y"])
+
+    @mock.patch.object(BootLoader, "set_default_kernel", return_value=True)
+    @mock.patch.object(BootLoader, "get_default_kernel", return_value=KERNEL_C.split("-", 1)[1])
+    @mock.patch("ceres.manages.vulnerability_manage.rollback_manage.platform.uname")
+    @mock.patch("ceres.manages.vulnerability_manage.rollback_manage.execute_shell_command")
+    def test_batch_rollback_should_remove_kernels_by_one_command_when_tasks_are_chained_from_boot_kernel(
+        self, mock_execute_shell_command, mock_uname, mock_get_default_kernel, mock_set_default_kernel
+    ):
+        mock_uname.return_value = mock.Mock(release=KERNEL_B.split("-", 1)[1])
+        mock_execute_shell_command.return_value = CommandExitCode.SUCCEED, "Complete!", ""
+        tasks = [gen_coldpatch_task("1", KERNEL_B, KERNEL_A), gen_coldpatch_task("2", KERNEL_C, KERNEL_B)]
+        res = self.rollback_manage.batch_rollback({"check_items": [], "tasks": tasks})
+        self.assertEqual(TaskExecuteRes.SUCCEED, res["status"])
+        self.assertIn(f"Preserve the {KERNEL_B} due to it is in use.", res["tasks"][0]["log"])
+        mock_execute_shell_command.assert_called_once_with([f"dnf remove {KERNEL_C} -y"])
+        mock_set_default_kernel.assert_called_once_with(KERNEL_A.split("-", 1)[1])
+
+    @mock.patch.object(BootLoader, "get_default_kernel", return_value=KERNEL_C.split("-", 1)[1])
+    @mock.patch("ceres.manages.vulnerability_manage.rollback_manage.platform.uname")
+    def test_batch_rollback_should_fail_coldpatch_task_when_its_kernel_is_not_boot_kernel(
+        self, mock_uname, mock_get_default_kernel
+    ):
+        mock_uname.return_value = mock.Mock(release=KERNEL_C.split("-", 1)[1])
+        res = self.rollback_manage.batch_rollback(
+            {"check_items": [], "tasks": [gen_coldpatch_task("1", KERNEL_B, KERNEL_A)]}
+        )
+        self.assertEqual(TaskExecuteRes.FAIL, res["status"])
+        self.assertIn("The default boot kernel version is not consistent", res["tasks"][0]["log"])
+
+    @mock.patch("ceres.manages.vulnerability_manage.rollback_manage.execute_shell_command")
+    @mock.patch.object(DnfHistory, "query_latest_transaction_id", return_value=5)
+    def test_batch_rollback_should_fail_hotpatch_task_with_explicit_log_when_its_range_is_duplicated(
+        self, mock_latest_id, mock_execute_shell_command
+    ):
+        mock_execute_shell_command.return_value = CommandExitCode.SUCCEED, "Complete!", ""
+        tasks = [gen_hotpatch_task("1", 3, 5), gen_hotpatch_task("2", 3, 5)]
+        res = self.rollback_manage.batch_rollback({"check_items": [], "tasks": tasks})
+        self.assertEqual([TaskExecuteRes.SUCCEED, TaskExecuteRes.FAIL], [task["status"] for task in res["tasks"]])
+        self.assertIn("is duplicated with task '1'", res["tasks"][1]["log"])
+        mock_execute_shell_command.assert_called_once_with(["dnf history rollback 3 -y"])
+
+    @mock.patch.object(BootLoader, "set_default_kernel", return_value=True)
+    @mock.patch.object(BootLoader, "get_default_kernel", return_value=KERNEL_C.split("-", 1)[1])
+    @mock.patch("ceres.manages.vulnerability_manage.rollback_manage.platform.uname")
+    @mock.patch("ceres.manages.vulnerability_manage.rollback_manage.execute_shell_command")
+    def test_batch_rollback_should_fail_coldpatch_task_with_explicit_log_when_its_kernel_is_duplicated(
+        self, mock_execute_shell_command, mock_uname, mock_get_default_kernel, mock_set_default_kernel
+    ):
+        mock_uname.return_value = mock.Mock(release=KERNEL_B.split("-", 1)[1])
+        mock_execute_shell_command.return_value = CommandExitCode.SUCCEED, "Complete!", ""
+        tasks = [gen_coldpatch_task("1", KERNEL_C, KERNEL_B), gen_coldpatch_task("2", KERNEL_C, KERNEL_A)]
+        res = self.rollback_manage.batch_rollback({"check_items": [], "tasks": tasks})
+        self.assertEqual([TaskExecuteRes.SUCCEED, TaskExecuteRes.FAIL], [task["status"] for task in res["tasks"]])
+        self.assertIn(f"The {KERNEL_C} is duplicated with task '1'", res["tasks"][1]["log"])
+        mock_execute_shell_command.assert_called_once_with([f"dnf remove {KERNEL_C} -y"])
+
+    @mock.patch.object(BootLoader, "set_default_kernel", return_value=True)
+    @mock.patch.object(BootLoader, "get_default_kernel", return_value=KERNEL_C.split("-", 1)[1])
+    @mock.patch("ceres.manages.vulnerability_manage.rollback_manage.platform.uname")
+    @mock.patch("ceres.manages.vulnerability_manage.rollback_manage.execute_shell_command")
+    def test_batch_rollback_should_not_remove_kernel_when_target_kernel_has_no_boot_entry(
+        self, mock_execute_shell_command, mock_uname, mock_get_default_kernel, mock_set_default_kernel
+    ):
+        mock_uname.return_value = mock.Mock(release=KERNEL_B.split("-", 1)[1])
+        self.mock_get_installed_kernels.return_value = [KERNEL_C.split("-", 1)[1]]
+        res = self.rollback_manage.batch_rollback(
+            {"check_items": [], "tasks": [gen_coldpatch_task("1", KERNEL_C, KERNEL_B)]}
+        )
+        self.assertEqual(TaskExecuteRes.FAIL, res["status"])
+        self.assertIn("The target kernel of rollback task is not installed.", res["tasks"][0]["log"])
+        mock_execute_shell_command.assert_not_called()
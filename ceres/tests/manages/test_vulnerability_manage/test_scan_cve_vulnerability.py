@@ -0,0 +1,117 @@
+#!/usr/bin/python3
+# ******************************************************************************
+# Copyright (c) Huawei Technologies Co., Ltd. 2024-2024. All rights reserved.
+# licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN 'AS IS' BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# ******************************************************************************/
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from ceres.function.status import SUCCESS
+from ceres.manages.vulnerability_manage.scan_cve_vulnerability import CveScanCache, CveScanManage
+
+MOCK_FINGERPRINT = {
+    "rpmdb": "cookie:2e5ef71ba8e1d7d1f4f5e2fa4c6a6d0ef8e6a90c",
+    "repos": "5d41402abc4b2a76b9719d911017c592",
+    "syscare": "",
+    "kernel": "5.10.0-60.18.0.50.oe2203.x86_64",
+    "kernel_filter": True,
+}
+MOCK_SCAN_RESULT = {
+    "unfixed_cves": [
+        {
+            "cve_id": "CVE-2023-1513",
+            "installed_rpm": "kernel-5.10.0-60.18.0.50.oe2203.x86_64",
+            "available_rpm": "kernel-5.10.0-60.91.0.115.oe2203.x86_64",
+            "support_way": "coldpatch",
+        }
+    ],
+    "fixed_cves": [],
+    "installed_packages": [{"name": "kernel", "version": "5.10.0-60.18.0.50.oe2203"}],
+}
+
+
+class TestCveScanCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.cache = CveScanCache(os.path.join(self.tmp_dir.name, "ceres", "cve_scan_cache.json"))
+
+    def test_load_should_return_saved_result_when_fingerprint_is_same(self):
+        self.cache.save(MOCK_FINGERPRINT, MOCK_SCAN_RESULT)
+        self.assertEqual(MOCK_SCAN_RESULT, self.cache.load(dict(MOCK_FINGERPRINT)))
+
+    def test_load_should_return_none_when_fingerprint_changed(self):
+        self.cache.save(MOCK_FINGERPRINT, MOCK_SCAN_RESULT)
+        self.assertIsNone(self.cache.load(dict(MOCK_FINGERPRINT, rpmdb="cookie:changed")))
+
+    @mock.patch("ceres.manages.vulnerability_manage.scan_cve_vulnerability.CVE_SCAN_CACHE_TTL", -1)
+    def test_load_should_return_none_when_saved_result_expired(self):
+        self.cache.save(MOCK_FINGERPRINT, MOCK_SCAN_RESULT)
+        self.assertIsNone(self.cache.load(MOCK_FINGERPRINT))
+
+    def test_get_repos_fingerprint_should_change_when_repomd_of_enabled_repo_changed(self):
+        repo_config_path = os.path.join(self.tmp_dir.name, "yum.repos.d")
+        repodata_path = os.path.join(self.tmp_dir.name, "dnf", "update-4fd3c1a0bc18d0a5", "repodata")
+        os.makedirs(repo_config_path)
+        os.makedirs(repodata_path)
+        with open(os.path.join(repo_config_path, "aops-update.repo"), "w") as file:
+            file.write("[update]\nname=update\nbaseurl=http://repo.openeuler.org/update\nenabled=1\n")
+
+        with mock.patch.object(CveScanCache, "REPO_CONFIG_PATH", repo_config_path), mock.patch.object(
+            CveScanCache, "DNF_CACHE_PATH", os.path.dirname(os.path.dirname(repodata_path))
+        ):
+            with open(os.path.join(repodata_path, "repomd.xml"), "w") as file:
+                file.write("<revision>1</revision>")
+            fingerprint = CveScanCache.get_repos_fingerprint()
+            with open(os.path.join(repodata_path, "repomd.xml"), "w") as file:
+                file.write("<revision>2</revision>")
+            self.assertNotEqual(fingerprint, CveScanCache.get_repos_fingerprint())
+
+
+class TestCveScanManage(unittest.TestCase):
+    @mock.patch("ceres.manages.vulnerability_manage.scan_cve_vulnerability.InstalledPackages.query")
+    @mock.patch.object(CveScanManage, "_scan_by_dnf_plugin")
+    @mock.patch.object(CveScanCache, "get_fingerprint", return_value=MOCK_FINGERPRINT)
+    @mock.patch.object(CveScanCache, "load", return_value=MOCK_SCAN_RESULT)
+    @mock.patch("ceres.manages.vulnerability_manage.scan_cve_vulnerability.PreCheck.execute_check")
+    def test_cve_scan_should_return_saved_result_without_querying_dnf_and_rpm_when_fingerprint_is_same(
+        self, mock_check, mock_load, mock_fingerprint, mock_scan, mock_query
+    ):
+        mock_check.return_value = True, []
+        code, result = CveScanManage(scan_cache=CveScanCache()).cve_scan({"check_items": [], "kernel": True})
+        self.assertEqual(SUCCESS, code)
+        self.assertEqual(dict(MOCK_SCAN_RESULT, check_items=[]), result)
+        mock_scan.assert_not_called()
+        mock_query.assert_not_called()
+
+    @mock.patch("ceres.manages.vulnerability_manage.scan_cve_vulnerability.Collect.get_installed_packages")
+    @mock.patch("ceres.manages.vulnerability_manage.scan_cve_vulnerability.Collect.get_current_kernel_version")
+    @mock.patch.object(CveScanManage, "_query_fixed_cves_by_dnf_plugin", return_value=[])
+    @mock.patch.object(CveScanManage, "_query_unfixed_cves_by_dnf_plugin")
+    @mock.patch.object(CveScanManage, "_query_installed_rpm", return_value={})
+    @mock.patch.object(CveScanManage, "_scan_by_dnf_plugin", return_value={"available": "", "installed": ""})
+    @mock.patch.object(CveScanCache, "save")
+    @mock.patch.object(CveScanCache, "get_fingerprint", return_value=MOCK_FINGERPRINT)
+    @mock.patch.object(CveScanCache, "load", return_value=None)
+    @mock.patch("ceres.manages.vulnerability_manage.scan_cve_vulnerability.PreCheck.execute_check")
+    def test_cve_scan_should_save_result_when_fingerprint_changed(
+        self, mock_check, mock_load, mock_fingerprint, mock_save, mock_scan, mock_rpm, mock_unfixed, mock_fixed,
+        mock_kernel_version, mock_installed_packages
+    ):
+        mock_check.return_value = True, []
+        mock_installed_packages.return_value = MOCK_SCAN_RESULT["installed_packages"]
+        mock_unfixed.return_value = MOCK_SCAN_RESULT["unfixed_cves"]
+        mock_kernel_version.return_value = "5.10.0-60.18.0.50.oe2203.x86_64"
+        code, result = CveScanManage(scan_cache=CveScanCache()).cve_scan({"check_items": [], "kernel": True})
+        self.assertEqual(SUCCESS, code)
+        self.assertEqual(dict(MOCK_SCAN_RESULT, check_items=[]), result)
+        mock_save.assert_called_once_with(MOCK_FINGERPRINT, MOCK_SCAN_RESULT)
@@ -82,6 +82,22 @@ class TestPluginCommand(unittest.TestCase):
         output = mock_stdout.getvalue().strip()
         self.assertEqual(output, json.dumps(file_info))
 
+    @mock.patch('sys.stdout', new_callable=StringIO)
+    @mock.patch.object(Collect, "collect_files")
+    def test_collect_files_content_should_collect_files_with_hashes_when_input_is_correct(
+        self, mock_files_collect, mock_stdout
+    ):
+        file_info = {"success_files": ["/etc/hosts"], "fail_files": [], "unchanged_files": ["/etc/hosts"], "infos": []}
+        mock_files_collect.return_value = file_info
+        file_hashes = {"/etc/hosts": "9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08"}
+        # Simulate command line parameters: "--files <args>"
+        namespace = self.command.parser.parse_args(
+            ["--files", json.dumps({"file_list": ["/etc/hosts"], "file_hashes": file_hashes})]
+        )
+        self.command.execute(namespace)
+        mock_files_collect.assert_called_once_with(["/etc/hosts"], file_hashes)
+        self.assertEqual(mock_stdout.getvalue().strip(), json.dumps(file_info))
+
     @mock.patch('sys.stdout', new_callable=StringIO)
     @mock.patch.object(Collect, "get_application_info")
     def test_collect_running_applications_handle_should_return_running_apps_when_all_is_correct(
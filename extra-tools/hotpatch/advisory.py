@@ -10,13 +10,35 @@
 # PURPOSE.
 # See the Mulan PSL v2 for more details.
 # ******************************************************************************/
+import sys
+
 from .hotpatch import Hotpatch
 
 
 class Advisory(object):
-    __slots__ = ['_id', '_adv_type', '_title', '_severity', '_description', '_updated', '_hotpatches', '_cves']
+    __slots__ = [
+        '_id',
+        '_adv_type',
+        '_title',
+        '_severity',
+        '_description',
+        '_description_loader',
+        '_updated',
+        '_hotpatches',
+        '_cves',
+    ]
 
-    def __init__(self, id, adv_type, title, severity, description, updated="1970-01-01 08:00:00", **kwargs):
+    def __init__(
+        self,
+        id,
+        adv_type,
+        title,
+        severity,
+        description=None,
+        updated="1970-01-01 08:00:00",
+        description_loader=None,
+        **kwargs
+    ):
         """
         id(str): the id of advisory
         adv_type(str): advisory type
@@ -24,12 +46,15 @@ class Advisory(object):
         severity(str): advisory severity
         description(str): advisory description
         updated(str): advisory updated time
+        description_loader(callable): load the description when it is first used, if the description is not given
         """
         self._id = id
-        self._adv_type = adv_type
+        # the advisory types and severities are few, so they are interned to be shared by all advisories
+        self._adv_type = sys.intern(adv_type) if adv_type else adv_type
         self._title = title
-        self._severity = severity
+        self._severity = sys.intern(severity) if severity else severity
         self._description = description
+        self._description_loader = description_loader
         self._updated = updated
         self._cves = {}
         self._hotpatches = []
@@ -52,6 +77,9 @@ class Advisory(object):
 
     @property
     def description(self):
+        if self._description is None and self._description_loader is not None:
+            self._description = self._description_loader()
+            self._description_loader = None
         return self._description
 
     @property
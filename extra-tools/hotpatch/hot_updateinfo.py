@@ -78,6 +78,11 @@ class HotUpdateinfoCommand(dnf.cli.Command):
             action='store_const',
             help=_("cves about equal and older versions of installed packages"),
         )
+        parser.add_argument(
+            "--scan",
+            action='store_true',
+            help=_("show available cves, installed cves and hotpatch status in one run"),
+        )
 
     def configure(self):
         demands = self.cli.demands
@@ -90,7 +95,10 @@ class HotUpdateinfoCommand(dnf.cli.Command):
         self.hp_hawkey = HotpatchUpdateInfo(self.cli.base, self.cli)
 
         if self.opts.spec_action and self.opts.spec_action[0] == 'list' and self.opts.with_cve:
-            self.display()
+            if self.opts.scan:
+                self.display_scan()
+            else:
+                self.display()
 
     def get_mapping_nevra_cve(self) -> dict:
         """
@@ -486,7 +494,7 @@ class HotUpdateinfoCommand(dnf.cli.Command):
         # get all hot hotpatches that are less or equal to the highest version-release, and record the cves
         # which they fix
         for required_pkgs_str, actived_vere in hotpatch_vere_mapping.items():
-            all_hotpatches = self.hp_hawkey._hotpatch_required_pkg_info_str[required_pkgs_str]
+            all_hotpatches = self.hp_hawkey.hotpatch_required_pkg_info_str[required_pkgs_str]
             for cmped_vere, hotpatch in all_hotpatches:
                 if hotpatch.hotpatch_name != "ACC":
                     continue
@@ -603,6 +611,35 @@ class HotUpdateinfoCommand(dnf.cli.Command):
                 echo_line = (cve_id, hotpatch.advisory.severity + '/Sec.', '-', hotpatch)
                 echo_lines.add(echo_line)
 
+    def display_scan(self):
+        """
+        Print the available cves, installed cves and hotpatch status in sections, which are all derived from
+        the hotpatch updateinfo loaded once. The lines of each section are the same as the output of
+        'dnf hot-updateinfo list cves', 'dnf hot-updateinfo list cves --installed' and
+        'dnf hotpatch --list cves'.
+
+        e.g.
+        [available]
+        CVE-2023-1111 Important/Sec. redis-6.2.5-2.x86_64 -
+        [installed]
+        CVE-2023-2221 Important/Sec. -                    patch-redis-6.2.5-1-ACC-1-1.x86_64
+        [hotpatch]
+        CVE-2023-2221 redis-6.2.5-1/ACC-1-1/redis-cli ACTIVED
+        """
+        origin_availability = self.opts.availability
+        try:
+            for availability in ('available', 'installed'):
+                self.opts.availability = availability
+                print('[%s]' % availability)
+                self.display()
+        finally:
+            self.opts.availability = origin_availability
+
+        print('[hotpatch]')
+        status_lines = self.hp_hawkey.get_hotpatch_status_lines(self.filter_cves)
+        for cve_id, name, status in sorted(status_lines, key=lambda x: (x[1], x[0])):
+            print('%s %s %s' % (cve_id, name, status))
+
     def display(self):
         """
         Print the display lines according to the formatting parameters.
@@ -10,6 +10,9 @@
 # PURPOSE.
 # See the Mulan PSL v2 for more details.
 # ******************************************************************************/
+import sys
+
+
 class Hotpatch(object):
     __slots__ = [
         '_name',
@@ -35,9 +38,10 @@ class Hotpatch(object):
         """
         self._name = name
         self._version = version
-        self._arch = arch
+        # the arches are few, so they are interned to be shared by all hotpatches
+        self._arch = sys.intern(arch)
         self._filename = filename
-        self._cves = []
+        self._cves = ()
         self._advisory = None
         self._state = ''
         self._release = release
@@ -107,8 +111,10 @@ class Hotpatch(object):
             required_pkgs_name_str_list.append(required_pkgs_name)
         sorted(required_pkgs_str_list)
         sorted(required_pkgs_name_str_list)
-        self._required_pkgs_str = ",".join(required_pkgs_str_list)
-        self._required_pkgs_name_str = ",".join(required_pkgs_name_str_list)
+        # the marks are used as the keys to group hotpatches, so they are interned to be shared by the hotpatches
+        # of the same target required packages
+        self._required_pkgs_str = sys.intern(",".join(required_pkgs_str_list))
+        self._required_pkgs_name_str = sys.intern(",".join(required_pkgs_name_str_list))
 
     @property
     def required_pkgs_str(self):
@@ -128,15 +128,7 @@ class HotpatchCommand(dnf.cli.Command):
         For the command of 'dnf hotpatch --list cve', the echo_lines is [[cve_id, base-pkg/hotpatch, status], ...]
         """
 
-        hotpatch_cves = self.hp_hawkey.hotpatch_cves
-        echo_lines = []
-        for cve_id in hotpatch_cves.keys():
-            for hotpatch in hotpatch_cves[cve_id].hotpatches:
-                for name, status in self.hp_hawkey._hotpatch_state.items():
-                    if hotpatch.syscare_subname not in name:
-                        continue
-                    echo_line = [cve_id, name, status]
-                    echo_lines.append(echo_line)
+        echo_lines = self.hp_hawkey.get_hotpatch_status_lines()
         self._filter_and_format_list_output(echo_lines)
 
     def operate_hot_patches(self, target_patch: list, operate, func) -> None:
@@ -57,6 +57,12 @@ class HotupgradeCommand(dnf.cli.Command):
         parser.add_argument(
             "--takeover", default=False, action='store_true', help=_('kernel cold patch takeover operation')
         )
+        parser.add_argument(
+            "--accept",
+            default=False,
+            action='store_true',
+            help=_('accept the hot patches which are applied successfully'),
+        )
         parser.add_argument(
             "-f",
             dest='force',
@@ -158,7 +164,15 @@ class HotupgradeCommand(dnf.cli.Command):
         is_task_success = True
         is_task_success &= self.keep_hp_operation_atomic(is_all_kernel_hp_actived, target_remove_hp)
 
-        if self.is_need_accept_kernel_hp and acceptable_hp:
+        if self.opts.accept:
+            is_accept_success = True
+            for hp in self.hp_list:
+                if hp in target_remove_hp:
+                    continue
+                is_accept_success &= False if self._accept_hp(hp) != SUCCEED else True
+            # if need accept operation but failed, it indicates hotupgrade task failed
+            is_task_success &= is_accept_success
+        elif self.is_need_accept_kernel_hp and acceptable_hp:
             is_accept_success = True
             logger.info(_('No available kernel cold patch for takeover, gonna accept available kernel hot patch.'))
             for hp in acceptable_hp:
@@ -391,6 +391,34 @@ class HotUpdateInfoTestCase(unittest.TestCase):
         self.assertEqual(res.ciw, expected_display.ciw)
         self.assertEqual(sorted(res.display_lines), sorted(expected_display.display_lines))
 
+    @mock.patch('builtins.print')
+    @mock.patch.object(HotUpdateinfoCommand, "display")
+    def test_display_scan_should_print_available_installed_and_hotpatch_sections(self, mock_display, mock_print):
+        hotpatch = mock.MagicMock(syscare_subname="redis-6.2.5-1/ACC-1-1")
+        self.cmd.hp_hawkey._hotpatch_cves = {'CVE-2023-1111': mock.MagicMock(hotpatches=[hotpatch])}
+        self.cmd.hp_hawkey._hotpatch_state_by_subname = {
+            'redis-6.2.5-1/ACC-1-1': [
+                ('redis-6.2.5-1/ACC-1-1/redis-server', 'ACTIVED'),
+                ('redis-6.2.5-1/ACC-1-1/redis-cli', 'ACTIVED'),
+            ],
+            'redis-6.2.5-1/ACC-1-10': [('redis-6.2.5-1/ACC-1-10/redis-cli', 'DEACTIVED')],
+            'kernel-5.10.0-60.66.0.91/HP001-1-1': [('kernel-5.10.0-60.66.0.91/HP001-1-1/vmlinux', 'ACCEPTED')],
+        }
+        self.cmd.opts.availability = 'available'
+        self.cmd.display_scan()
+        self.assertEqual(mock_display.call_count, 2)
+        self.assertEqual(self.cmd.opts.availability, 'available')
+        self.assertEqual(
+            [mock_call.args[0] for mock_call in mock_print.call_args_list],
+            [
+                '[available]',
+                '[installed]',
+                '[hotpatch]',
+                'CVE-2023-1111 redis-6.2.5-1/ACC-1-1/redis-cli ACTIVED',
+                'CVE-2023-1111 redis-6.2.5-1/ACC-1-1/redis-server ACTIVED',
+            ],
+        )
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -70,6 +70,36 @@ class UpgradeTestCase(unittest.TestCase):
         expected_res = ["patch-kernel-4.19-1-ACC-1-1", "patch-kernel-tools-4.19-1-ACc-1-1"]
         self.assertEqual(res, expected_res)
 
+    @mock.patch("hotpatch.hotupgrade.sleep")
+    @mock.patch.object(HotupgradeCommand, "_accept_hp")
+    @mock.patch.object(HotupgradeCommand, "_apply_hp")
+    def test_run_transaction_should_accept_all_applied_hotpatches_when_accept_is_true(
+        self, mock_apply, mock_accept, mock_sleep
+    ):
+        self.cmd.opts = mock.MagicMock(accept=True)
+        self.cmd.base.transaction = []
+        self.cmd.hp_list = ["patch-redis-6.2.5-1-ACC-1-1.x86_64", "patch-kernel-4.19-1-ACC-1-1.x86_64"]
+        # the redis hotpatch is applied successfully, but the kernel one is failed
+        mock_apply.side_effect = [0, 255]
+        mock_accept.return_value = 0
+        self.cmd.upgrade_en = mock.MagicMock()
+        with self.assertRaises(SystemExit):
+            self.cmd.run_transaction()
+        mock_accept.assert_called_once_with("patch-redis-6.2.5-1-ACC-1-1.x86_64")
+
+    @mock.patch("hotpatch.hotupgrade.sleep")
+    @mock.patch.object(HotupgradeCommand, "_accept_hp")
+    @mock.patch.object(HotupgradeCommand, "_apply_hp")
+    def test_run_transaction_should_not_accept_hotpatches_when_accept_is_false(
+        self, mock_apply, mock_accept, mock_sleep
+    ):
+        self.cmd.opts = mock.MagicMock(accept=False)
+        self.cmd.base.transaction = []
+        self.cmd.hp_list = ["patch-redis-6.2.5-1-ACC-1-1.x86_64"]
+        mock_apply.return_value = 0
+        self.cmd.run_transaction()
+        mock_accept.assert_not_called()
+
 
 if __name__ == '__main__':
     unittest.main()
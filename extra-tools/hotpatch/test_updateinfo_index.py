@@ -0,0 +1,122 @@
+#!/usr/bin/python3
+# ******************************************************************************
+# Copyright (c) Huawei Technologies Co., Ltd. 2023-2023. All rights reserved.
+# licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# ******************************************************************************/
+import os
+import tempfile
+import unittest
+
+from .updateinfo_index import UpdateinfoIndex
+
+REPOMD_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<repomd xmlns="http://linux.duke.edu/metadata/repo">
+  <data type="primary">
+    <checksum type="sha256">1111</checksum>
+  </data>
+  <data type="updateinfo">
+    <checksum type="sha256">2222</checksum>
+    <location href="repodata/2222-updateinfo.xml.gz"/>
+  </data>
+</repomd>
+"""
+
+
+def get_advisory_kwargs():
+    return {
+        'id': 'openEuler-SA-2022-1',
+        'adv_type': 'security',
+        'title': 'An update for redis is now available for openEuler-22.03-LTS',
+        'severity': 'Important',
+        'description': 'Issue summary: ',
+        'references': [{'id': 'CVE-2021-1111', 'type': 'cve'}, {'id': 'CVE-2021-1112', 'type': 'cve'}],
+        'hotpatches': [
+            {
+                'name': 'patch-redis-6.2.5-1-ACC',
+                'version': '1',
+                'release': '1',
+                'arch': 'x86_64',
+                'filename': 'patch-redis-6.2.5-1-ACC-1-1.x86_64.rpm',
+            }
+        ],
+    }
+
+
+class UpdateinfoIndexTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.index = UpdateinfoIndex(os.path.join(self.tmp_dir.name, UpdateinfoIndex.INDEX_FILE))
+
+    def tearDown(self):
+        self.index.close()
+        self.tmp_dir.cleanup()
+
+    def test_get_updateinfo_checksum_should_return_checksum_in_repomd_when_repomd_exists(self):
+        with open(os.path.join(self.tmp_dir.name, "repomd.xml"), "w") as file:
+            file.write(REPOMD_XML)
+        updateinfo_path = os.path.join(self.tmp_dir.name, "2222-updateinfo.xml.gz")
+        res = self.index.get_updateinfo_checksum(updateinfo_path)
+        self.assertEqual(res, "sha256:2222")
+
+    def test_get_updateinfo_checksum_should_return_file_stat_when_repomd_not_exists(self):
+        updateinfo_path = os.path.join(self.tmp_dir.name, "2222-updateinfo.xml.gz")
+        with open(updateinfo_path, "w") as file:
+            file.write("updateinfo")
+        res = self.index.get_updateinfo_checksum(updateinfo_path)
+        self.assertTrue(res.startswith("stat:10-"))
+
+    def test_is_up_to_date_should_return_false_when_repo_is_not_indexed(self):
+        self.assertFalse(self.index.is_up_to_date("repo", "sha256:2222", "x86_64"))
+
+    def test_is_up_to_date_should_return_false_when_checksum_changed(self):
+        self.index.rebuild("repo", "sha256:2222", "x86_64", [get_advisory_kwargs()])
+        self.assertFalse(self.index.is_up_to_date("repo", "sha256:3333", "x86_64"))
+        self.assertTrue(self.index.is_up_to_date("repo", "sha256:2222", "x86_64"))
+
+    def test_load_advisories_should_return_same_advisory_kwargs_when_index_is_rebuilt(self):
+        self.index.rebuild("repo", "sha256:2222", "x86_64", [get_advisory_kwargs()])
+        res = list(self.index.load_advisories("repo"))
+        expected_res = get_advisory_kwargs()
+        expected_res['references'] = [{'id': 'CVE-2021-1111'}, {'id': 'CVE-2021-1112'}]
+        self.assertEqual(res, [expected_res])
+
+    def test_load_advisories_should_load_description_separately_when_description_is_not_required(self):
+        self.index.rebuild("repo", "sha256:2222", "x86_64", [get_advisory_kwargs()])
+        res = list(self.index.load_advisories("repo", with_description=False))
+        self.assertNotIn('description', res[0])
+        self.assertEqual(self.index.load_description("repo", 'openEuler-SA-2022-1'), 'Issue summary: ')
+
+    def test_load_description_should_not_reopen_index_when_index_is_closed(self):
+        self.index.rebuild("repo", "sha256:2222", "x86_64", [get_advisory_kwargs()])
+        self.index.close()
+        self.assertEqual(self.index.load_description("repo", 'openEuler-SA-2022-1'), 'Issue summary: ')
+        self.assertIsNone(self.index._conn)
+
+    def test_rebuild_should_replace_old_advisories_of_the_repo(self):
+        self.index.rebuild("repo", "sha256:2222", "x86_64", [get_advisory_kwargs()])
+        self.index.rebuild("repo", "sha256:3333", "x86_64", [])
+        self.assertEqual(list(self.index.load_advisories("repo")), [])
+
+    def test_load_hotpatch_requires_should_return_stored_requires_when_requires_are_stored(self):
+        hotpatch_requires = {
+            'patch-redis-6.2.5-1-ACC-1-1.x86_64': {'redis': '6.2.5-1', 'redis-cli': '6.2.5-1'},
+            'patch-kernel-5.10.0-60.66.0.91-HP001-1-1.x86_64': {},
+        }
+        self.index.store_hotpatch_requires("repo", hotpatch_requires)
+        self.assertEqual(self.index.load_hotpatch_requires("repo"), hotpatch_requires)
+
+    def test_rebuild_should_drop_hotpatch_requires_of_the_repo(self):
+        self.index.store_hotpatch_requires("repo", {'patch-redis-6.2.5-1-ACC-1-1.x86_64': {'redis': '6.2.5-1'}})
+        self.index.rebuild("repo", "sha256:3333", "x86_64", [])
+        self.assertEqual(self.index.load_hotpatch_requires("repo"), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -209,6 +209,22 @@ class HotpatchUpdateInfoTestCase(unittest.TestCase):
         expected_res = {'redis-6.2.5-1/ACC-1-1/redis-cli': 'ACTIVED'}
         self.assertEqual(self.hotpatchUpdateInfo._hotpatch_state, expected_res)
 
+    @mock.patch.object(Syscare, "list")
+    def test_get_hotpatch_status_lines_should_match_hotpatch_by_exact_syscare_subname(self, mock_syscare):
+        mock_syscare.return_value = [
+            {'Uuid': '1', 'Name': 'redis-6.2.5-1/ACC-1-1/redis-cli', 'Status': 'ACTIVED'},
+            {'Uuid': '2', 'Name': 'redis-6.2.5-1/ACC-1-10/redis-cli', 'Status': 'DEACTIVED'},
+        ]
+        self.hotpatchUpdateInfo._init_hotpatch_status_from_syscare()
+        hotpatch = mock.MagicMock(syscare_subname='redis-6.2.5-1/ACC-1-1')
+        self.hotpatchUpdateInfo._hotpatch_cves = {
+            'CVE-2023-1111': mock.MagicMock(hotpatches=[hotpatch]),
+            'CVE-2023-2222': mock.MagicMock(hotpatches=[hotpatch]),
+        }
+
+        res = self.hotpatchUpdateInfo.get_hotpatch_status_lines({'CVE-2023-1111'})
+        self.assertEqual(res, [['CVE-2023-1111', 'redis-6.2.5-1/ACC-1-1/redis-cli', 'ACTIVED']])
+
     @mock.patch.object(Syscare, "list")
     def test_get_hotpatch_aggregated_status_in_syscare_should_return_actived_when_syscare_status_are_all_actived(
         self, mock_syscare
@@ -277,6 +293,33 @@ class HotpatchUpdateInfoTestCase(unittest.TestCase):
         expected_res = ''
         self.assertEqual(res, expected_res)
 
+    @mock.patch.object(Syscare, "list")
+    def test_get_hotpatch_aggregated_status_in_syscare_should_ignore_hotpatch_with_longer_release(self, mock_syscare):
+        mock_syscare.return_value = [
+            {
+                'Uuid': 'a6f8c694-5cc4-4887-8aac-fbe7f67fb413',
+                'Name': 'redis-6.2.5-1/ACC-1-1/redis-cli',
+                'Status': 'ACTIVED',
+            },
+            {
+                'Uuid': 'a6f8c694-5cc4-4887-8aac-fbe7f67fb414',
+                'Name': 'redis-6.2.5-1/ACC-1-10/redis-cli',
+                'Status': 'NOT-APPLIED',
+            },
+        ]
+        self.hotpatchUpdateInfo._init_hotpatch_status_from_syscare()
+
+        hotpatch = Hotpatch(
+            name="patch-redis-6.2.5-1-ACC",
+            version="1",
+            arch="x86_64",
+            filename="patch-redis-6.2.5-1-ACC-1-1.x86_64.rpm",
+            release="1",
+        )
+        res = self.hotpatchUpdateInfo._get_hotpatch_aggregated_status_in_syscare(hotpatch)
+        expected_res = 'ACTIVED'
+        self.assertEqual(res, expected_res)
+
     def test_get_hotpatches_from_advisories_should_return_correctly(self):
         advisories = ['openEuler-SA-2023-1']
         self.hotpatchUpdateInfo._hotpatch_advisories['openEuler-SA-2023-1'] = get_advisory_mock()
@@ -320,20 +363,20 @@ class HotpatchUpdateInfoTestCase(unittest.TestCase):
         }
         self.assertEqual(map_cve_hotpatches, expected_res)
 
-    def test_version_cmp_should_return_correctly(self):
-        hotpatch_a = mock.MagicMock(version="1", release="1")
-        hotpatch_b = mock.MagicMock(version="1", release="2")
-        res = self.hotpatchUpdateInfo.version_cmp(hotpatch_a, hotpatch_b)
-        expected_res = 1
-        self.assertEqual(res, expected_res)
-        res = self.hotpatchUpdateInfo.version_cmp(hotpatch_b, hotpatch_a)
-        expected_res = -1
-        self.assertEqual(res, expected_res)
-        hotpatch_b.version = "1"
-        hotpatch_b.release = "1"
-        res = self.hotpatchUpdateInfo.version_cmp(hotpatch_a, hotpatch_b)
-        expected_res = -1
-        self.assertEqual(res, expected_res)
+    def test_get_hotpatch_version_key_should_order_hotpatches_by_version_release(self):
+        hotpatches = [
+            mock.MagicMock(version="1", release="2"),
+            mock.MagicMock(version="1", release="10"),
+            mock.MagicMock(version="2", release="1"),
+            mock.MagicMock(version="1", release="1"),
+        ]
+        hotpatches.sort(key=self.hotpatchUpdateInfo._get_hotpatch_version_key, reverse=True)
+        res = ["%s-%s" % (hotpatch.version, hotpatch.release) for hotpatch in hotpatches]
+        self.assertEqual(res, ["2-1", "1-10", "1-2", "1-1"])
+        self.assertEqual(
+            self.hotpatchUpdateInfo._get_hotpatch_version_key(mock.MagicMock(version="1", release="1")),
+            self.hotpatchUpdateInfo._get_hotpatch_version_key(hotpatches[-1]),
+        )
 
     def test_parse_pkglist_should_return_correctly(self):
         pkglist = get_pkglist_element()
@@ -448,6 +491,19 @@ class HotpatchUpdateInfoTestCase(unittest.TestCase):
         expected_res = 'openEuler-SA-2022-1'
         self.assertEqual(res, expected_res)
 
+    def test_load_and_store_from_index_should_not_load_advisories_until_hotpatch_cves_are_queried(self):
+        advisory_kwargs = self.hotpatchUpdateInfo._parse_advisory(get_advisory_element())
+        updateinfo_index = mock.MagicMock()
+        updateinfo_index.is_up_to_date.return_value = True
+        updateinfo_index.load_advisories.return_value = iter([advisory_kwargs])
+        updateinfo_index.load_hotpatch_requires.return_value = {}
+
+        self.hotpatchUpdateInfo._load_and_store_from_index(updateinfo_index, 'update', 'updateinfo.xml.gz')
+        updateinfo_index.load_advisories.assert_not_called()
+
+        self.assertIn('CVE-2021-1111', self.hotpatchUpdateInfo.hotpatch_cves)
+        updateinfo_index.load_advisories.assert_called_once_with('update', with_description=False)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,41 @@
+#!/usr/bin/python3
+# ******************************************************************************
+# Copyright (c) Huawei Technologies Co., Ltd. 2023-2023. All rights reserved.
+# licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# ******************************************************************************/
+import unittest
+
+from .version import Versions
+
+
+class VersionsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.versions = Versions()
+
+    def test_larger_than_should_follow_rpmvercmp_order(self):
+        ordered_versions = ["1.0~rc1-1", "1.0-1", "1.0^git1-1", "1.0a-1", "1.0.1-1", "1.0.1-1.oe2203", "1:0.1-1"]
+        for lower, higher in zip(ordered_versions, ordered_versions[1:]):
+            self.assertTrue(self.versions.larger_than(higher, lower))
+            self.assertFalse(self.versions.larger_than(lower, higher))
+
+    def test_larger_than_should_return_true_when_versions_are_equal_except_leading_zeros_and_separators(self):
+        self.assertTrue(self.versions.larger_than("6.2.05-1", "6.2_5-1"))
+        self.assertTrue(self.versions.larger_than("6.2_5-1", "6.2.05-1"))
+
+    def test_key_should_sort_kernel_versions_by_numeric_segments(self):
+        versions = ["5.10.0-60.92.0.116.oe2203", "5.10.0-60.18.0.50.oe2203", "5.10.0-153.12.0.92.oe2203sp2"]
+        versions.sort(key=Versions.key)
+        self.assertEqual(
+            versions, ["5.10.0-60.18.0.50.oe2203", "5.10.0-60.92.0.116.oe2203", "5.10.0-153.12.0.92.oe2203sp2"]
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,263 @@
+#!/usr/bin/python3
+# ******************************************************************************
+# Copyright (c) Huawei Technologies Co., Ltd. 2023-2023. All rights reserved.
+# licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# ******************************************************************************/
+import os
+import pathlib
+import sqlite3
+import xml.etree.ElementTree as ET
+from typing import Iterable, Iterator
+
+
+class UpdateinfoIndex(object):
+    """
+    On-disk compiled index of the hotpatch relevant updateinfo, keyed by the updateinfo checksum of each repo
+    """
+
+    INDEX_FILE = "hotpatch-updateinfo.sqlite"
+
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS repo (repo_id TEXT PRIMARY KEY, checksum TEXT NOT NULL, arches TEXT NOT NULL)",
+        "CREATE TABLE IF NOT EXISTS advisory (repo_id TEXT NOT NULL, id TEXT NOT NULL, adv_type TEXT, title TEXT, "
+        "severity TEXT, description TEXT, updated TEXT)",
+        "CREATE TABLE IF NOT EXISTS reference (repo_id TEXT NOT NULL, advisory_id TEXT NOT NULL, cve_id TEXT NOT NULL)",
+        "CREATE TABLE IF NOT EXISTS hotpatch (repo_id TEXT NOT NULL, advisory_id TEXT NOT NULL, name TEXT NOT NULL, "
+        "version TEXT NOT NULL, release TEXT NOT NULL, arch TEXT NOT NULL, filename TEXT NOT NULL)",
+        "CREATE TABLE IF NOT EXISTS hotpatch_requires (repo_id TEXT NOT NULL, nevra TEXT NOT NULL, name TEXT, "
+        "vere TEXT)",
+        "CREATE INDEX IF NOT EXISTS advisory_repo ON advisory (repo_id)",
+        "CREATE INDEX IF NOT EXISTS reference_repo ON reference (repo_id, advisory_id)",
+        "CREATE INDEX IF NOT EXISTS hotpatch_repo ON hotpatch (repo_id, advisory_id)",
+        "CREATE INDEX IF NOT EXISTS hotpatch_requires_repo ON hotpatch_requires (repo_id)",
+    )
+
+    def __init__(self, index_path: str):
+        """
+        index_path(str): path of the sqlite index file, e.g. /var/cache/dnf/hotpatch-updateinfo.sqlite
+        """
+        self._index_path = index_path
+        self._conn = None
+
+    @property
+    def conn(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self._index_path, timeout=30)
+            for statement in self._SCHEMA:
+                self._conn.execute(statement)
+            self._conn.commit()
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    @staticmethod
+    def get_updateinfo_checksum(updateinfo_xml_path: str) -> str:
+        """
+        Get the checksum of xxx-updateinfo.xml.gz recorded in the repomd.xml of the same repodata directory.
+        If the repomd.xml is missing or broken, the size and mtime of the updateinfo file are used instead.
+
+        repomd.xml e.g.
+
+        <repomd xmlns="http://linux.duke.edu/metadata/repo">
+            <data type="updateinfo">
+                <checksum type="sha256">6f1a...</checksum>
+                <location href="repodata/6f1a...-updateinfo.xml.gz"/>
+            </data>
+        </repomd>
+        """
+        repomd_path = os.path.join(os.path.dirname(updateinfo_xml_path), "repomd.xml")
+        try:
+            root = ET.parse(repomd_path).getroot()
+            for data in root:
+                if not data.tag.endswith('data') or data.get('type') != 'updateinfo':
+                    continue
+                for node in data:
+                    if node.tag.endswith('checksum') and node.text:
+                        return "%s:%s" % (node.get('type', ''), node.text.strip())
+        except (OSError, ET.ParseError):
+            pass
+
+        file_stat = os.stat(updateinfo_xml_path)
+        return "stat:%s-%s" % (file_stat.st_size, file_stat.st_mtime_ns)
+
+    def is_up_to_date(self, repo_id: str, checksum: str, arches: str) -> bool:
+        """
+        Check whether the index of the repo was built from the updateinfo with the same checksum and arches
+        """
+        row = self.conn.execute("SELECT checksum, arches FROM repo WHERE repo_id = ?", (repo_id,)).fetchone()
+        return row is not None and row[0] == checksum and row[1] == arches
+
+    def rebuild(self, repo_id: str, checksum: str, arches: str, advisories: Iterable[dict]):
+        """
+        Replace the index of the repo with the parsed advisories
+
+        Args:
+            repo_id(str): repo id
+            checksum(str): the updateinfo checksum of the repo
+            arches(str): the arches used to filter hotpatches, e.g. 'aarch64,noarch'
+            advisories(iterable): advisory kwargs parsed from updateinfo, which contain 'references' and
+                                  'hotpatches'
+        """
+        with self.conn:
+            for table in ("repo", "advisory", "reference", "hotpatch", "hotpatch_requires"):
+                self.conn.execute("DELETE FROM %s WHERE repo_id = ?" % table, (repo_id,))
+
+            for advisory in advisories:
+                advisory_id = advisory['id']
+                self.conn.execute(
+                    "INSERT INTO advisory VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        repo_id,
+                        advisory_id,
+                        advisory.get('adv_type'),
+                        advisory.get('title'),
+                        advisory.get('severity'),
+                        advisory.get('description'),
+                        advisory.get('updated'),
+                    ),
+                )
+                self.conn.executemany(
+                    "INSERT INTO reference VALUES (?, ?, ?)",
+                    [(repo_id, advisory_id, ref['id']) for ref in advisory.get('references', [])],
+                )
+                self.conn.executemany(
+                    "INSERT INTO hotpatch VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            repo_id,
+                            advisory_id,
+                            hotpatch['name'],
+                            hotpatch['version'],
+                            hotpatch['release'],
+                            hotpatch['arch'],
+                            hotpatch['filename'],
+                        )
+                        for hotpatch in advisory.get('hotpatches', [])
+                    ],
+                )
+            self.conn.execute("INSERT INTO repo VALUES (?, ?, ?)", (repo_id, checksum, arches))
+
+    def load_advisories(self, repo_id: str, with_description: bool = True) -> Iterator[dict]:
+        """
+        Load the advisory kwargs of the repo one by one, which are in the same format as the parsed ones
+
+        Args:
+            repo_id(str): repo id
+            with_description(bool): whether to load the description, which can be loaded by load_description
+                                    when it is used
+
+        Returns:
+            generator: advisory kwargs
+            e.g.
+            {
+                'id': 'openEuler-SA-2022-1',
+                'adv_type': 'security',
+                'title': 'An update for mariadb is now available for openEuler-22.03-LTS',
+                'severity': 'Important',
+                'description': 'patch-redis-6.2.5-1-HP001.(CVE-2022-24048)',
+                'references': [{'id': 'CVE-2021-1111'}],
+                'hotpatches': [{
+                    'name': 'patch-redis-6.2.5-1-HP001',
+                    'version': '1',
+                    'release': '1',
+                    'arch': 'x86_64',
+                    'filename': 'patch-redis-6.2.5-1-HP001-1-1.x86_64.rpm'
+                }]
+            }
+        """
+        references = {}
+        for advisory_id, cve_id in self.conn.execute(
+            "SELECT advisory_id, cve_id FROM reference WHERE repo_id = ? ORDER BY rowid", (repo_id,)
+        ):
+            references.setdefault(advisory_id, []).append({'id': cve_id})
+
+        hotpatches = {}
+        for advisory_id, name, version, release, arch, filename in self.conn.execute(
+            "SELECT advisory_id, name, version, release, arch, filename FROM hotpatch WHERE repo_id = ? "
+            "ORDER BY rowid",
+            (repo_id,),
+        ):
+            hotpatches.setdefault(advisory_id, []).append(
+                {'name': name, 'version': version, 'release': release, 'arch': arch, 'filename': filename}
+            )
+
+        for advisory_id, adv_type, title, severity, description, updated in self.conn.execute(
+            "SELECT id, adv_type, title, severity, %s, updated FROM advisory WHERE repo_id = ? ORDER BY rowid"
+            % ("description" if with_description else "NULL"),
+            (repo_id,),
+        ):
+            advisory = {
+                'id': advisory_id,
+                'adv_type': adv_type,
+                'title': title,
+                'severity': severity,
+                'references': references.get(advisory_id, []),
+                'hotpatches': hotpatches.get(advisory_id, []),
+            }
+            if with_description:
+                advisory['description'] = description
+            if updated is not None:
+                advisory['updated'] = updated
+            yield advisory
+
+    def load_description(self, repo_id: str, advisory_id: str) -> str:
+        """
+        Load the description of the advisory in the repo. It is called lazily after the index is closed, so a
+        short-lived read-only connection is used instead of reopening the index connection.
+        """
+        conn = sqlite3.connect("%s?mode=ro" % pathlib.Path(self._index_path).absolute().as_uri(), uri=True, timeout=30)
+        try:
+            row = conn.execute(
+                "SELECT description FROM advisory WHERE repo_id = ? AND id = ?", (repo_id, advisory_id)
+            ).fetchone()
+        finally:
+            conn.close()
+        return row[0] if row is not None else None
+
+    def load_hotpatch_requires(self, repo_id: str) -> dict:
+        """
+        Load the resolved require packages of the hotpatches in the repo
+
+        Returns:
+            dict: {hotpatch nevra: require pkgs}
+            e.g.
+            {
+                'patch-redis-6.2.5-1-ACC-1-1.x86_64': {'redis': '6.2.5-1', 'redis-cli': '6.2.5-1'}
+            }
+        """
+        hotpatch_requires = {}
+        for nevra, name, vere in self.conn.execute(
+            "SELECT nevra, name, vere FROM hotpatch_requires WHERE repo_id = ? ORDER BY rowid", (repo_id,)
+        ):
+            require_pkgs = hotpatch_requires.setdefault(nevra, {})
+            # a hotpatch without require packages is recorded with a NULL name
+            if name is not None:
+                require_pkgs[name] = vere
+        return hotpatch_requires
+
+    def store_hotpatch_requires(self, repo_id: str, hotpatch_requires: dict):
+        """
+        Store the resolved require packages of the hotpatches in the repo, which are dropped together with
+        the advisories when the updateinfo checksum changes
+
+        Args:
+            repo_id(str): repo id
+            hotpatch_requires(dict): {hotpatch nevra: require pkgs}
+        """
+        rows = []
+        for nevra, require_pkgs in hotpatch_requires.items():
+            if not require_pkgs:
+                rows.append((repo_id, nevra, None, None))
+            rows.extend((repo_id, nevra, name, vere) for name, vere in require_pkgs.items())
+        with self.conn:
+            self.conn.executemany("INSERT INTO hotpatch_requires VALUES (?, ?, ?, ?)", rows)
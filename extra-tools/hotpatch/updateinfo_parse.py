@@ -15,28 +15,18 @@ import platform
 import re
 import gzip
 import datetime
-import subprocess
+import functools
+import sqlite3
+import sys
 import xml.etree.ElementTree as ET
-from functools import cmp_to_key
-from typing import List
+from typing import Iterable, List, Optional
+from dnfpluginscore import logger
 from .syscare import Syscare
 from .version import Versions
 from .hotpatch import Hotpatch
 from .cve import Cve
 from .advisory import Advisory
-
-SUCCEED = 0
-FAIL = 255
-
-
-def cmd_output(cmd):
-    try:
-        result = subprocess.Popen(cmd, shell=False, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        result.wait()
-        return result.stdout.read().decode('utf-8'), result.returncode
-    except Exception as e:
-        print("error: ", e)
-        return str(e), FAIL
+from .updateinfo_index import UpdateinfoIndex
 
 
 class HotpatchUpdateInfo(object):
@@ -63,6 +53,15 @@ class HotpatchUpdateInfo(object):
         self._hotpatch_status = []
         # dict {required_pkg_info_str: [Hotpatch]}
         self._hotpatch_required_pkg_info_str = {}
+        # dict {hotpatch_nevra: {required_pkg_name: required_pkg_vere}}
+        self._hotpatch_requires = {}
+        # dict {installed_pkg_name: [installed_pkg]}
+        self._inst_pkgs_by_name = {}
+        # dict {syscare_subname: [(syscare_name, status)]}
+        self._hotpatch_state_by_subname = {}
+        # list [iterable of advisory kwargs] of each repo, which are stored when the hotpatch information is
+        # queried for the first time
+        self._pending_advisories = []
 
         self.init_hotpatch_info()
 
@@ -73,10 +72,10 @@ class HotpatchUpdateInfo(object):
         self._get_installed_pkgs()
         self._parse_and_store_hotpatch_info_from_updateinfo()
         self._init_hotpatch_status_from_syscare()
-        self._init_hotpatch_state()
 
     @property
     def hotpatch_cves(self):
+        self._load_pending_advisories()
         return self._hotpatch_cves
 
     @property
@@ -85,6 +84,7 @@ class HotpatchUpdateInfo(object):
 
     @property
     def hotpatch_required_pkg_info_str(self):
+        self._load_pending_advisories()
         return self._hotpatch_required_pkg_info_str
 
     def _get_installed_pkgs(self):
@@ -102,7 +102,10 @@ class HotpatchUpdateInfo(object):
         q = q.union(kernel_q.installed())
         q = q.apply()
 
-        self._inst_pkgs_query = q
+        # index the installed packages by name once, instead of filtering the query for each required package
+        self._inst_pkgs_by_name = {}
+        for pkg in q:
+            self._inst_pkgs_by_name.setdefault(pkg.name, []).append(pkg)
 
     def _parse_and_store_hotpatch_info_from_updateinfo(self):
         """
@@ -128,11 +131,126 @@ class HotpatchUpdateInfo(object):
                         map_repo_updateinfoxml[repo_name] = cache_updateinfo_xml_path
 
         # only hotpatch relevant updateinfo from enabled repos are parsed and stored
-        for repo in all_repos.iter_enabled():
-            repo_id = repo.id
-            if repo_id in map_repo_updateinfoxml:
-                updateinfoxml_path = map_repo_updateinfoxml[repo_id]
-                self._parse_and_store_from_xml(updateinfoxml_path)
+        updateinfo_index = UpdateinfoIndex(os.path.join(system_cachedir, UpdateinfoIndex.INDEX_FILE))
+        try:
+            for repo in all_repos.iter_enabled():
+                repo_id = repo.id
+                if repo_id in map_repo_updateinfoxml:
+                    updateinfoxml_path = map_repo_updateinfoxml[repo_id]
+                    self._load_and_store_from_index(updateinfo_index, repo_id, updateinfoxml_path)
+        finally:
+            updateinfo_index.close()
+
+    def _load_and_store_from_index(self, updateinfo_index: UpdateinfoIndex, repo_id: str, updateinfoxml: str):
+        """
+        Load and store hotpatch update information of the repo from the compiled updateinfo index. The index
+        of the repo is rebuilt from xxx-updateinfo.xml.gz only when the updateinfo checksum recorded in
+        repomd.xml has changed, otherwise the advisories are not read from the index until they are queried.
+        If the index is unavailable (e.g. the cache directory is read-only), the xxx-updateinfo.xml.gz is
+        parsed directly.
+
+        Args:
+            updateinfo_index(UpdateinfoIndex): compiled updateinfo index
+            repo_id(str): repo id
+            updateinfoxml(str): path of xxx-updateinfo.xml.gz
+        """
+        arches = ",".join(sorted(self.base.sack.list_arches()))
+        try:
+            checksum = updateinfo_index.get_updateinfo_checksum(updateinfoxml)
+            if updateinfo_index.is_up_to_date(repo_id, checksum, arches):
+                self._pending_advisories.append(
+                    self._load_from_index(updateinfo_index, repo_id, checksum, arches, updateinfoxml)
+                )
+                return
+        except (sqlite3.Error, OSError) as e:
+            logger.debug("updateinfo index of repo %s is unavailable: %s", repo_id, e)
+            self._parse_and_store_from_xml(updateinfoxml)
+            return
+
+        advisories = list(self._parse_from_xml(updateinfoxml))
+        try:
+            updateinfo_index.rebuild(repo_id, checksum, arches, advisories)
+        except sqlite3.Error as e:
+            logger.debug("failed to rebuild updateinfo index of repo %s: %s", repo_id, e)
+        else:
+            for advisory in advisories:
+                # the description is kept in the index and only loaded when it is used
+                advisory.pop('description', None)
+                advisory['description_loader'] = functools.partial(
+                    self._load_advisory_description, updateinfo_index, repo_id, advisory['id']
+                )
+        self._resolve_and_store_hotpatch_requires(updateinfo_index, repo_id, advisories)
+        self._pending_advisories.append(advisories)
+
+    def _load_from_index(
+        self, updateinfo_index: UpdateinfoIndex, repo_id: str, checksum: str, arches: str, updateinfoxml: str
+    ):
+        """
+        Load the advisory kwargs of the repo from the updateinfo index. It is a generator, so the index is only
+        read when the advisories are stored. If the index has been rebuilt by another dnf process since it was
+        checked, the xxx-updateinfo.xml.gz is parsed instead.
+        """
+        advisories = None
+        try:
+            if updateinfo_index.is_up_to_date(repo_id, checksum, arches):
+                advisories = list(updateinfo_index.load_advisories(repo_id, with_description=False))
+                self._hotpatch_requires.update(updateinfo_index.load_hotpatch_requires(repo_id))
+        except sqlite3.Error as e:
+            logger.debug("updateinfo index of repo %s is unavailable: %s", repo_id, e)
+
+        if advisories is None:
+            updateinfo_index.close()
+            yield from self._parse_from_xml(updateinfoxml)
+            return
+
+        self._resolve_and_store_hotpatch_requires(updateinfo_index, repo_id, advisories)
+        updateinfo_index.close()
+        for advisory in advisories:
+            advisory['description_loader'] = functools.partial(
+                self._load_advisory_description, updateinfo_index, repo_id, advisory['id']
+            )
+            yield advisory
+
+    def _resolve_and_store_hotpatch_requires(self, updateinfo_index: UpdateinfoIndex, repo_id: str, advisories: list):
+        """
+        Resolve the require packages of the hotpatches in the advisories, and store the newly resolved ones in
+        the updateinfo index
+        """
+        resolved_hotpatch_requires = self._resolve_hotpatch_requires(advisories)
+        if not resolved_hotpatch_requires:
+            return
+        try:
+            updateinfo_index.store_hotpatch_requires(repo_id, resolved_hotpatch_requires)
+        except sqlite3.Error as e:
+            logger.debug("failed to store hotpatch requires of repo %s: %s", repo_id, e)
+
+    def _load_pending_advisories(self):
+        """
+        Store the advisories of the repos which are not stored yet, and initialize the state of their
+        hotpatches. The repos are handled in order, so the result is the same as storing them one by one
+        when the repos are traversed.
+        """
+        if not self._pending_advisories:
+            return
+        pending_advisories, self._pending_advisories = self._pending_advisories, []
+        for advisories in pending_advisories:
+            advisories = list(advisories)
+            self._resolve_hotpatch_requires(advisories)
+            for advisory in advisories:
+                self._store_advisory_info(advisory)
+        self._init_hotpatch_state()
+
+    @staticmethod
+    def _load_advisory_description(updateinfo_index: UpdateinfoIndex, repo_id: str, advisory_id: str) -> str:
+        """
+        Load the advisory description from the updateinfo index, an empty description is returned if the index
+        is unavailable
+        """
+        try:
+            return updateinfo_index.load_description(repo_id, advisory_id) or ''
+        except sqlite3.Error as e:
+            logger.debug("failed to load description of advisory %s: %s", advisory_id, e)
+            return ''
 
     def _parse_pkglist(self, pkglist):
         """
@@ -194,11 +312,22 @@ class HotpatchUpdateInfo(object):
         advisory['adv_type'] = update.get('type')
         return advisory
 
-    def _get_hotpatch_require_pkgs_info(self, hotpatch: Hotpatch) -> dict:
+    @staticmethod
+    def _get_hotpatch_nevra(hotpatch_kwargs: dict) -> str:
         """
-        Get require packages from requires info of hotpatch packages. Specifically, read the require
-        information of the rpm package, get the target coldpatch rpm package, and record the
-        name_vere(name-version-release) information of the coldpatch.
+        Get the nevra(name-version-release.arch) of the hotpatch from its filename
+        """
+        filename = hotpatch_kwargs['filename']
+        return filename[0 : filename.rindex('.')]
+
+    @staticmethod
+    def _parse_requires(requires: List[str]) -> dict:
+        """
+        Parse the requires of the hotpatch package, and get the name_vere(name-version-release) information of
+        the target coldpatch rpm packages.
+
+        Args:
+            requires(list): e.g. ['redis = 6.2.5-1', 'redis-cli = 6.2.5-1', 'syscare >= 1.1.0']
 
         Returns:
             require pkgs: dict
@@ -209,21 +338,66 @@ class HotpatchUpdateInfo(object):
             }
         """
         require_pkgs = dict()
-        cmd = ["dnf", "repoquery", "--requires", hotpatch.nevra]
-        requires_output, return_code = cmd_output(cmd)
-        if return_code != SUCCEED:
-            return require_pkgs
-        requires_output = requires_output.split('\n')
-        for requires in requires_output:
-            if " = " not in requires:
+        for require_pkg in requires:
+            if " = " not in require_pkg:
                 continue
-            require_pkg = requires
             pkg_name, pkg_vere = re.split(' = ', require_pkg)
             if pkg_name == "syscare":
                 continue
-            require_pkgs[pkg_name] = pkg_vere
+            # the same target required packages are shared by many hotpatches
+            require_pkgs[sys.intern(pkg_name)] = sys.intern(pkg_vere)
         return require_pkgs
 
+    def _resolve_hotpatch_requires(self, advisories: List[dict]) -> dict:
+        """
+        Resolve the require packages of all hotpatches in the advisories which are not resolved yet, in one
+        pass through the available packages of the already-loaded sack instead of one 'dnf repoquery --requires'
+        process per hotpatch.
+
+        Args:
+            advisories(list): advisory kwargs which contain 'hotpatches'
+
+        Returns:
+            dict: the newly resolved {hotpatch nevra: require pkgs}
+        """
+        unresolved_nevras = set()
+        for advisory in advisories:
+            for hotpatch_kwargs in advisory['hotpatches']:
+                nevra = self._get_hotpatch_nevra(hotpatch_kwargs)
+                if nevra not in self._hotpatch_requires:
+                    unresolved_nevras.add(nevra)
+        if not unresolved_nevras:
+            return {}
+
+        resolved_hotpatch_requires = {}
+        hotpatch_names = list({nevra.rsplit('-', 2)[0] for nevra in unresolved_nevras})
+        for pkg in self.base.sack.query().available().filterm(name=hotpatch_names):
+            nevra = "%s-%s-%s.%s" % (pkg.name, pkg.version, pkg.release, pkg.arch)
+            if nevra not in unresolved_nevras or nevra in resolved_hotpatch_requires:
+                continue
+            resolved_hotpatch_requires[nevra] = self._parse_requires([str(reldep) for reldep in pkg.requires])
+
+        self._hotpatch_requires.update(resolved_hotpatch_requires)
+        return resolved_hotpatch_requires
+
+    def _get_hotpatch_require_pkgs_info(self, hotpatch: Hotpatch) -> dict:
+        """
+        Get require packages from requires info of hotpatch packages. Specifically, read the require
+        information of the rpm package, get the target coldpatch rpm package, and record the
+        name_vere(name-version-release) information of the coldpatch. The requires are resolved in batch
+        before the advisories are stored, so it is only a lookup here, and the returned dict is shared with
+        the resolved requires instead of being copied for each hotpatch.
+
+        Returns:
+            require pkgs: dict
+        e.g.
+            {
+                'redis': '6.2.5-1',
+                'redis-cli': '6.2.5-1'
+            }
+        """
+        return self._hotpatch_requires.get(hotpatch.nevra, {})
+
     def _store_advisory_info(self, advisory_kwargs: dict):
         """
         Instantiate Cve, Hotpatch and Advisory object according to the advisory kwargs
@@ -233,18 +407,19 @@ class HotpatchUpdateInfo(object):
         advisory = Advisory(**advisory_kwargs)
         advisory_cves = {}
         for cve_kwargs in advisory_references:
-            cve = Cve(**cve_kwargs)
-
-            if cve.cve_id not in self._hotpatch_cves:
-                self._hotpatch_cves[cve.cve_id] = cve
-            advisory_cves[cve.cve_id] = self._hotpatch_cves[cve.cve_id]
+            cve_id = cve_kwargs['id']
+            if cve_id not in self._hotpatch_cves:
+                self._hotpatch_cves[cve_id] = Cve(**cve_kwargs)
+            advisory_cves[cve_id] = self._hotpatch_cves[cve_id]
 
         advisory.cves = advisory_cves
+        # the cve ids of the advisory are shared by all its hotpatches
+        advisory_cve_ids = tuple(advisory_cves)
 
         for hotpatch_kwargs in advisory_hotpatches:
             hotpatch = Hotpatch(**hotpatch_kwargs)
             hotpatch.advisory = advisory
-            hotpatch.cves = advisory_cves.keys()
+            hotpatch.cves = advisory_cve_ids
             hotpatch.required_pkgs_info = self._get_hotpatch_require_pkgs_info(hotpatch)
 
             advisory.add_hotpatch(hotpatch)
@@ -285,7 +460,7 @@ class HotpatchUpdateInfo(object):
         hotpatch.state = self.UNRELATED
         is_find_installable_hp = False
         for required_pkg_name, required_pkg_vere in hotpatch.required_pkgs_info.items():
-            inst_pkgs = self._inst_pkgs_query.filter(name=required_pkg_name)
+            inst_pkgs = self._inst_pkgs_by_name.get(required_pkg_name)
             # check whether the relevant target required package is installed on this machine
             if not inst_pkgs:
                 return
@@ -297,7 +472,8 @@ class HotpatchUpdateInfo(object):
                     inst_pkg_vere = inst_pkg.rsplit(".", 1)[0]
                 else:
                     inst_pkg_vere = '%s-%s' % (inst_pkg.version, inst_pkg.release)
-                if not self.version.larger_than(required_pkg_vere, inst_pkg_vere):
+                required_pkg_key, inst_pkg_key = self.version.key(required_pkg_vere), self.version.key(inst_pkg_vere)
+                if required_pkg_key < inst_pkg_key:
                     hotpatch.state = self.UNRELATED
                 elif required_pkg_vere != inst_pkg_vere:
                     hotpatch.state = self.UNINSTALLABLE
@@ -324,7 +500,14 @@ class HotpatchUpdateInfo(object):
 
     def _parse_and_store_from_xml(self, updateinfoxml: str):
         """
-        Parse and store hotpatch update information from xxx-updateinfo.xml.gz
+        Parse and store hotpatch update information from xxx-updateinfo.xml.gz, the file is parsed when the
+        hotpatch information is queried for the first time
+        """
+        self._pending_advisories.append(self._parse_from_xml(updateinfoxml))
+
+    def _parse_from_xml(self, updateinfoxml: str):
+        """
+        Parse hotpatch update information from xxx-updateinfo.xml.gz, and generate the advisory kwargs
 
         xxx-updateinfo.xml.gz e.g.
 
@@ -362,15 +545,20 @@ class HotpatchUpdateInfo(object):
             ...
         </updates>
         """
-        content = gzip.open(updateinfoxml)
-        tree = ET.parse(content)
-        root = tree.getroot()
-        for update in root.iter('update'):
-            # check whether the hotpatch relevant package information is in each advisory
-            if not update.find('pkglist/hot_patch_collection'):
-                continue
-            advisory = self._parse_advisory(update)
-            self._store_advisory_info(advisory)
+        with gzip.open(updateinfoxml) as content:
+            root = None
+            # stream the <update> nodes one by one instead of building the whole tree in memory
+            for event, elem in ET.iterparse(content, events=('start', 'end')):
+                if root is None:
+                    root = elem
+                    continue
+                if event != 'end' or elem.tag != 'update':
+                    continue
+                # check whether the hotpatch relevant package information is in each advisory
+                if elem.find('pkglist/hot_patch_collection'):
+                    yield self._parse_advisory(elem)
+                # drop the processed advisory from the root so that the memory can be released
+                root.clear()
 
     def _init_hotpatch_status_from_syscare(self):
         """
@@ -378,8 +566,39 @@ class HotpatchUpdateInfo(object):
         """
         self._hotpatch_status = self.syscare.list()
         self._hotpatch_state = {}
+        self._hotpatch_state_by_subname = {}
         for hotpatch_info in self._hotpatch_status:
-            self._hotpatch_state[hotpatch_info['Name']] = hotpatch_info['Status']
+            name, status = hotpatch_info['Name'], hotpatch_info['Status']
+            self._hotpatch_state[name] = status
+            # the syscare name is composed of 'src_pkg/hotpatch_name-version-release/target_elf', and its first two
+            # parts is the syscare_subname of the hotpatch, e.g. redis-6.2.5-1/ACC-1-1/redis-cli
+            subname = '/'.join(name.split('/', 2)[:2])
+            self._hotpatch_state_by_subname.setdefault(subname, []).append((name, status))
+
+    def get_hotpatch_status_lines(self, cve_ids: Optional[Iterable[str]] = None) -> List[list]:
+        """
+        Get the status in syscare of each hotpatch target of the hotpatches which fix the cves, the targets are
+        matched by the exact syscare_subname of the hotpatch.
+
+        Args:
+            cve_ids(iterable): only the hotpatches of these cves are returned, all cves if it is None
+
+        Returns:
+            list: [[cve_id, syscare name, status], ...]
+            e.g.
+            [['CVE-2023-1111', 'redis-6.2.5-1/ACC-1-1/redis-cli', 'ACTIVED']]
+        """
+        status_lines = []
+        # no advisory needs to be loaded if there is no hotpatch in syscare
+        if not self._hotpatch_state_by_subname:
+            return status_lines
+        for cve_id, cve in self.hotpatch_cves.items():
+            if cve_ids is not None and cve_id not in cve_ids:
+                continue
+            for hotpatch in cve.hotpatches:
+                for name, status in self._hotpatch_state_by_subname.get(hotpatch.syscare_subname, []):
+                    status_lines.append([cve_id, name, status])
+        return status_lines
 
     def _get_hotpatch_aggregated_status_in_syscare(self, hotpatch: Hotpatch) -> str:
         """
@@ -387,12 +606,10 @@ class HotpatchUpdateInfo(object):
         """
         hotpatch_status = ''
 
-        for name, status in self._hotpatch_state.items():
-            if hotpatch.syscare_subname not in name:
-                continue
-            elif status in ('ACTIVED', 'ACCEPTED'):
+        for _, status in self._hotpatch_state_by_subname.get(hotpatch.syscare_subname, []):
+            if status in ('ACTIVED', 'ACCEPTED'):
                 hotpatch_status = status
-            elif status not in ('ACTIVED', 'ACCEPTED'):
+            else:
                 return ''
         return hotpatch_status
 
@@ -424,17 +641,11 @@ class HotpatchUpdateInfo(object):
 
         return mapping_cve_hotpatches
 
-    def version_cmp(self, hotpatch_a: Hotpatch, hotpatch_b: Hotpatch):
+    def _get_hotpatch_version_key(self, hotpatch: Hotpatch) -> tuple:
         """
-        Sort the hotpatch in descending order according to the version-release.
+        Get the comparison key of the version-release of the hotpatch
         """
-        vere_a = "%s-%s" % (hotpatch_a.version, hotpatch_a.release)
-        vere_b = "%s-%s" % (hotpatch_b.version, hotpatch_b.release)
-        if self.version.larger_than(vere_a, vere_b):
-            return -1
-        if self.version.larger_than(vere_b, vere_a):
-            return 1
-        return 0
+        return self.version.key("%s-%s" % (hotpatch.version, hotpatch.release))
 
     def update_mapping_cve_hotpatches(self, priority: str, mapping_cve_hotpatches: dict, cve_id: str):
         """
@@ -481,7 +692,8 @@ class HotpatchUpdateInfo(object):
     def append_related_hotpatches(self, mapping_required_pkg_to_hotpatches: dict):
         """
         Append the hotpatches corresponding to the target required package in
-        mapping_required_pkg_to_hotpatches.
+        mapping_required_pkg_to_hotpatches, which are looked up from the hotpatches indexed by the target
+        required package.
 
         Args:
             mapping_required_pkg_to_hotpatches(dict): target required pkg and corresponding hotpatches
@@ -491,15 +703,14 @@ class HotpatchUpdateInfo(object):
             }
 
         """
-        for cve in self.hotpatch_cves.values():
-            for hotpatch in cve.hotpatches:
-                if hotpatch.hotpatch_name != "ACC":
-                    continue
-                if hotpatch.required_pkgs_str not in mapping_required_pkg_to_hotpatches:
+        for required_pkgs_str, hotpatches in mapping_required_pkg_to_hotpatches.items():
+            for _, hotpatch in self.hotpatch_required_pkg_info_str.get(required_pkgs_str, []):
+                # only the hotpatches which fix cves are related
+                if hotpatch.hotpatch_name != "ACC" or not hotpatch.cves:
                     continue
-                if hotpatch in mapping_required_pkg_to_hotpatches[hotpatch.required_pkgs_str]:
+                if hotpatch in hotpatches:
                     continue
-                mapping_required_pkg_to_hotpatches[hotpatch.required_pkgs_str].append(hotpatch)
+                hotpatches.append(hotpatch)
 
     def get_preferred_hotpatch(self, hotpatches: list, priority: str):
         """
@@ -514,7 +725,8 @@ class HotpatchUpdateInfo(object):
         """
         if not hotpatches:
             return None
-        hotpatches.sort(key=cmp_to_key(self.version_cmp))
+        # sort the hotpatch in descending order according to the version-release
+        hotpatches.sort(key=self._get_hotpatch_version_key, reverse=True)
         for hotpatch in hotpatches:
             if priority in hotpatch.hotpatch_name:
                 return hotpatch
@@ -533,6 +745,7 @@ class HotpatchUpdateInfo(object):
             advisory_id_2: []
         }
         """
+        self._load_pending_advisories()
         mapping_advisory_hotpatches = dict()
         for advisory_id in advisories:
             mapping_advisory_hotpatches[advisory_id] = []
@@ -10,27 +10,65 @@
 # PURPOSE.
 # See the Mulan PSL v2 for more details.
 # ******************************************************************************/
+import re
+from functools import lru_cache
+
+
 class Versions:
     """
-    Version number processing
+    Version number processing, the version-release strings are compared by the rpmvercmp rules.
+
+    Each string is parsed once into a key tuple, so that the comparison and sorting of versions are plain tuple
+    comparisons. Every segment of the key is a tuple whose first item orders the segment types in the same way
+    as rpmvercmp: tilde < end of string < caret < alphabetic < numeric.
+    e.g.
+        1.0~rc1 < 1.0 < 1.0^git1 < 1.0a < 1.0.1
     """
 
-    separator = (".", "-")
-    _connector = "&"
+    _segment_pattern = re.compile(r"~|\^|[0-9]+|[a-zA-Z]+")
+    _tilde = (0,)
+    _end = (1,)
+    _caret = (2,)
+    _alpha = 3
+    _numeric = 4
+
+    @classmethod
+    def _segments_key(cls, version: str) -> tuple:
+        """
+        Split the version into segments, the separators which are neither alphanumeric nor tilde or caret
+        are dropped
+        """
+        segments = []
+        for segment in cls._segment_pattern.findall(version):
+            if segment == "~":
+                segments.append(cls._tilde)
+            elif segment == "^":
+                segments.append(cls._caret)
+            elif segment.isdigit():
+                segments.append((cls._numeric, int(segment)))
+            else:
+                segments.append((cls._alpha, segment))
+        segments.append(cls._end)
+        return tuple(segments)
 
-    def _order(self, version, separator=None):
+    @classmethod
+    @lru_cache(maxsize=None)
+    def key(cls, version: str) -> tuple:
         """
-        Version of the cutting
+        Get the comparison key of the version, which is cached for the repeated version strings
+
         Args:
-            version: version
-            separator: separator
+            version(str): [epoch:]version[-release], e.g. 5.10.0-60.18.0.50.oe2203
 
         Returns:
-
+            tuple: (epoch, version key, release key)
         """
-        if not separator:
-            separator = self._connector
-        return tuple([int(v) for v in version.split(separator) if v.isdigit()])
+        epoch = 0
+        if ":" in version:
+            epoch_str, version = version.split(":", 1)
+            epoch = int(epoch_str) if epoch_str.isdigit() else 0
+        version, _, release = version.rpartition("-") if "-" in version else (version, "", "")
+        return epoch, cls._segments_key(version), cls._segments_key(release)
 
     def larger_than(self, version, compare_version):
         """
@@ -38,9 +76,4 @@ class Versions:
         than that of the compared version, or false otherwise
 
         """
-        for separator in self.separator:
-            version = self._connector.join([v for v in version.split(separator)])
-            compare_version = self._connector.join([v for v in compare_version.split(separator)])
-        version = self._order(version)
-        compare_version = self._order(compare_version)
-        return version >= compare_version
+        return self.key(version) >= self.key(compare_version)